@@ -1,3 +1,8 @@
 from application.services.price_conversion import PriceConversionService
+from application.services.batch_runner import BatchRunner, BatchJob, BatchJobResult
+from application.services.queue_worker import QueueWorker
+from application.services.job_manager import JobManager, JobSnapshot
+from application.services.search_cache import SearchResultCache
+from application.services.detail_enricher import LazyDetailEnricher
 
-__all__ = ['PriceConversionService']
+__all__ = ['PriceConversionService', 'BatchRunner', 'BatchJob', 'BatchJobResult', 'QueueWorker', 'JobManager', 'JobSnapshot', 'SearchResultCache', 'LazyDetailEnricher']
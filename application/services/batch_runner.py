@@ -0,0 +1,168 @@
+"""Service for running many search jobs through one shared worker pool."""
+from __future__ import annotations
+
+import heapq
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, TYPE_CHECKING
+
+from utils import format_filename
+from log_config import get_logger
+
+if TYPE_CHECKING:
+    from application.use_cases.search_products import SearchProductsUseCase
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class BatchJob:
+    """One search of a batch.
+
+    Attributes:
+        query: Product search query.
+        country: Country domain code (e.g., 'ar').
+        limit: Maximum number of listings to collect.
+        priority: Higher priorities are dispatched first.
+    """
+    query: str
+    country: str
+    limit: int = 100
+    priority: int = 0
+
+    @property
+    def job_id(self) -> str:
+        """Stable ID, so rerunning a failed batch resumes its checkpoints."""
+        return f"batch-{self.country}-{format_filename(self.query)}-{self.limit}"
+
+
+@dataclass(frozen=True)
+class BatchJobResult:
+    """Outcome of a batch job."""
+    job: BatchJob
+    results: int = 0
+    elapsed: float = 0.0
+    error: Optional[str] = None
+
+
+class BatchRunner:
+    """Runs batch jobs concurrently with a global budget and per-host fairness.
+
+    At most ``max_concurrency`` jobs run at once, and at most ``max_per_host``
+    of them against the same country site. Among the hosts with spare
+    capacity, the job with the highest priority is dispatched next; ties go
+    to the host that was served least recently, so one country with many
+    jobs cannot starve the others.
+
+    Work that a running job spreads over several connections (the shards
+    of a sharded crawl) takes its extra slots from the same budget with
+    ``try_acquire``, so it only uses spare capacity and still counts
+    against both limits.
+
+    Args:
+        search_for_country: Returns the SearchProductsUseCase to use for a
+            country (each one wired to that country's exporters).
+        max_concurrency: Global number of jobs running at once.
+        max_per_host: Jobs running at once against the same country site.
+    """
+
+    def __init__(
+        self,
+        search_for_country: Callable[[str], SearchProductsUseCase],
+        max_concurrency: int = 8,
+        max_per_host: int = 2,
+    ):
+        self.search_for_country = search_for_country
+        self.max_concurrency = max_concurrency
+        self.max_per_host = max_per_host
+        self._condition = threading.Condition()
+        self._running: dict[str, int] = {}
+
+    def try_acquire(self, host: str) -> bool:
+        """Take a spare slot for extra work of a running job against ``host``, without waiting."""
+        with self._condition:
+            if sum(self._running.values()) >= self.max_concurrency or self._running.get(host, 0) >= self.max_per_host:
+                return False
+            self._running[host] = self._running.get(host, 0) + 1
+            return True
+
+    def release(self, host: str) -> None:
+        """Return a slot taken with ``try_acquire``."""
+        with self._condition:
+            self._running[host] -= 1
+            self._condition.notify()
+
+    def run(self, jobs: Iterable[BatchJob]) -> list[BatchJobResult]:
+        """Run ``jobs`` and return one result per distinct job.
+
+        Jobs with the same ``job_id`` (the same query, country and limit)
+        would share a checkpoint, so they run once, at the highest of their
+        priorities.
+        """
+        unique: dict[str, BatchJob] = {}
+        for job in jobs:
+            current = unique.get(job.job_id)
+            if current is not None:
+                logger.warning(f"Búsqueda duplicada en el batch: '{job.query}' ({job.country}), se ejecuta una vez.")
+                if current.priority >= job.priority:
+                    continue
+            unique[job.job_id] = job
+
+        sequence = itertools.count()
+        queues: dict[str, list] = {}
+        for job in unique.values():
+            heapq.heappush(queues.setdefault(job.country, []), (-job.priority, next(sequence), job))
+
+        total = sum(len(queue) for queue in queues.values())
+        logger.info(f"Iniciando batch de {total} búsquedas en {len(queues)} países.")
+
+        running = self._running
+        for host in queues:
+            running.setdefault(host, 0)
+        last_served: dict[str, int] = {host: -1 for host in queues}
+        results: list[BatchJobResult] = []
+        condition = self._condition
+
+        def _pick_host() -> Optional[str]:
+            candidates = [
+                host for host, queue in queues.items()
+                if queue and running[host] < self.max_per_host
+            ]
+            if not candidates:
+                return None
+            return min(candidates, key=lambda host: (queues[host][0][0], last_served[host]))
+
+        def _run_job(job: BatchJob) -> None:
+            start = time.monotonic()
+            try:
+                found = self.search_for_country(job.country).execute(
+                    job.country, job.query, job.limit, job_id=job.job_id
+                )
+                result = BatchJobResult(job, results=len(found), elapsed=time.monotonic() - start)
+                logger.info(f"[{job.country}] '{job.query}': {len(found)} resultados en {result.elapsed:.1f}s")
+            except Exception as e:
+                result = BatchJobResult(job, elapsed=time.monotonic() - start, error=str(e))
+                logger.error(f"[{job.country}] '{job.query}' falló: {e}")
+            with condition:
+                results.append(result)
+                running[job.country] -= 1
+                condition.notify()
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            with condition:
+                while len(results) < total:
+                    host = _pick_host() if sum(running.values()) < self.max_concurrency else None
+                    if host is None:
+                        condition.wait()
+                        continue
+                    _, _, job = heapq.heappop(queues[host])
+                    running[host] += 1
+                    last_served[host] = next(sequence)
+                    executor.submit(_run_job, job)
+
+        failed = sum(1 for result in results if result.error)
+        logger.info(f"Batch terminado: {total - failed} búsquedas completadas, {failed} con errores.")
+        return results
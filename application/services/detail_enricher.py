@@ -0,0 +1,139 @@
+"""Service for fetching product details on demand, for the listings being viewed."""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Optional, TYPE_CHECKING
+
+from application.use_cases.get_product_details import listing_fingerprint
+from log_config import get_logger
+
+if TYPE_CHECKING:
+    from application.use_cases.get_product_details import GetProductDetailsUseCase
+    from domain.value_objects import Deadline
+
+logger = get_logger(__name__)
+
+
+class LazyDetailEnricher:
+    """Fetches the details of the listings a user is looking at, and caches them.
+
+    Instead of fetching every detail page of a search up front, callers ask
+    for the listings on screen (``enrich``) and hint the ones likely to be
+    viewed next (``prefetch``). Fetches run on a bounded pool in the order
+    they are requested; a listing already being fetched is waited for
+    rather than fetched again, and the ``max_entries`` most recently used
+    details are kept.
+
+    Listings are keyed by item ID, or by link when they have none. A cached
+    detail is only reused while the listing keeps the ``listing_fingerprint``
+    it had when fetched and, with a ``ttl``, for that many seconds, so a
+    listing whose price or title changed is fetched again, as in
+    ``execute_incremental``.
+
+    Args:
+        get_product_details: Use case doing the fetches, one listing at a
+            time through ``execute_incremental``, so its snapshots still
+            spare fetches of listings that did not change.
+        required_fields: Passed to ``execute_incremental`` (e.g.
+            ``CATEGORY_FIELDS``): listings whose card carries them are not fetched.
+        max_workers: Detail pages fetched at once.
+        max_entries: Details kept in the cache.
+        ttl: Seconds a cached detail is reused; None keeps it until evicted.
+        clock: Monotonic clock; the default is ``time.monotonic``.
+    """
+
+    def __init__(
+        self, get_product_details: GetProductDetailsUseCase, required_fields: dict[str, tuple[str, ...]] = None,
+        max_workers: int = 8, max_entries: int = 20_000, ttl: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.get_product_details = get_product_details
+        self.required_fields = required_fields
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='detail')
+        # key -> (fingerprint, expires_at, detail)
+        self._cache: OrderedDict[str, tuple[str, float, dict]] = OrderedDict()
+        self._in_flight: dict[tuple[str, str], Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(listing: dict) -> Optional[str]:
+        return listing.get('item_id') or listing.get('post_link') or None
+
+    def cached(self, listing: dict) -> Optional[dict]:
+        """The detail of ``listing`` if it was already fetched, without fetching it."""
+        with self._lock:
+            return self._lookup(self.key(listing), listing_fingerprint(listing))
+
+    def enrich(self, listings: list[dict], deadline: Deadline = None) -> list[Optional[dict]]:
+        """Details of ``listings`` in order, fetching those not cached yet.
+
+        Waits for the fetches until ``deadline``. Listings whose detail is
+        still being fetched then (or could not be fetched) get None; fetches
+        are not cancelled, so their details are cached for the next call.
+        """
+        futures = [self._request(listing) for listing in listings]
+        wait([future for future in futures if future is not None], deadline.remaining() if deadline else None)
+        return [future.result() if future is not None and future.done() else None for future in futures]
+
+    def prefetch(self, listings: list[dict]) -> None:
+        """Start fetching the details of ``listings`` in the background."""
+        for listing in listings:
+            self._request(listing)
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _request(self, listing: dict) -> Optional[Future]:
+        """Future of the detail of ``listing``: cached, already in flight, or newly submitted."""
+        key = self.key(listing)
+        if key is None:
+            return None
+        fingerprint = listing_fingerprint(listing)
+        with self._lock:
+            detail = self._lookup(key, fingerprint)
+            if detail is not None:
+                self._cache.move_to_end(key)
+                future = Future()
+                future.set_result(detail)
+                return future
+            future = self._in_flight.get((key, fingerprint))
+            if future is None:
+                future = self._in_flight[(key, fingerprint)] = self._executor.submit(
+                    self._fetch, key, fingerprint, listing,
+                )
+            return future
+
+    def _lookup(self, key: Optional[str], fingerprint: str) -> Optional[dict]:
+        """Cached detail of ``key`` if it is still fresh for ``fingerprint``; call with the lock held."""
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        cached_fingerprint, expires_at, detail = entry
+        if cached_fingerprint != fingerprint or self.clock() >= expires_at:
+            return None
+        return detail
+
+    def _fetch(self, key: str, fingerprint: str, listing: dict) -> Optional[dict]:
+        try:
+            details = self.get_product_details.execute_incremental(
+                [listing], threaded=False, required_fields=self.required_fields,
+            )
+        except Exception as e:
+            logger.error(f"Error al obtener el detalle de {listing.get('post_link')}: {e}")
+            details = []
+        detail = details[0] if details else None
+        with self._lock:
+            self._in_flight.pop((key, fingerprint), None)
+            if detail is not None:
+                expires_at = self.clock() + self.ttl if self.ttl is not None else float('inf')
+                self._cache[key] = (fingerprint, expires_at, detail)
+                self._cache.move_to_end(key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return detail
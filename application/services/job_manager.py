@@ -0,0 +1,165 @@
+"""Service for running scrapes in the background and polling their progress."""
+from __future__ import annotations
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from domain.enums import JobStatus
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True)
+class JobSnapshot:
+    """Point-in-time view of a background job.
+
+    Attributes:
+        job_id: ID returned by ``JobManager.submit``.
+        status: Current JobStatus.
+        results: Results published so far (all of them once the job is done).
+        complete: False if the job finished with partial results.
+        error: Error message of a failed job.
+        elapsed: Seconds since the job started running (0 while pending).
+    """
+    job_id: str
+    status: JobStatus
+    results: list = field(default_factory=list)
+    complete: bool = True
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JobStatus.DONE, JobStatus.FAILED)
+
+
+class Job:
+    """Mutable state of a running job, handed to its work function."""
+
+    def __init__(self, job_id: str, clock: Callable[[], float]):
+        self.job_id = job_id
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._status = JobStatus.PENDING
+        self._results: list = []
+        self._complete = True
+        self._error: Optional[str] = None
+        self._started: Optional[float] = None
+        self._finished: Optional[float] = None
+
+    def publish(self, items: list) -> None:
+        """Make ``items`` visible to pollers before the job finishes."""
+        with self._lock:
+            self._results.extend(items)
+
+    def snapshot(self) -> JobSnapshot:
+        with self._lock:
+            if self._started is None:
+                elapsed = 0.0
+            else:
+                elapsed = (self._finished if self._finished is not None else self._clock()) - self._started
+            return JobSnapshot(
+                job_id=self.job_id,
+                status=self._status,
+                results=list(self._results),
+                complete=self._complete,
+                error=self._error,
+                elapsed=elapsed,
+            )
+
+    @property
+    def finished(self) -> bool:
+        with self._lock:
+            return self._status in (JobStatus.DONE, JobStatus.FAILED)
+
+    def _start(self) -> None:
+        with self._lock:
+            self._status = JobStatus.RUNNING
+            self._started = self._clock()
+
+    def _finish(self, results: Optional[list]) -> None:
+        with self._lock:
+            if results is not None:
+                self._results = list(results)
+                self._complete = getattr(results, 'complete', True)
+            self._status = JobStatus.DONE
+            self._finished = self._clock()
+
+    def _fail(self, error: str) -> None:
+        with self._lock:
+            self._status = JobStatus.FAILED
+            self._error = error
+            self._finished = self._clock()
+
+
+class JobManager:
+    """Runs scrape jobs on a bounded thread pool and keeps their state for polling.
+
+    ``submit`` returns a job ID immediately; the web request that started the
+    job is free while it runs, and later requests poll it with ``get``. The
+    work function receives its ``Job`` and may call ``job.publish`` with
+    each batch of results as it arrives, so pollers see partial results.
+    Its return value, if not None, becomes the final result; a
+    ``PartialResult`` with ``complete`` False marks the job as partial.
+
+    Only the ``max_finished`` most recent finished jobs are kept, so an
+    abandoned job (its browser tab closed) does not stay in memory forever.
+
+    Args:
+        max_workers: Jobs running at once; further jobs wait as pending.
+        max_finished: Finished jobs kept for polling.
+        clock: Monotonic clock; the default is ``time.monotonic``.
+    """
+
+    def __init__(
+        self, max_workers: int = 4, max_finished: int = 100, clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_finished = max_finished
+        self.clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scrape-job')
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, work: Callable[[Job], Optional[list]], job_id: Optional[str] = None) -> str:
+        """Queue ``work`` and return its job ID without waiting for it.
+
+        A ``job_id`` already in use is replaced by a fresh one, so two jobs
+        never share an ID (nor the checkpoint and progress room keyed by it).
+        """
+        with self._lock:
+            if not job_id or job_id in self._jobs:
+                job_id = uuid.uuid4().hex
+            job = Job(job_id, self.clock)
+            self._jobs[job_id] = job
+        self._executor.submit(self._run, job, work)
+        return job.job_id
+
+    def get(self, job_id: str) -> Optional[JobSnapshot]:
+        """Return a snapshot of the job, or None if it is unknown or was evicted."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+        return job.snapshot() if job is not None else None
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+    def _run(self, job: Job, work: Callable[[Job], Optional[list]]) -> None:
+        job._start()
+        try:
+            job._finish(work(job))
+        except Exception as e:
+            logger.error(f"El job {job.job_id} falló: {e}")
+            job._fail(str(e))
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+            for job_id in finished[:max(len(finished) - self.max_finished, 0)]:
+                del self._jobs[job_id]
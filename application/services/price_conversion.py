@@ -1,7 +1,7 @@
 """Service for converting product prices between currencies."""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import Optional, TYPE_CHECKING
 
 from log_config import get_logger
 
@@ -10,6 +10,62 @@ if TYPE_CHECKING:
 
 logger = get_logger(__name__)
 
+# Symbols MercadoLibre uses for US dollars; any other symbol is the site's local currency.
+USD_SYMBOLS = ('U$S', 'US$', 'USD')
+
+
+def is_usd_price(listing: dict) -> bool:
+    """Whether a listing or detail is priced in US dollars, from its currency or price text."""
+    currency = (listing.get('currency') or '').strip().upper()
+    if currency:
+        return currency in USD_SYMBOLS
+    price = str(listing.get('price') or '')
+    return any(symbol in price for symbol in USD_SYMBOLS)
+
+
+# ISO code of the local currency of each MercadoLibre site.
+LOCAL_CURRENCIES = {
+    'ar': 'ARS', 'bo': 'BOB', 'br': 'BRL', 'cl': 'CLP', 'co': 'COP', 'cr': 'CRC', 'do': 'DOP', 'ec': 'USD',
+    'gt': 'GTQ', 'hn': 'HNL', 'mx': 'MXN', 'ni': 'NIO', 'pa': 'USD', 'py': 'PYG', 'pe': 'PEN', 'sv': 'USD',
+    'uy': 'UYU', 've': 'VES',
+}
+
+# Site of each item ID prefix (e.g. MLA1234567890 is listed on the Argentine site).
+SITE_PREFIXES = {
+    'MLA': 'ar', 'MBO': 'bo', 'MLB': 'br', 'MLC': 'cl', 'MCO': 'co', 'MCR': 'cr', 'MRD': 'do', 'MEC': 'ec',
+    'MGT': 'gt', 'MHN': 'hn', 'MLM': 'mx', 'MNI': 'ni', 'MPA': 'pa', 'MPY': 'py', 'MPE': 'pe', 'MSV': 'sv',
+    'MLU': 'uy', 'MLV': 've',
+}
+
+
+def currency_code(listing: dict, domain: Optional[str] = None) -> Optional[str]:
+    """ISO code of the currency a listing or detail is priced in, or None when it has no price.
+
+    Dollar prices are 'USD'; any other price is in the local currency of the
+    ``domain`` site, taken from the item ID prefix when no domain is given.
+
+    Example:
+        >>> currency_code({'price': '$ 15,000'}, 'mx')
+        'MXN'
+    """
+    if listing.get('price') in (None, ''):
+        return None
+    if is_usd_price(listing):
+        return 'USD'
+    domain = domain or SITE_PREFIXES.get(str(listing.get('item_id') or '')[:3])
+    return LOCAL_CURRENCIES.get((domain or '').lower())
+
+
+def usd_rate(exchange_rate: Optional[ExchangeRatePort], domain: str) -> Optional[float]:
+    """Local currency per dollar on the ``domain`` site, when ``exchange_rate`` covers it.
+
+    The exchange rate port only quotes dollars in Argentine pesos, so every
+    other site (and a missing or failing port) gets None.
+    """
+    if exchange_rate is None or (domain or '').lower() != 'ar':
+        return None
+    return exchange_rate.get_usd_to_ars_rate()
+
 
 class PriceConversionService:
     """Converts product prices using an injected exchange rate provider."""
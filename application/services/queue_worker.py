@@ -0,0 +1,128 @@
+"""Service for processing crawl tasks leased from a shared job queue."""
+from __future__ import annotations
+
+import os
+import socket
+import threading
+import uuid
+from typing import TYPE_CHECKING, Optional
+
+from log_config import get_logger
+
+if TYPE_CHECKING:
+    from container import ApplicationServices
+    from domain.ports import JobQueuePort
+
+logger = get_logger(__name__)
+
+SEARCH_TASK = 'search'
+DETAILS_TASK = 'details'
+
+
+class QueueWorker:
+    """Leases tasks from a JobQueuePort and runs them through the application services.
+
+    Task kinds:
+        ``search``: payload ``{'domain', 'query', 'limit', 'details'}``. Runs
+            the search; with ``details`` set, the listing links are enqueued
+            as ``details`` tasks of ``detail_chunk_size`` URLs each, each
+            link once per search task even if the task is rerun.
+        ``details``: payload ``{'urls'}``. Fetches the detail pages.
+
+    While a task runs, a background thread renews its lease every third of
+    ``lease_seconds``. Each task is checkpointed under its task ID, so a
+    task requeued after its worker died resumes where that worker stopped.
+    A task whose results came back incomplete (``PartialResult.complete``
+    False) is failed rather than completed, so it is retried from its
+    checkpoint.
+
+    Args:
+        queue: Shared job queue.
+        services: Services built by ``Container.create_for_api``.
+        worker_id: Unique name of this worker; defaults to host, PID and a
+            random suffix.
+        lease_seconds: Lease length; a worker silent for this long is
+            considered dead.
+        detail_chunk_size: URLs per ``details`` task.
+    """
+
+    def __init__(
+        self, queue: JobQueuePort, services: ApplicationServices, worker_id: Optional[str] = None,
+        lease_seconds: float = 60, detail_chunk_size: int = 50,
+    ):
+        self.queue = queue
+        self.services = services
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self.detail_chunk_size = detail_chunk_size
+
+    def run(self, stop: Optional[threading.Event] = None, idle_sleep: float = 1.0, exit_when_empty: bool = False) -> int:
+        """Process tasks until ``stop`` is set (or the queue is empty, with ``exit_when_empty``).
+
+        Returns:
+            Number of tasks processed.
+        """
+        stop = stop or threading.Event()
+        processed = 0
+        logger.info(f"Worker {self.worker_id} iniciado.")
+        while not stop.is_set():
+            if self.run_once():
+                processed += 1
+            elif exit_when_empty:
+                break
+            else:
+                stop.wait(idle_sleep)
+        logger.info(f"Worker {self.worker_id} detenido tras {processed} tareas.")
+        return processed
+
+    def run_once(self) -> bool:
+        """Lease and run one task. Returns False when there was nothing to do."""
+        task = self.queue.lease(self.worker_id, self.lease_seconds)
+        if task is None:
+            return False
+
+        done = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(task['id'], done), daemon=True)
+        heartbeat.start()
+        try:
+            self._handle(task)
+        except Exception as e:
+            logger.error(f"Tarea {task['id']} ({task['kind']}) falló en el intento {task['attempts']}: {e}")
+            self.queue.fail(task['id'], self.worker_id, str(e))
+        else:
+            self.queue.complete(task['id'], self.worker_id)
+        finally:
+            done.set()
+            heartbeat.join()
+        return True
+
+    def _heartbeat(self, task_id: int, done: threading.Event) -> None:
+        while not done.wait(self.lease_seconds / 3):
+            if not self.queue.heartbeat(task_id, self.worker_id, self.lease_seconds):
+                logger.warning(f"Worker {self.worker_id} perdió el lease de la tarea {task_id}.")
+                return
+
+    def _handle(self, task: dict) -> None:
+        payload = task['payload']
+        job_id = f"queue-{task['id']}"
+        if task['kind'] == SEARCH_TASK:
+            results = self.services.search_products.execute(
+                payload['domain'], payload['query'], payload['limit'], job_id=job_id
+            )
+            self._require_complete(task, results)
+            if payload.get('details'):
+                urls = [item['post_link'] for item in results if item.get('post_link')]
+                # Keyed by (job, URL): a rerun of this task after a crash does not enqueue them twice.
+                self.queue.enqueue_items(DETAILS_TASK, 'urls', urls, self.detail_chunk_size, dedupe_prefix=job_id)
+            logger.info(f"Tarea {task['id']}: {len(results)} resultados para '{payload['query']}'.")
+        elif task['kind'] == DETAILS_TASK:
+            details = self.services.get_product_details.execute(payload['urls'], job_id=job_id)
+            self._require_complete(task, details)
+            logger.info(f"Tarea {task['id']}: {len(details)} detalles obtenidos.")
+        else:
+            raise ValueError(f"Unknown task kind: {task['kind']}")
+
+    @staticmethod
+    def _require_complete(task: dict, results: list) -> None:
+        if not getattr(results, 'complete', True):
+            raise RuntimeError(f"Task {task['id']} ({task['kind']}) returned {len(results)} partial results")
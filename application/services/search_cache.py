@@ -0,0 +1,185 @@
+"""Service for sharing search results between identical requests."""
+from __future__ import annotations
+
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, Iterator, Optional, TYPE_CHECKING
+
+from domain.entities import PartialResult, ScrapeStats
+from log_config import get_logger
+
+if TYPE_CHECKING:
+    from application.use_cases.search_products import SearchProductsUseCase
+    from domain.ports import ProgressNotifierPort
+    from domain.value_objects import SearchFilters, Deadline
+
+logger = get_logger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, strip accents and collapse whitespace, so equivalent queries share a cache entry.
+
+    Example:
+        >>> normalize_query("  Gol   TREND ")
+        'gol trend'
+    """
+    decomposed = unicodedata.normalize('NFKD', query)
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return ' '.join(stripped.lower().split())
+
+
+class _Flight:
+    """A search in progress that identical requests wait for."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.results: Optional[PartialResult] = None
+        self.error: Optional[Exception] = None
+
+
+class SearchResultCache:
+    """Caches search results and lets identical concurrent searches share one crawl.
+
+    Searches are keyed by country, normalised query, limit and filters.
+    Complete results are kept for ``ttl`` seconds, up to ``max_entries``
+    searches, evicting the least recently used. While a search is being
+    crawled, identical requests wait for it instead of starting their own
+    crawl, and receive the same results. Results cut short by a deadline
+    are shared with the requests already waiting, but not cached.
+
+    Args:
+        search_products: SearchProductsUseCase doing the actual searches.
+        ttl: Seconds a complete result is served from the cache.
+        max_entries: Searches kept at once.
+        clock: Monotonic clock; the default is ``time.monotonic``.
+    """
+
+    def __init__(
+        self, search_products: SearchProductsUseCase, ttl: float = 300, max_entries: int = 128,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.search_products = search_products
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self._entries: OrderedDict[tuple, tuple[float, list[dict]]] = OrderedDict()
+        self._flights: dict[tuple, _Flight] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(domain: str, product_name: str, limit: int, filters: SearchFilters = None) -> tuple:
+        return domain.lower(), normalize_query(product_name), limit, filters if filters else None
+
+    def execute(
+        self, domain: str, product_name: str, limit: int, filters: SearchFilters = None, deadline: Deadline = None,
+    ) -> PartialResult:
+        """Like ``SearchProductsUseCase.execute``, served from the cache or a crawl in flight when possible."""
+        key = self.key(domain, product_name, limit, filters)
+        cached, flight, leader = self._claim(key)
+        if cached is not None:
+            return cached
+        if not leader:
+            results = self._wait(flight, deadline)
+            if results is not None:
+                return results
+            return self.search_products.execute(domain, product_name, limit, filters=filters, deadline=deadline)
+
+        try:
+            results = self.search_products.execute(domain, product_name, limit, filters=filters, deadline=deadline)
+        except Exception as e:
+            self._land(key, flight, error=e)
+            raise
+        results = PartialResult(results, complete=getattr(results, 'complete', True))
+        self._land(key, flight, results)
+        return PartialResult(results, complete=results.complete)
+
+    def stream(
+        self, domain: str, product_name: str, limit: int, filters: SearchFilters = None, deadline: Deadline = None,
+        stats: ScrapeStats = None, progress_notifier: ProgressNotifierPort = None,
+    ) -> Iterator[list[dict]]:
+        """Like ``SearchProductsUseCase.stream``; cached and shared results arrive as a single batch.
+
+        ``stats.timed_out`` is set when the results are incomplete, whether
+        this request crawled them or shared another one's. Only requests
+        that crawl report progress to their ``progress_notifier``.
+        """
+        stats = stats if stats is not None else ScrapeStats()
+        options = {'progress_notifier': progress_notifier} if progress_notifier else {}
+        key = self.key(domain, product_name, limit, filters)
+        cached, flight, leader = self._claim(key)
+        if cached is not None:
+            if cached:
+                yield cached
+            return
+        if not leader:
+            results = self._wait(flight, deadline)
+            if results is None:
+                yield from self.search_products.stream(
+                    domain, product_name, limit, filters=filters, deadline=deadline, stats=stats, **options,
+                )
+                return
+            stats.timed_out = not results.complete
+            if results:
+                yield results
+            return
+
+        collected = []
+        try:
+            for page in self.search_products.stream(
+                domain, product_name, limit, filters=filters, deadline=deadline, stats=stats, **options,
+            ):
+                collected.extend(page)
+                yield page
+        except Exception as e:
+            self._land(key, flight, error=e)
+            raise
+        except GeneratorExit:
+            # The consumer stopped early: waiters run their own search.
+            self._land(key, flight)
+            raise
+        self._land(key, flight, PartialResult(collected, complete=not stats.timed_out))
+
+    def _claim(self, key: tuple) -> tuple[Optional[PartialResult], Optional[_Flight], bool]:
+        """Return the cached result, or the flight to wait for, or a new flight to lead."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, results = entry
+                if expires_at > self.clock():
+                    self._entries.move_to_end(key)
+                    logger.info(f"Búsqueda '{key[1]}' servida desde la caché.")
+                    return PartialResult(results), None, False
+                del self._entries[key]
+            flight = self._flights.get(key)
+            if flight is not None:
+                logger.info(f"Búsqueda '{key[1]}' en curso; esperando su resultado.")
+                return None, flight, False
+            flight = self._flights[key] = _Flight()
+            return None, flight, True
+
+    def _land(
+        self, key: tuple, flight: _Flight, results: Optional[PartialResult] = None, error: Optional[Exception] = None,
+    ) -> None:
+        with self._lock:
+            self._flights.pop(key, None)
+            if results is not None and results.complete:
+                self._entries[key] = (self.clock() + self.ttl, list(results))
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        flight.results = results
+        flight.error = error
+        flight.done.set()
+
+    @staticmethod
+    def _wait(flight: _Flight, deadline: Deadline = None) -> Optional[PartialResult]:
+        """Wait for a flight; None means the leader gave up and the caller must search itself."""
+        if not flight.done.wait(deadline.remaining() if deadline else None):
+            return PartialResult(complete=False)
+        if flight.error is not None:
+            raise flight.error
+        if flight.results is None:
+            return None
+        return PartialResult(flight.results, complete=flight.results.complete)
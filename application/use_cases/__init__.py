@@ -1,4 +1,5 @@
 from application.use_cases.search_products import SearchProductsUseCase
 from application.use_cases.get_product_details import GetProductDetailsUseCase
+from application.use_cases.estimate_price_distribution import EstimatePriceDistributionUseCase
 
-__all__ = ['SearchProductsUseCase', 'GetProductDetailsUseCase']
+__all__ = ['SearchProductsUseCase', 'GetProductDetailsUseCase', 'EstimatePriceDistributionUseCase']
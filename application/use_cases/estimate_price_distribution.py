@@ -0,0 +1,143 @@
+"""Use case: estimate the price distribution of a search from a sample of result pages."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional
+
+import numpy as np
+
+from domain.entities import Estimate, PriceDistribution
+from application.services.price_conversion import is_usd_price, usd_rate
+from utils import parse_scraped_number
+from log_config import get_logger
+
+if TYPE_CHECKING:
+    from domain.ports import ScraperPort, ExchangeRatePort
+    from domain.value_objects import SearchFilters
+
+logger = get_logger(__name__)
+
+DEFAULT_QUANTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+# ``PriceDistribution.currency`` values: US dollars, or the site's own currency.
+USD = 'USD'
+LOCAL_CURRENCY = 'local'
+
+
+class EstimatePriceDistributionUseCase:
+    """Estimates price quantiles, mean and histogram without crawling every page.
+
+    A few result pages are drawn at random and their prices treated as a
+    cluster sample: confidence intervals come from a bootstrap that
+    resamples whole pages, since listings on the same page are not
+    independent. Five pages out of a hundred cost about 5% of a full crawl.
+
+    Dollar prices are converted to the local currency when the exchange
+    rate port covers the site; otherwise only the currency most of the
+    sample is priced in is kept, so the statistics never mix currencies.
+
+    Args:
+        scraper: ScraperPort used to sample result pages.
+        bootstrap_rounds: Resamples used for the confidence intervals.
+        exchange_rate: Optional ExchangeRatePort (USD to ARS) used on 'ar'.
+    """
+
+    def __init__(self, scraper: ScraperPort, bootstrap_rounds: int = 1000, exchange_rate: ExchangeRatePort = None):
+        self.scraper = scraper
+        self.bootstrap_rounds = bootstrap_rounds
+        self.exchange_rate = exchange_rate
+
+    def execute(
+        self, domain: str, product_name: str, sample_pages: int = 5, filters: SearchFilters = None,
+        quantiles: tuple[float, ...] = DEFAULT_QUANTILES, bins: int = 10, confidence: float = 0.95,
+        seed: Optional[int] = None,
+    ) -> Optional[PriceDistribution]:
+        """Sample ``sample_pages`` result pages and estimate their price distribution.
+
+        Returns:
+            The estimate, or None if the sample has no priced listings.
+        """
+        total_results, reachable_pages, pages = self.scraper.sample_product_pages(
+            domain, product_name, sample_pages, filters=filters, seed=seed,
+        )
+        currency, page_prices = self._page_prices(domain, product_name, pages)
+        if not page_prices:
+            logger.warning(f"La muestra de '{product_name}' no tiene precios.")
+            return None
+
+        prices = np.concatenate(page_prices)
+        edges = np.histogram_bin_edges(prices, bins=bins)
+        point = self._statistics(prices, quantiles, edges)
+        replicates = np.array([
+            self._statistics(sample, quantiles, edges)
+            for sample in self._bootstrap_samples(page_prices, seed)
+        ])
+        alpha = (1 - confidence) / 2
+        lows, highs = np.quantile(replicates, [alpha, 1 - alpha], axis=0)
+        estimates = [Estimate(float(v), float(lo), float(hi)) for v, lo, hi in zip(point, lows, highs)]
+
+        n_quantiles = len(quantiles)
+        result = PriceDistribution(
+            total_results=total_results,
+            sampled_pages=len(pages),
+            sample_size=int(prices.size),
+            confidence=confidence,
+            currency=currency,
+            mean=estimates[0],
+            quantiles=dict(zip(quantiles, estimates[1:1 + n_quantiles])),
+            histogram=[
+                {'low': float(edges[i]), 'high': float(edges[i + 1]), 'share': estimate}
+                for i, estimate in enumerate(estimates[1 + n_quantiles:])
+            ],
+        )
+        logger.info(
+            f"Distribución de '{product_name}' estimada con {result.sample_size} precios de "
+            f"{result.sampled_pages}/{reachable_pages} páginas: mediana {result.quantiles.get(0.5)}."
+        )
+        return result
+
+    def _page_prices(self, domain: str, product_name: str, pages: list[list[dict]]) -> tuple[str, list[np.ndarray]]:
+        """Currency of the sample and the prices of each page in it, dropping pages left without prices."""
+        rate = usd_rate(self.exchange_rate, domain)
+        by_currency = {USD: [], LOCAL_CURRENCY: []}
+        for page in pages:
+            split = {USD: [], LOCAL_CURRENCY: []}
+            for item in page:
+                price = parse_scraped_number(item.get('price'))
+                if price is None:
+                    continue
+                if is_usd_price(item):
+                    if rate is None:
+                        split[USD].append(price)
+                        continue
+                    price *= rate
+                split[LOCAL_CURRENCY].append(price)
+            for code, prices in split.items():
+                by_currency[code].append(np.array(prices))
+
+        sizes = {code: sum(prices.size for prices in pages_) for code, pages_ in by_currency.items()}
+        currency = USD if sizes[USD] > sizes[LOCAL_CURRENCY] else LOCAL_CURRENCY
+        dropped = sizes[LOCAL_CURRENCY if currency == USD else USD]
+        if dropped:
+            logger.warning(
+                f"La muestra de '{product_name}' mezcla monedas sin tasa de cambio: "
+                f"se descartan {dropped} precios que no están en {currency}."
+            )
+        return currency, [prices for prices in by_currency[currency] if prices.size]
+
+    @staticmethod
+    def _statistics(prices: np.ndarray, quantiles: tuple[float, ...], edges: np.ndarray) -> np.ndarray:
+        """Mean, quantiles and histogram shares of a sample, as one flat vector."""
+        counts, _ = np.histogram(prices, bins=edges)
+        return np.concatenate([[prices.mean()], np.quantile(prices, quantiles), counts / prices.size])
+
+    def _bootstrap_samples(self, page_prices: list[np.ndarray], seed: Optional[int]):
+        """Yield bootstrap resamples of whole pages (or of listings, with a single page)."""
+        rng = np.random.default_rng(seed)
+        if len(page_prices) == 1:
+            prices = page_prices[0]
+            for _ in range(self.bootstrap_rounds):
+                yield rng.choice(prices, size=prices.size, replace=True)
+            return
+        for _ in range(self.bootstrap_rounds):
+            chosen = rng.integers(0, len(page_prices), size=len(page_prices))
+            yield np.concatenate([page_prices[i] for i in chosen])
@@ -1,56 +1,297 @@
 """Use case: get detailed information for a list of product URLs."""
 from __future__ import annotations
 
+import dataclasses
+import hashlib
 import threading
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Callable
 
+from domain.entities import PartialResult, ProductDetail, CarProductDetail, PropertyProductDetail
+from domain.value_objects import MIN_REQUEST_TIMEOUT
+from application.services.price_conversion import SITE_PREFIXES
+from utils import decimal_mark, parse_scraped_number, format_link_to_markdown
 from log_config import get_logger
 
 if TYPE_CHECKING:
-    from domain.ports import ScraperPort
+    from domain.ports import (
+        ScraperPort, ProductStorePort, DetailSnapshotPort, CheckpointStorePort, CrawlCheckpointPort,
+    )
+    from domain.value_objects import Deadline
 
 logger = get_logger(__name__)
 
+# Detail fields each category needs; listings whose card already shows them
+# can skip the detail page (see ``execute_incremental``).
+CATEGORY_FIELDS = {
+    'car': ('year', 'km'),
+    'property': ('m2',),
+}
+
+# Detail entity of each category, for details built from listing cards.
+DETAIL_CLASSES = {
+    'car': CarProductDetail,
+    'property': PropertyProductDetail,
+}
+
+
+def listing_fingerprint(listing: dict) -> str:
+    """Fingerprint of the listing fields that signal a detail page changed.
+
+    Built from the numeric price and a hash of the title, so it is stable
+    whether the price comes raw from the scraper ("150000") or formatted
+    by the presenter ("$150.000,00").
+    """
+    price = parse_scraped_number(listing.get('price'))
+    title_hash = hashlib.sha1((listing.get('title') or '').strip().encode('utf-8')).hexdigest()[:16]
+    return f"{price}:{title_hash}"
+
+
+def detail_from_listing(listing: dict, fields: tuple[str, ...], domain: str = None) -> dict:
+    """Build a detail dict from a listing whose card already carries ``fields``.
+
+    Has every key of the category's ``ProductDetail`` (None where the card
+    does not show it, e.g. author or shipping) and the same formatting as
+    scraped details: price with its currency symbol and the thousands
+    separator of the ``domain`` site (taken from the item ID prefix when
+    not given), and the link in Markdown.
+    """
+    domain = domain or SITE_PREFIXES.get(str(listing.get('item_id') or '')[:3], 'ar')
+    mark = decimal_mark(domain)
+    amount = parse_scraped_number(listing.get('price'), mark)
+    price = None
+    if amount is not None:
+        price = f"{listing.get('currency') or '$'} {int(amount):,}"
+        if mark == ',':
+            price = price.replace(',', '.')
+    detail_class = DETAIL_CLASSES.get(listing.get('category'), ProductDetail)
+    detail = detail_class(
+        title=listing.get('title'),
+        price=price,
+        link=format_link_to_markdown(listing['post_link']) if listing.get('post_link') else None,
+        category=listing.get('category'),
+        item_id=listing.get('item_id'),
+        **{field: listing[field] for field in fields},
+    )
+    return {
+        **dict.fromkeys(field.name for field in dataclasses.fields(detail_class)),
+        **detail.to_dict(),
+        'category': detail.category,
+    }
+
 
 class GetProductDetailsUseCase:
     """Orchestrates fetching product detail pages (optionally threaded)."""
 
-    def __init__(self, scraper: ScraperPort):
+    def __init__(
+        self, scraper: ScraperPort, store: ProductStorePort = None, snapshots: DetailSnapshotPort = None,
+        checkpoints: CheckpointStorePort = None,
+    ):
         self.scraper = scraper
+        self.store = store
+        self.snapshots = snapshots
+        self.checkpoints = checkpoints
+
+    def execute(
+        self, urls: list[str], threaded: bool = True, job_id: str = None, deadline: Deadline = None,
+    ) -> PartialResult:
+        """Fetch the details of every URL.
+
+        With a ``job_id`` and a checkpoint store, each fetched detail is
+        checkpointed; rerunning the same job ID skips URLs already fetched.
+        The checkpoint is discarded once the batch finishes.
+
+        With a ``deadline``, each request times out with it and fetches
+        still pending when it passes are abandoned. The details fetched by
+        then are returned with ``complete`` set to False, and the checkpoint
+        is kept.
+        """
+        checkpoint = self.checkpoints.open(job_id) if job_id and self.checkpoints else None
+        fetched = self._fetch_all(urls, threaded, checkpoint, deadline)
+        products = PartialResult((product for _, product in fetched), complete=fetched.complete)
+        if checkpoint and products.complete:
+            self.checkpoints.discard(job_id)
+
+        if self.store and products:
+            self.store.save_details(products)
+        return products
+
+    def execute_incremental(
+        self, listings: list[dict], threaded: bool = True, deadline: Deadline = None,
+        required_fields: dict[str, tuple[str, ...]] = None, on_detail: Callable[[dict], None] = None,
+    ) -> PartialResult:
+        """Fetch details only for listings that are new or changed since the last snapshot.
+
+        A listing is unchanged when its item ID has a stored snapshot with the
+        same ``listing_fingerprint``; its stored detail is reused instead of
+        refetching the page.
 
-    def execute(self, urls: list[str], threaded: bool = True) -> list[dict]:
+        With ``required_fields`` ({category: fields}, e.g. ``CATEGORY_FIELDS``),
+        new or changed listings of a known category whose card already
+        carries all of its fields are not fetched at all; their detail is
+        built from the listing. The rest are fetched, and listings without
+        an item ID always are. Built and fetched details are both saved to
+        the store and snapshotted. Without a snapshot store this behaves
+        like ``execute``, including the ``deadline`` handling.
+
+        ``on_detail`` is called with each detail as soon as it is available
+        (details built from cards or snapshots first, then fetched ones as
+        they complete, possibly from worker threads), so callers can show
+        results before the whole batch finishes.
+
+        Args:
+            listings: Listing dicts with 'post_link' and, ideally, 'item_id',
+                'title' and 'price'.
+
+        Returns:
+            Details in the same order as the listings.
+        """
+        item_ids = [listing['item_id'] for listing in listings if listing.get('item_id')]
+        stored = self.snapshots.load_snapshots(item_ids) if self.snapshots and item_ids else {}
+
+        results: list = [None] * len(listings)
+        to_fetch: dict[str, list[int]] = {}
+        fingerprints: dict[int, str] = {}
+        new_details = []
+        new_snapshots = {}
+        for index, listing in enumerate(listings):
+            fingerprint = listing_fingerprint(listing)
+            snapshot = stored.get(listing.get('item_id'))
+            if snapshot and snapshot['fingerprint'] == fingerprint:
+                results[index] = snapshot['detail']
+                continue
+            fields = (required_fields or {}).get(listing.get('category'))
+            if fields and all(listing.get(field) for field in fields):
+                detail = results[index] = detail_from_listing(listing, fields)
+                new_details.append(detail)
+                if listing.get('item_id'):
+                    new_snapshots[listing['item_id']] = {'fingerprint': fingerprint, 'detail': detail}
+                continue
+            if listing.get('post_link'):
+                fingerprints[index] = fingerprint
+                to_fetch.setdefault(listing['post_link'], []).append(index)
+
+        if on_detail:
+            for result in results:
+                if result is not None:
+                    on_detail(result)
+
+        from_cards = len(new_details)
+        reused = sum(1 for result in results if result is not None) - from_cards
+        logger.info(
+            f"Detalles tomados del listado: {from_cards}. Reutilizados: {reused}. A descargar: {len(to_fetch)}."
+        )
+
+        fetched_pairs = self._fetch_all(list(to_fetch), threaded, deadline=deadline, on_detail=on_detail)
+        for url, product in fetched_pairs:
+            new_details.append(product)
+            for index in to_fetch[url]:
+                results[index] = product
+                item_id = listings[index].get('item_id')
+                if item_id:
+                    new_snapshots[item_id] = {'fingerprint': fingerprints[index], 'detail': product}
+
+        if self.store and new_details:
+            self.store.save_details(new_details)
+        if self.snapshots and new_snapshots:
+            self.snapshots.save_snapshots(new_snapshots)
+
+        return PartialResult((result for result in results if result is not None), complete=fetched_pairs.complete)
+
+    def _fetch_all(
+        self, urls: list[str], threaded: bool, checkpoint: CrawlCheckpointPort = None, deadline: Deadline = None,
+        on_detail: Callable[[dict], None] = None,
+    ) -> PartialResult:
+        """Return ``(url, detail)`` pairs in URL order; incomplete if the deadline cut the batch short."""
+        if not checkpoint:
+            if threaded:
+                return self._execute_threaded(urls, deadline=deadline, on_detail=on_detail)
+            return self._execute_sequential(urls, deadline=deadline, on_detail=on_detail)
+
+        done = checkpoint.completed_details()
+        pending = [url for url in urls if url not in done]
+        logger.info(f"Detalles recuperados del checkpoint: {len(urls) - len(pending)}. Pendientes: {len(pending)}.")
         if threaded:
-            return self._execute_threaded(urls)
-        return self._execute_sequential(urls)
+            fetched = self._execute_threaded(pending, checkpoint, deadline, on_detail)
+        else:
+            fetched = self._execute_sequential(pending, checkpoint, deadline, on_detail)
+        done.update(dict(fetched))
+        return PartialResult(((url, done[url]) for url in urls if url in done), complete=fetched.complete)
 
-    def _get_single_detail(self, url: str):
-        soup = self.scraper.get_page_content(url)
+    def _get_single_detail(self, url: str, deadline: Deadline = None):
+        if deadline is not None and deadline.expired():
+            return None
+        timeout = max(deadline.remaining(), MIN_REQUEST_TIMEOUT) if deadline else None
+        soup = self.scraper.get_page_content(url, timeout=timeout)
         if not soup:
             return None
         return self.scraper.scrape_product_details(soup)
 
-    def _execute_sequential(self, urls: list[str]) -> list[dict]:
-        products = []
+    def _execute_sequential(
+        self, urls: list[str], checkpoint: CrawlCheckpointPort = None, deadline: Deadline = None,
+        on_detail: Callable[[dict], None] = None,
+    ) -> PartialResult:
+        products = PartialResult()
         for url in urls:
-            product = self._get_single_detail(url)
+            if deadline and deadline.expired():
+                products.complete = False
+                logger.warning(f"Se agotó el tiempo con {len(products)} de {len(urls)} detalles.")
+                break
+            try:
+                product = self._get_single_detail(url, deadline)
+            except Exception:
+                if deadline and deadline.expired():
+                    products.complete = False
+                    break
+                raise
             if product:
-                products.append(product)
+                products.append((url, product))
+                if checkpoint:
+                    checkpoint.record_detail(url, product)
+                if on_detail:
+                    on_detail(product)
         return products
 
-    def _execute_threaded(self, urls: list[str]) -> list[dict]:
+    def _execute_threaded(
+        self, urls: list[str], checkpoint: CrawlCheckpointPort = None, deadline: Deadline = None,
+        on_detail: Callable[[dict], None] = None,
+    ) -> PartialResult:
         products = []
+        failed = []
         lock = threading.Lock()
 
         def _fetch(url):
-            product = self._get_single_detail(url)
+            try:
+                product = self._get_single_detail(url, deadline)
+            except Exception as e:
+                logger.error(f"Error al obtener el detalle de {url}: {e}")
+                with lock:
+                    failed.append(url)
+                return
             if product:
+                if checkpoint:
+                    checkpoint.record_detail(url, product)
                 with lock:
-                    products.append(product)
+                    products.append((url, product))
+                if on_detail:
+                    on_detail(product)
 
-        threads = [threading.Thread(target=_fetch, args=(url,)) for url in urls]
+        # With a deadline, threads still running when it passes are abandoned.
+        threads = [threading.Thread(target=_fetch, args=(url,), daemon=deadline is not None) for url in urls]
         for t in threads:
             t.start()
         for t in threads:
-            t.join()
+            t.join(deadline.remaining() if deadline else None)
 
-        return products
+        position = {url: i for i, url in enumerate(urls)}
+        with lock:
+            pending = sum(1 for t in threads if t.is_alive())
+            # Threads finish in any order; hand the details back in URL order.
+            ordered = sorted(products, key=lambda pair: position[pair[0]])
+            # A failed URL leaves the batch incomplete, so its checkpoint is kept for a retry.
+            result = PartialResult(ordered, complete=not pending and not failed)
+            errors = len(failed)
+        if pending:
+            logger.warning(f"Se agotó el tiempo con {pending} de {len(urls)} detalles pendientes.")
+        if errors:
+            logger.warning(f"Fallaron {errors} de {len(urls)} detalles.")
+        return result
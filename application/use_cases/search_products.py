@@ -1,27 +1,291 @@
 """Use case: search for products on MercadoLibre."""
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import asyncio
+import heapq
+import itertools
+import threading
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Iterator, Optional
 
+from domain.entities import PartialResult, ScrapeStats
+from domain.enums import SortOrder
+from application.services.price_conversion import LOCAL_CURRENCIES, currency_code, is_usd_price, usd_rate
+from utils import parse_scraped_number
 from log_config import get_logger
 
 if TYPE_CHECKING:
-    from domain.ports import ScraperPort, ProductExporterPort
+    from domain.ports import (
+        ScraperPort, ProductExporterPort, ProductStorePort, CheckpointStorePort, ExchangeRatePort, ProgressNotifierPort,
+    )
+    from domain.value_objects import SearchFilters, Deadline
 
 logger = get_logger(__name__)
 
 
+def _sort_rank(listing: dict, order: SortOrder, usd_rate: Optional[float] = None) -> Optional[float]:
+    """Rank of a listing under a price order (lower is better), or None when it has no price.
+
+    Dollar prices are converted to the local currency with ``usd_rate``;
+    without it every price is taken as is, so callers rank each currency apart.
+    """
+    price = parse_scraped_number(listing.get('price'))
+    if price is None:
+        return None
+    if usd_rate is not None and is_usd_price(listing):
+        price *= usd_rate
+    return price if order == SortOrder.PRICE_ASC else -price
+
+
 class SearchProductsUseCase:
-    """Orchestrates a product search: scrape listings and optionally export."""
+    """Orchestrates a product search: scrape listings and optionally export and persist."""
 
-    def __init__(self, scraper: ScraperPort, exporter: ProductExporterPort = None):
+    def __init__(
+        self, scraper: ScraperPort, exporter: ProductExporterPort = None, store: ProductStorePort = None,
+        checkpoints: CheckpointStorePort = None, exchange_rate: ExchangeRatePort = None,
+    ):
         self.scraper = scraper
         self.exporter = exporter
+        self.store = store
+        self.checkpoints = checkpoints
+        self.exchange_rate = exchange_rate
+
+    def execute(
+        self, domain: str, product_name: str, limit: int, job_id: str = None, filters: SearchFilters = None,
+        deadline: Deadline = None,
+    ) -> PartialResult:
+        """Scrape, export and persist the listings of a search.
 
-    def execute(self, domain: str, product_name: str, limit: int) -> list[dict]:
-        results = self.scraper.scrape_product_list(domain, product_name, limit)
+        With a ``job_id`` and a checkpoint store, scraped pages are
+        checkpointed as they complete; rerunning the same job ID after a
+        failure resumes from the last completed page. The checkpoint is
+        discarded once the search finishes.
+
+        ``filters`` are passed to the scraper, which pushes them into the
+        search itself so only matching listings are fetched.
+
+        With a ``deadline``, no page is requested after it passes and each
+        request times out with it. The listings gathered by then are
+        exported, persisted and returned with ``complete`` set to False; the
+        checkpoint is kept, so the same job ID can finish the crawl later.
+        """
+        options = self._scrape_options(filters, deadline)
+        stats = options.get('stats')
+        if job_id and self.checkpoints:
+            checkpoint = self.checkpoints.open(job_id)
+            results = self.scraper.scrape_product_list(
+                domain, product_name, limit, checkpoint=checkpoint, **options
+            )
+            if not (stats and stats.timed_out):
+                self.checkpoints.discard(job_id)
+        else:
+            results = self.scraper.scrape_product_list(domain, product_name, limit, **options)
+        results = PartialResult(results, complete=not (stats and stats.timed_out))
+        if not results.complete:
+            logger.warning(f"Búsqueda de '{product_name}' cortada por tiempo con {len(results)} resultados.")
 
         if self.exporter and results:
             self.exporter.export(results, product_name)
 
+        if self.store and results:
+            self.store.save_listings(results, product_name, domain)
+
         return results
+
+    @staticmethod
+    def _scrape_options(filters: SearchFilters = None, deadline: Deadline = None, stats: ScrapeStats = None) -> dict:
+        """Optional scraper keyword arguments, passed only when set."""
+        options = {}
+        if filters:
+            options['filters'] = filters
+        if deadline:
+            options['deadline'] = deadline
+            options['stats'] = stats if stats is not None else ScrapeStats()
+        elif stats is not None:
+            options['stats'] = stats
+        return options
+
+    def stream(
+        self, domain: str, product_name: str, limit: int, job_id: str = None, filters: SearchFilters = None,
+        deadline: Deadline = None, stats: ScrapeStats = None, progress_notifier: ProgressNotifierPort = None,
+    ) -> Iterator[list[dict]]:
+        """Yield the listings of a search page by page, as soon as each page is parsed.
+
+        Pages are only fetched as the caller consumes them. Each page is
+        persisted to the store as it arrives; exporters with an
+        ``export_stream`` method write it as it arrives too, other exporters
+        receive the full result once the stream is exhausted. A ``deadline``
+        ends the stream early, keeping the checkpoint as in ``execute``.
+
+        Pass ``stats`` to learn how the crawl went: once the stream is
+        exhausted, ``stats.timed_out`` tells whether the deadline cut it short.
+        A ``progress_notifier`` receives the progress of this crawl only.
+        """
+        checkpoint = self.checkpoints.open(job_id) if job_id and self.checkpoints else None
+        options = self._scrape_options(filters, deadline, stats)
+        if progress_notifier:
+            options['progress_notifier'] = progress_notifier
+        batches = self.scraper.iter_product_pages(domain, product_name, limit, checkpoint=checkpoint, **options)
+
+        streaming_export = self.exporter is not None and hasattr(self.exporter, 'export_stream')
+        if streaming_export:
+            batches = self.exporter.export_stream(batches, product_name)
+
+        results = []
+        for batch in batches:
+            if self.store:
+                self.store.save_listings(batch, product_name, domain)
+            if not streaming_export:
+                results.extend(batch)
+            yield batch
+
+        if checkpoint and not (options.get('stats') and options['stats'].timed_out):
+            self.checkpoints.discard(job_id)
+        if self.exporter and not streaming_export and results:
+            self.exporter.export(results, product_name)
+
+    def execute_top_k(
+        self, domain: str, product_name: str, k: int, order: SortOrder = SortOrder.PRICE_ASC,
+        filters: SearchFilters = None, predicate: Callable[[dict], bool] = None, max_scanned: int = 1000,
+    ) -> list[dict]:
+        """Return the first ``k`` listings of a search in ``order`` (e.g. the 20 cheapest).
+
+        The site is asked for the listings already sorted in ``order``, and
+        pages are consumed only until the answer is settled: for price
+        orders, once ``k`` valid listings are held and the last listing of
+        the page ranks no better than all of them (so later pages cannot
+        either); for other orders, as soon as ``k`` valid listings arrived.
+        Only the best ``k`` are kept (in a bounded heap), so promoted
+        listings slipped in out of order are still ranked correctly without
+        holding the full result set.
+
+        The site sorts by price converted to one currency, so listings
+        priced in dollars and in pesos are ranked the same way: on the
+        Argentine site, dollar prices are converted with the exchange rate
+        port. Where no rate is available, each currency is ranked apart and
+        the answer comes from the one most listings are priced in; the
+        others are dropped with a warning.
+
+        Args:
+            order: Server-side sort order, also used to rank locally.
+            filters: Passed to the scraper like in ``execute``.
+            predicate: Optional extra test a listing must pass to count.
+            max_scanned: Upper bound of listings fetched before giving up.
+
+        Returns:
+            Up to ``k`` listings, best first.
+        """
+        options = {'filters': filters} if filters else {}
+        price_order = order in (SortOrder.PRICE_ASC, SortOrder.PRICE_DESC)
+        rate = usd_rate(self.exchange_rate, domain) if price_order else None
+        sequence = itertools.count()
+        # One max-heap on (rank, arrival) per currency: heaps[c][0] is the worst listing kept.
+        heaps: dict[Optional[str], list[tuple]] = {}
+        counts: dict[Optional[str], int] = {}
+        tail_kept: dict[Optional[str], bool] = {}
+        scanned = 0
+
+        def _majority() -> Optional[str]:
+            return max(counts, key=counts.get, default=None)
+
+        pages = self.scraper.iter_product_pages(domain, product_name, max_scanned, sort=order, **options)
+        try:
+            for page in pages:
+                scanned += len(page)
+                if self.store:
+                    self.store.save_listings(page, product_name, domain)
+
+                for listing in page:
+                    position = next(sequence)
+                    if predicate and not predicate(listing):
+                        continue
+                    rank = _sort_rank(listing, order, rate) if price_order else position
+                    if rank is None:
+                        continue
+                    if price_order and rate is None:
+                        currency = currency_code(listing, domain)
+                    else:
+                        currency = LOCAL_CURRENCIES.get(domain.lower())
+                    counts[currency] = counts.get(currency, 0) + 1
+                    heap = heaps.setdefault(currency, [])
+                    entry = (-rank, -position, listing)
+                    if len(heap) < k:
+                        heapq.heappush(heap, entry)
+                        tail_kept[currency] = True
+                    elif entry > heap[0]:
+                        heapq.heapreplace(heap, entry)
+                        tail_kept[currency] = True
+                    else:
+                        tail_kept[currency] = False
+                    if not price_order and len(heap) >= k:
+                        break
+
+                # Each currency arrives in its own price order, so the majority's page tail settles it.
+                majority = _majority()
+                if majority is not None and len(heaps[majority]) >= k and not (price_order and tail_kept[majority]):
+                    break
+        finally:
+            pages.close()
+
+        majority = _majority()
+        dropped = sum(counts.values()) - counts.get(majority, 0)
+        if dropped:
+            logger.warning(
+                f"El top {k} de '{product_name}' mezcla monedas sin tasa de cambio: "
+                f"se descartan {dropped} publicaciones que no están en {majority}."
+            )
+        results = [listing for _, _, listing in sorted(heaps.get(majority, []), reverse=True)]
+        logger.info(f"Top {k} de '{product_name}' ({order.value}): {len(results)} resultados tras revisar {scanned}.")
+        return results
+
+    async def astream(
+        self, domain: str, product_name: str, limit: int, job_id: str = None, max_buffered_pages: int = 2,
+        filters: SearchFilters = None,
+    ) -> AsyncIterator[list[dict]]:
+        """Async variant of ``stream``.
+
+        The blocking crawl runs in a worker thread. At most
+        ``max_buffered_pages`` pages wait in the queue; when the consumer
+        falls behind the crawl pauses until it catches up, and closing the
+        iterator early stops the crawl after the page in flight.
+        """
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffered_pages)
+        stop = threading.Event()
+        done = object()
+
+        def _put(item) -> None:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+            while not stop.is_set():
+                try:
+                    future.result(timeout=0.1)
+                    return
+                except TimeoutError:
+                    continue
+            future.cancel()
+
+        def _produce() -> None:
+            batches = self.stream(domain, product_name, limit, job_id, filters)
+            try:
+                for batch in batches:
+                    if stop.is_set():
+                        break
+                    _put(batch)
+            except Exception as e:
+                _put(e)
+                return
+            finally:
+                batches.close()
+            _put(done)
+
+        producer = loop.run_in_executor(None, _produce)
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
+            await producer
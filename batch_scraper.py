@@ -0,0 +1,65 @@
+"""Command-line batch runner: scrape a file of (query, country, limit) jobs.
+
+The job file is a CSV with a header row::
+
+    query,country,limit,priority
+    notebook,ar,200,1
+    celular,mx,100,
+
+``limit`` defaults to 100 and ``priority`` to 0 when left empty.
+"""
+import argparse
+import csv
+
+from application.services.batch_runner import BatchJob
+from container import Container
+
+DATABASE_PATH = "data/mercadolibre.db"
+CHECKPOINT_DIRECTORY = "data/checkpoints"
+
+
+def load_batch_jobs(path: str) -> list[BatchJob]:
+    """Read batch jobs from a CSV file, skipping rows without query or country."""
+    jobs = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            query = (row.get('query') or '').strip()
+            country = (row.get('country') or '').strip().lower()
+            if not query or not country:
+                continue
+            jobs.append(BatchJob(
+                query=query,
+                country=country,
+                limit=int(row.get('limit') or 100),
+                priority=int(row.get('priority') or 0),
+            ))
+    return jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ejecuta un lote de búsquedas en MercadoLibre.")
+    parser.add_argument('jobs', help="CSV con columnas query,country,limit,priority")
+    parser.add_argument('--output', default='data/batch', help="Directorio de salida (Parquet)")
+    parser.add_argument('--concurrency', type=int, default=8, help="Búsquedas simultáneas en total")
+    parser.add_argument('--per-host', type=int, default=2, help="Búsquedas simultáneas por país")
+    parser.add_argument('--sharded', action='store_true',
+                        help="Dividir por rangos de precio las búsquedas que superan el límite de paginación")
+    args = parser.parse_args()
+
+    runner = Container.create_batch_runner(
+        data_directory=args.output,
+        db_path=DATABASE_PATH,
+        checkpoint_dir=CHECKPOINT_DIRECTORY,
+        max_concurrency=args.concurrency,
+        max_per_host=args.per_host,
+        sharded=args.sharded,
+    )
+    results = runner.run(load_batch_jobs(args.jobs))
+    failed = [result for result in results if result.error]
+    print(f"{len(results) - len(failed)} búsquedas completadas, {len(failed)} con errores.")
+    for result in failed:
+        print(f"  [{result.job.country}] {result.job.query}: {result.error}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,73 +1,314 @@
+import threading
+
+from dash import ctx, no_update
 from dash.dependencies import Output, Input, State
-from utils import extract_url_from_markdown
+from config import (
+    SEARCH_TIME_BUDGET, DETAILS_TIME_BUDGET, PAGE_DETAILS_TIME_BUDGET, LIVE_BATCH_SIZE, SCATTER_WEBGL_THRESHOLD,
+    LAZY_DETAILS, DETAIL_PAGE_SIZE,
+)
+from domain.enums import JobStatus
+from domain.entities import PartialResult, ScrapeStats
+from domain.value_objects import Deadline
+from application.use_cases.get_product_details import CATEGORY_FIELDS, detail_from_listing
+from presentation.table_query import PagedTable, PagedTableCache
+from utils import parse_scraped_number
 from log_config import get_logger
+import numpy as np
 import pandas as pd
-import json
 import ui
 logger = get_logger(__name__)
 
+SCATTER_LABELS = {
+    'labels': {"km": "Kilómetros", "price_usd": "Precio (USD)", "year": "Año"},
+    'title': "Relación entre Precio, Kilómetros y Año del Auto",
+}
+# Category fields a listing card may already show (see CATEGORY_FIELDS).
+CARD_FIELDS = tuple(dict.fromkeys(field for fields in CATEGORY_FIELDS.values() for field in fields))
+
 
 def register_callbacks(app, services):
+    def listing_table(listings):
+        """Table of search listings whose pages show details fetched on demand.
+
+        Only what the cards show is known for every listing, so sorting and
+        filtering use the card rows, with prices as numbers in pesos; columns
+        known only from details (seller, shipping...) cannot be queried.
+        """
+        records, _ = services.presenter.process_and_convert_products([_listing_row(listing) for listing in listings])
+        frame = pd.DataFrame(records).dropna(axis=1, how='all')
+        if 'price_pesos' in frame.columns:
+            frame['price'] = frame['price_pesos']
+        elif 'price' in frame.columns:
+            frame['price'] = frame['price'].map(parse_scraped_number)
+        return PagedTable(listings, records=frame.to_dict('records'))
+
+    tables = PagedTableCache(services.results, build=listing_table if LAZY_DETAILS else PagedTable)
+
+    def push(job_id, channel, rows, columns=None):
+        """Send rows to the browsers following ``job_id``, if live updates are enabled."""
+        if services.live and rows:
+            services.live.publish(job_id, channel, rows, columns)
+
+    def scatter_points(products):
+        rows, _ = services.presenter.process_and_convert_products(products)
+        points = []
+        for row in rows:
+            km = parse_scraped_number(row.get('km'))
+            if km is not None and pd.notna(row.get('price_usd')):
+                points.append({'km': km, 'price_usd': row['price_usd'], 'year': parse_scraped_number(row.get('year'))})
+        return points
+
+    def detail_rows(listings, deadline=None):
+        """Rows of ``listings`` with their details, fetching those not cached yet.
+
+        Listings whose detail is not available by ``deadline`` show what their card carries.
+        """
+        details = services.details.enrich(listings, deadline=deadline)
+        return [detail or _listing_row(listing) for listing, detail in zip(listings, details)]
+
+    def scatter_data(details_key):
+        """Data of the full scatter plot; in on-demand mode, only the details fetched so far."""
+        if not LAZY_DETAILS:
+            table = tables.get(details_key) if details_key else None
+            return table.df if table is not None else None
+        listings = services.results.get(details_key) if details_key else None
+        details = [detail for detail in map(services.details.cached, listings or []) if detail]
+        if not details:
+            return None
+        rows, _ = services.presenter.process_and_convert_products(details)
+        return pd.DataFrame(rows)
+
+    # The browser picks the job ID and joins its SocketIO room before the
+    # job starts, so no pushed page is missed (see templates/main_template.html).
+    app.clientside_callback(
+        """
+        function(n_clicks, product) {
+            if (!n_clicks || !product) { return window.dash_clientside.no_update; }
+            var jobId = window.crypto.randomUUID().replace(/-/g, '');
+            if (window.mlLive) { window.mlLive.subscribe(jobId); }
+            return {id: jobId, query: product};
+        }
+        """,
+        Output('search-request', 'data'),
+        [Input("btn-scrape", "n_clicks")],
+        [State("input-product", "value")]
+    )
+
+    @app.callback(
+        Output('search-job', 'data'),
+        [Input('search-request', 'data')]
+    )
+    def run_scrape(search_request):
+        if not search_request:
+            return None
+        input_product_name = search_request['query']
+
+        def search(job):
+            deadline = Deadline.after(SEARCH_TIME_BUDGET)
+            stats = ScrapeStats()
+            notifier = services.progress(job.job_id) if services.progress else None
+            try:
+                for page in services.search_cache.stream(
+                    'ar', input_product_name, 100, deadline=deadline, stats=stats, progress_notifier=notifier,
+                ):
+                    job.publish(page)
+                    rows, columns = services.presenter.prepare_table_data(page)
+                    push(job.job_id, 'table-initial', rows, columns)
+            finally:
+                if notifier:
+                    notifier.close()
+            return PartialResult(job.snapshot().results, complete=not stats.timed_out)
+
+        job_id = services.jobs.submit(search, job_id=search_request.get('id'))
+        return {'id': job_id, 'query': input_product_name}
+
     @app.callback(
         [Output("scrape-message", "children"),
          Output("scrape-message", "is_open"),
          Output('table-initial', 'data'),
          Output('table-initial', 'columns'),
          Output('trigger-for-detailed-scrape', 'children'),
-         Output('temp-data-storage', 'children')
+         Output('result-key', 'data'),
+         Output('search-poll', 'disabled')
          ],
-        [Input("btn-scrape", "n_clicks")],
-        [State("input-product", "value")]
+        [Input('search-poll', 'n_intervals'),
+         Input('search-job', 'data')]
     )
-    def run_scrape(n_clicks, input_product_name):
-        if n_clicks > 0 and input_product_name:
-            data = services.search_products.execute('ar', input_product_name, 100)
-            if data:
-                message = f"Scraping para {input_product_name} completado!"
-            else:
-                message = f"No se encontraron datos para {input_product_name}."
-            msg_open = True
-            data, columns = services.presenter.prepare_table_data(data or [])
-            trigger = 'updated'
-            json_data = json.dumps(data)
-            logger.info(f"Cantidad de datos: {len(data)}")
+    def poll_scrape(n_intervals, search_job):
+        if not search_job:
+            return "", False, [], [], None, None, True
+        product_name = search_job['query']
+        job = services.jobs.get(search_job['id'])
+        if job is None:
+            return f"El scraping de {product_name} ya no está disponible.", True, [], [], None, None, True
+        if job.status == JobStatus.FAILED:
+            return f"Error en el scraping de {product_name}: {job.error}", True, [], [], None, None, True
+
+        if not job.finished:
+            # Rows arrive through SocketIO while the job runs; the poll only reports progress.
+            message = f"Scrapeando {product_name}: {len(job.results)} resultados hasta ahora..."
+            return message, True, no_update, no_update, no_update, no_update, False
+
+        data, columns = services.presenter.prepare_table_data(job.results)
+
+        if data and not job.complete:
+            message = f"Scraping para {product_name} cortado por tiempo: se muestran {len(data)} resultados."
+        elif data:
+            message = f"Scraping para {product_name} completado!"
         else:
-            message, msg_open, data, columns, json_data = "", False, [], [], None
-            trigger = None
+            message = f"No se encontraron datos para {product_name}."
+        logger.info(f"Cantidad de datos: {len(data)}")
+        # Only the key travels through the browser; the listings stay on the server.
+        result_key = search_job['id'] if services.results.put(search_job['id'], job.results) else None
+        return message, True, data, columns, 'updated', result_key, True
 
-        return message, msg_open, data, columns, trigger, json_data
+    @app.callback(
+        Output('details-job', 'data'),
+        [Input('trigger-for-detailed-scrape', 'children')],
+        [State('result-key', 'data')]
+    )
+    def run_scrape_detailed(trigger, result_key):
+        listings = services.results.get(result_key) if trigger and result_key else None
+        if not listings:
+            return None
+
+        if LAZY_DETAILS:
+            # Only the first page is fetched now; page_detailed fetches each page as it is viewed.
+            first_page = listings[:DETAIL_PAGE_SIZE]
+            return services.jobs.submit(lambda job: detail_rows(first_page, Deadline.after(DETAILS_TIME_BUDGET)))
+
+        def details(job):
+            pending = []
+            lock = threading.Lock()
+
+            def take_pending(minimum):
+                with lock:
+                    if len(pending) < minimum:
+                        return []
+                    batch = pending[:]
+                    pending.clear()
+                    return batch
+
+            def push_points(batch):
+                # Built and pushed outside the lock, so other worker threads keep adding details meanwhile.
+                if batch:
+                    # Pushed to the search job's room, which the browser already follows.
+                    push(result_key, 'live-scatter', scatter_points(batch))
+
+            def on_detail(product):
+                job.publish([product])
+                with lock:
+                    pending.append(product)
+                push_points(take_pending(LIVE_BATCH_SIZE))
+
+            products = services.get_product_details.execute_incremental(
+                listings, deadline=Deadline.after(DETAILS_TIME_BUDGET), required_fields=CATEGORY_FIELDS,
+                on_detail=on_detail,
+            )
+            push_points(take_pending(1))
+            return products
+
+        return services.jobs.submit(details)
 
     @app.callback(
-        [Output('table-detailed', 'data'),
+        [Output('details-key', 'data'),
          Output('table-detailed', 'columns'),
-         Output('table-initial-container', 'style')
+         Output('table-initial-container', 'style'),
+         Output('details-poll', 'disabled')
         ],
-        [Input('trigger-for-detailed-scrape', 'children')],
-        [State('temp-data-storage', 'children')]
+        [Input('details-poll', 'n_intervals'),
+         Input('details-job', 'data')],
+        [State('result-key', 'data')]
     )
-    def run_scrape_detailed(trigger, json_data):
-        if trigger and json_data:
-            table_data = json.loads(json_data)
-            urls = [extract_url_from_markdown(row['post_link']) for row in table_data]
-            products = services.get_product_details.execute(urls)
-            products, columns = services.presenter.process_and_convert_products(products)
-            return products, columns, {'display': 'none'}
-        else:
-            return [], [], {'display': 'block'}
+    def poll_scrape_detailed(n_intervals, details_job_id, result_key):
+        job = services.jobs.get(details_job_id) if details_job_id else None
+        if job is None or job.status == JobStatus.FAILED:
+            return None, [], {'display': 'block'}, True
+        if not job.finished:
+            return no_update, no_update, no_update, False
+        if LAZY_DETAILS:
+            # The table pages the search listings; the first page only sets the columns.
+            _, columns = services.presenter.process_and_convert_products(job.results)
+            return result_key, columns, {'display': 'none'}, True
+        products, columns = services.presenter.process_and_convert_products(job.results)
+        details_key = details_job_id if services.results.put(details_job_id, products) else None
+        return details_key, columns, {'display': 'none'}, True
 
     @app.callback(
-        Output('scatter-plot-container', 'children'),
-        [Input('table-detailed', 'data')]
+        [Output('table-detailed', 'data'),
+         Output('table-detailed', 'page_count')],
+        [Input('details-key', 'data'),
+         Input('table-detailed', 'page_current'),
+         Input('table-detailed', 'page_size'),
+         Input('table-detailed', 'sort_by'),
+         Input('table-detailed', 'filter_query')]
+    )
+    def page_detailed(details_key, page_current, page_size, sort_by, filter_query):
+        table = tables.get(details_key) if details_key else None
+        if table is None:
+            return [], 1
+        if not LAZY_DETAILS:
+            return table.page(page_current, page_size, filter_query, sort_by)
+
+        listings, page_count = table.source_page(page_current, page_size, filter_query, sort_by)
+        rows = detail_rows(listings, Deadline.after(PAGE_DETAILS_TIME_BUDGET))
+        # The next page is the likeliest to be viewed next.
+        services.details.prefetch(table.source_page((page_current or 0) + 1, page_size, filter_query, sort_by)[0])
+        records, _ = services.presenter.process_and_convert_products(rows)
+        return pd.DataFrame(records).replace({np.nan: None}).to_dict('records'), page_count
+
+    @app.callback(
+        [Output('scatter-plot-container', 'children'),
+         Output('live-scatter', 'figure'),
+         Output('live-scatter', 'style')],
+        [Input('search-job', 'data'),
+         Input('details-key', 'data'),
+         Input('table-detailed', 'data')]
     )
-    def update_scatter_plot(data):
-        if data:
-            df = pd.DataFrame(data)
+    def update_scatter_plot(search_job, details_key, page_rows):
+        if ctx.triggered_id == 'search-job':
+            # A new search: start an empty live chart, extended as details arrive.
+            return None, ui.create_live_scatter_figure(**SCATTER_LABELS), {'display': 'none'}
+        if ctx.triggered_id == 'table-detailed' and not LAZY_DETAILS:
+            return no_update, no_update, no_update
+        # In on-demand mode every page viewed adds its details to the chart.
+        data = scatter_data(details_key)
+        if data is not None and len(data):
             scatter_plot = ui.create_scatter_plot(
-                df,
+                data,
                 x_col='km',
                 y_col='price_usd',
                 color_col='year',
-                labels={"km": "Kilómetros", "price_usd": "Precio (USD)", "year": "Año"},
-                title="Relación entre Precio, Kilómetros y Año del Auto")
-            return scatter_plot
+                **SCATTER_LABELS)
+            return scatter_plot, no_update, {'display': 'none'}
+        return None, no_update, no_update
+
+    @app.callback(
+        Output('scatter-plot', 'figure'),
+        [Input('scatter-plot', 'relayoutData')],
+        [State('details-key', 'data')]
+    )
+    def rescale_scatter_plot(relayout_data, details_key):
+        """Re-aggregate a large scatter plot at the resolution of the zoomed area."""
+        data = scatter_data(details_key) if details_key and relayout_data else None
+        if data is None or len(data) <= SCATTER_WEBGL_THRESHOLD:
+            return no_update
+        x_range = _axis_range(relayout_data, 'xaxis')
+        y_range = _axis_range(relayout_data, 'yaxis')
+        if x_range is None and y_range is None and not relayout_data.get('xaxis.autorange'):
+            return no_update
+        return ui.create_scatter_figure(data, 'km', 'price_usd', 'year', x_range=x_range, y_range=y_range,
+                                        **SCATTER_LABELS)
+
+
+def _listing_row(listing):
+    """Row of a listing whose detail was not fetched, with the category fields its card shows."""
+    return detail_from_listing(listing, tuple(field for field in CARD_FIELDS if listing.get(field)))
+
+
+def _axis_range(relayout_data, axis):
+    """``(min, max)`` of an axis from a Graph's relayoutData, or None if it was not zoomed."""
+    low, high = relayout_data.get(f'{axis}.range[0]'), relayout_data.get(f'{axis}.range[1]')
+    if low is None or high is None:
         return None
+    return float(low), float(high)
@@ -1,9 +1,13 @@
 """Command-line interface for the MercadoLibre Scraper."""
 from container import Container
+from utils import format_filename
+
+DATABASE_PATH = "data/mercadolibre.db"
+CHECKPOINT_DIRECTORY = "data/checkpoints"
 
 
 def main():
-    services = Container.create_for_cli()
+    services = Container.create_for_cli(db_path=DATABASE_PATH, checkpoint_dir=CHECKPOINT_DIRECTORY)
     domain = input("País (ar/mx/br): ").strip() or "ar"
     product = input("Producto: ").strip()
     if not product:
@@ -15,7 +19,9 @@ def main():
     except ValueError:
         limit = 100
 
-    results = services.search_products.execute(domain, product, limit)
+    # Same search, same job ID: an interrupted run resumes from its checkpoint.
+    job_id = f"{domain}-{format_filename(product)}-{limit}"
+    results = services.search_products.execute(domain, product, limit, job_id=job_id)
     print(f"Se encontraron {len(results)} productos.")
 
 
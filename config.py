@@ -1,12 +1,54 @@
 """Application configuration constants.
 
-Flask server and SocketIO are created in dashboard.py, not here.
+Flask server and SocketIO are created by the app factory in dashboard.py, not here.
 """
 import dash_bootstrap_components as dbc
 
 EXTERNAL_STYLESHEETS = [dbc.themes.BOOTSTRAP]
 DATA_DIRECTORY = "data"
 CSV_SEPARATOR = ";"
+DATABASE_PATH = "data/mercadolibre.db"
+CHECKPOINT_DIRECTORY = "data/checkpoints"
+# Seconds the dashboard waits for a search / its details before showing partial results.
+SEARCH_TIME_BUDGET = 30
+DETAILS_TIME_BUDGET = 60
+# Dashboard scrapes running at once in the background; further ones wait in line.
+MAX_BACKGROUND_JOBS = 4
+# Milliseconds between dashboard polls of a running scrape.
+JOB_POLL_INTERVAL = 1000
+# Minimum seconds between progress events sent to the dashboard.
+PROGRESS_MIN_INTERVAL = 0.5
+# Details gathered before each live chart update pushed over SocketIO.
+LIVE_BATCH_SIZE = 10
+# Rows per page of the detailed table, which is paged on the server.
+DETAIL_PAGE_SIZE = 50
+# Fetch details only for the page of the detailed table being viewed (and
+# prefetch the next one) instead of for every result of a search.
+LAZY_DETAILS = True
+# Seconds a page waits for its details before showing the rows without them.
+PAGE_DETAILS_TIME_BUDGET = 10
+# Detail pages fetched at once and details cached by the on-demand mode.
+LAZY_DETAILS_CONFIG = {
+    "max_workers": 8,
+    "max_entries": 20_000,
+    "ttl": 3600,
+}
+# Above this many points the scatter plot is drawn with WebGL from
+# server-side aggregated cells (columns x rows of the grid).
+SCATTER_WEBGL_THRESHOLD = 5000
+SCATTER_RESOLUTION = (400, 300)
+# Identical dashboard searches within this many seconds reuse the same crawl.
+SEARCH_CACHE_TTL = 300
+SEARCH_CACHE_MAX_ENTRIES = 128
+# Server-side store of dashboard search results, passed between callbacks by key.
+RESULT_STORE_CONFIG = {
+    "max_entries": 64,
+    "max_rows": 50_000,
+    "ttl": 3600,
+}
+# Message queue relaying SocketIO events between dashboard processes (wsgi.py).
+SOCKETIO_MESSAGE_QUEUE = "redis://localhost:6379/0"
+# Development server options (python main.py).
 SERVER_CONFIG = {
     "debug": True,
     "allow_unsafe_werkzeug": True,
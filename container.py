@@ -1,10 +1,18 @@
 """Composition root — wires adapters, use cases, and services together."""
+import threading
 from dataclasses import dataclass
+from typing import Callable, Optional
 
 from application.use_cases.search_products import SearchProductsUseCase
-from application.use_cases.get_product_details import GetProductDetailsUseCase
+from application.use_cases.get_product_details import GetProductDetailsUseCase, CATEGORY_FIELDS
+from application.use_cases.estimate_price_distribution import EstimatePriceDistributionUseCase
 from application.services.price_conversion import PriceConversionService
+from application.services.batch_runner import BatchRunner
+from application.services.job_manager import JobManager
+from application.services.search_cache import SearchResultCache
+from application.services.detail_enricher import LazyDetailEnricher
 from presentation.dash_presenter import DashPresenter
+from domain.ports import ProductStorePort, ResultStorePort, ResultPublisherPort, ProgressNotifierPort
 
 
 @dataclass
@@ -14,43 +22,100 @@ class ApplicationServices:
     get_product_details: GetProductDetailsUseCase
     price_conversion: PriceConversionService
     presenter: DashPresenter
+    store: Optional[ProductStorePort] = None
+    estimate_price_distribution: Optional[EstimatePriceDistributionUseCase] = None
+    jobs: Optional[JobManager] = None
+    results: Optional[ResultStorePort] = None
+    live: Optional[ResultPublisherPort] = None
+    search_cache: Optional[SearchResultCache] = None
+    details: Optional[LazyDetailEnricher] = None
+    # Builds the progress notifier of one job, reporting only to that job's clients.
+    progress: Optional[Callable[[str], ProgressNotifierPort]] = None
 
 
 class Container:
     """Factory methods for assembling the application in different contexts."""
 
     @staticmethod
-    def _create_scraper(retailer: str, notifier, config=None):
+    def _create_scraper(retailer: str, notifier, config=None, session=None):
         if retailer == 'mercadolibre':
             from scrapers.mercadolibre.mercadolibre_scraper import MercadoLibreScraper
-            return MercadoLibreScraper(progress_notifier=notifier, config=config)
+            return MercadoLibreScraper(progress_notifier=notifier, config=config, session=session)
         raise ValueError(f"Unknown retailer: {retailer}")
 
     @staticmethod
-    def create_for_dashboard(retailer: str = 'mercadolibre') -> ApplicationServices:
-        from flask_socketio import SocketIO
-        from config import SCRAPER_CONFIG, DATA_DIRECTORY, CSV_SEPARATOR
+    def _create_store(db_path=None):
+        if not db_path:
+            return None
+        from infrastructure.adapters.sqlite_store import SqliteProductStore
+        return SqliteProductStore(db_path)
+
+    @staticmethod
+    def _create_checkpoints(checkpoint_dir=None):
+        if not checkpoint_dir:
+            return None
+        from infrastructure.adapters.jsonl_checkpoint import JsonlCheckpointStore
+        return JsonlCheckpointStore(checkpoint_dir)
+
+    @staticmethod
+    def create_for_dashboard(retailer: str = 'mercadolibre', socketio=None) -> ApplicationServices:
+        """Services of one dashboard process, reporting through its ``socketio`` instance.
+
+        Without ``socketio``, progress is not reported and nothing is pushed live.
+        """
+        from config import (
+            SCRAPER_CONFIG, DATA_DIRECTORY, CSV_SEPARATOR, DATABASE_PATH, CHECKPOINT_DIRECTORY, MAX_BACKGROUND_JOBS,
+            RESULT_STORE_CONFIG, PROGRESS_MIN_INTERVAL, SEARCH_CACHE_TTL, SEARCH_CACHE_MAX_ENTRIES, LAZY_DETAILS_CONFIG,
+        )
         from infrastructure.adapters.socketio_notifier import SocketIOProgressNotifier
+        from infrastructure.adapters.throttled_notifier import ThrottledProgressNotifier
+        from infrastructure.adapters.socketio_publisher import SocketIOResultPublisher, register_subscriptions
         from infrastructure.adapters.dolarapi_client import DolarApiExchangeRate
         from infrastructure.adapters.csv_exporter import CsvProductExporter
+        from infrastructure.adapters.memory_result_store import InMemoryResultStore
+        from infrastructure.adapters.null_notifier import NullProgressNotifier
 
-        # Import the socketio instance created in dashboard.py
-        from dashboard import socketio
-
-        notifier = SocketIOProgressNotifier(socketio)
-        scraper = Container._create_scraper(retailer, notifier, SCRAPER_CONFIG)
+        if socketio is not None:
+            register_subscriptions(socketio)
+            live = SocketIOResultPublisher(socketio)
+
+            def progress(job_id):
+                room_notifier = SocketIOProgressNotifier(socketio, room=job_id)
+                return ThrottledProgressNotifier(room_notifier, PROGRESS_MIN_INTERVAL)
+        else:
+            live = progress = None
+        # Crawls report progress through their job's notifier; the shared scraper reports nothing itself.
+        scraper = Container._create_scraper(retailer, NullProgressNotifier(), SCRAPER_CONFIG)
         exchange_rate = DolarApiExchangeRate()
         exporter = CsvProductExporter(DATA_DIRECTORY, CSV_SEPARATOR)
+        store = Container._create_store(DATABASE_PATH)
+        checkpoints = Container._create_checkpoints(CHECKPOINT_DIRECTORY)
+        search_products = SearchProductsUseCase(
+            scraper=scraper, exporter=exporter, store=store, checkpoints=checkpoints, exchange_rate=exchange_rate,
+        )
+        get_product_details = GetProductDetailsUseCase(
+            scraper=scraper, store=store, snapshots=store, checkpoints=checkpoints,
+        )
 
         return ApplicationServices(
-            search_products=SearchProductsUseCase(scraper=scraper, exporter=exporter),
-            get_product_details=GetProductDetailsUseCase(scraper=scraper),
+            search_products=search_products,
+            get_product_details=get_product_details,
             price_conversion=PriceConversionService(exchange_rate_provider=exchange_rate),
             presenter=DashPresenter(exchange_rate_provider=exchange_rate),
+            store=store,
+            estimate_price_distribution=EstimatePriceDistributionUseCase(scraper=scraper, exchange_rate=exchange_rate),
+            jobs=JobManager(max_workers=MAX_BACKGROUND_JOBS),
+            results=InMemoryResultStore(**RESULT_STORE_CONFIG),
+            live=live,
+            search_cache=SearchResultCache(search_products, ttl=SEARCH_CACHE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES),
+            details=LazyDetailEnricher(get_product_details, required_fields=CATEGORY_FIELDS, **LAZY_DETAILS_CONFIG),
+            progress=progress,
         )
 
     @staticmethod
-    def create_for_cli(retailer: str = 'mercadolibre') -> ApplicationServices:
+    def create_for_cli(
+        retailer: str = 'mercadolibre', db_path: str = None, checkpoint_dir: str = None
+    ) -> ApplicationServices:
         from infrastructure.adapters.null_notifier import NullProgressNotifier
         from infrastructure.adapters.dolarapi_client import DolarApiExchangeRate
         from infrastructure.adapters.csv_exporter import CsvProductExporter
@@ -59,26 +124,96 @@ class Container:
         scraper = Container._create_scraper(retailer, notifier)
         exchange_rate = DolarApiExchangeRate()
         exporter = CsvProductExporter("data", ";")
+        store = Container._create_store(db_path)
+        checkpoints = Container._create_checkpoints(checkpoint_dir)
 
         return ApplicationServices(
-            search_products=SearchProductsUseCase(scraper=scraper, exporter=exporter),
-            get_product_details=GetProductDetailsUseCase(scraper=scraper),
+            search_products=SearchProductsUseCase(
+                scraper=scraper, exporter=exporter, store=store, checkpoints=checkpoints, exchange_rate=exchange_rate,
+            ),
+            get_product_details=GetProductDetailsUseCase(
+                scraper=scraper, store=store, snapshots=store, checkpoints=checkpoints,
+            ),
             price_conversion=PriceConversionService(exchange_rate_provider=exchange_rate),
             presenter=DashPresenter(exchange_rate_provider=exchange_rate),
+            store=store,
+            estimate_price_distribution=EstimatePriceDistributionUseCase(scraper=scraper, exchange_rate=exchange_rate),
         )
 
     @staticmethod
-    def create_for_api(retailer: str = 'mercadolibre') -> ApplicationServices:
+    def create_for_api(
+        retailer: str = 'mercadolibre', db_path: str = None, checkpoint_dir: str = None
+    ) -> ApplicationServices:
         from infrastructure.adapters.null_notifier import NullProgressNotifier
         from infrastructure.adapters.dolarapi_client import DolarApiExchangeRate
 
         notifier = NullProgressNotifier()
         scraper = Container._create_scraper(retailer, notifier)
         exchange_rate = DolarApiExchangeRate()
+        store = Container._create_store(db_path)
+        checkpoints = Container._create_checkpoints(checkpoint_dir)
+        search_products = SearchProductsUseCase(
+            scraper=scraper, store=store, checkpoints=checkpoints, exchange_rate=exchange_rate,
+        )
 
         return ApplicationServices(
-            search_products=SearchProductsUseCase(scraper=scraper),
-            get_product_details=GetProductDetailsUseCase(scraper=scraper),
+            search_products=search_products,
+            get_product_details=GetProductDetailsUseCase(
+                scraper=scraper, store=store, snapshots=store, checkpoints=checkpoints,
+            ),
             price_conversion=PriceConversionService(exchange_rate_provider=exchange_rate),
             presenter=DashPresenter(exchange_rate_provider=exchange_rate),
+            store=store,
+            estimate_price_distribution=EstimatePriceDistributionUseCase(scraper=scraper, exchange_rate=exchange_rate),
+            search_cache=SearchResultCache(search_products),
         )
+
+    @staticmethod
+    def create_batch_runner(
+        retailer: str = 'mercadolibre', data_directory: str = 'data/batch', db_path: str = None,
+        checkpoint_dir: str = None, max_concurrency: int = 8, max_per_host: int = 2, sharded: bool = False,
+    ) -> BatchRunner:
+        """Build a BatchRunner whose jobs share one scraper and HTTP connection pool.
+
+        Each job's listings are exported to Parquet partitioned by country
+        and query under ``data_directory``. With ``sharded``, jobs whose
+        limit exceeds the search pagination cap are crawled as concurrent
+        price-range shards.
+        """
+        import requests
+        from requests.adapters import HTTPAdapter
+        from infrastructure.adapters.null_notifier import NullProgressNotifier
+        from infrastructure.adapters.export_manifest import ExportManifest
+        from infrastructure.adapters.parquet_exporter import ParquetProductExporter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=max_concurrency)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+
+        scraper = Container._create_scraper(retailer, NullProgressNotifier(), session=session)
+        if sharded and retailer == 'mercadolibre':
+            from scrapers.mercadolibre.sharding import ShardedMercadoLibreScraper
+            scraper = ShardedMercadoLibreScraper(scraper)
+        store = Container._create_store(db_path)
+        checkpoints = Container._create_checkpoints(checkpoint_dir)
+        manifest = ExportManifest.for_directory(data_directory)
+
+        use_cases = {}
+        lock = threading.Lock()
+
+        def search_for_country(country: str) -> SearchProductsUseCase:
+            with lock:
+                if country not in use_cases:
+                    exporter = ParquetProductExporter(data_directory, country=country, manifest=manifest)
+                    use_cases[country] = SearchProductsUseCase(
+                        scraper=scraper, exporter=exporter, store=store, checkpoints=checkpoints,
+                    )
+                return use_cases[country]
+
+        runner = BatchRunner(search_for_country, max_concurrency=max_concurrency, max_per_host=max_per_host)
+        if hasattr(scraper, 'slots'):
+            # Shards take their extra connections from the runner's budget, so the
+            # pool size and the per-host limit still bound the requests in flight.
+            scraper.slots = runner
+        return runner
@@ -1,27 +1,43 @@
-"""Dashboard entry point — creates Flask server and Dash app."""
+"""Dashboard app factory — creates the Flask server, SocketIO and the Dash app."""
 import dash
 from flask import Flask
 from flask_socketio import SocketIO
 
 from config import SERVER_CONFIG, EXTERNAL_STYLESHEETS
+from container import Container
 from ui import load_index_html, create_layout
 from callbacks import register_callbacks
 
-server = Flask(__name__)
-socketio = SocketIO(server)
-
 
 class Dashboard:
-    def __init__(self):
-        self.app = dash.Dash(__name__, server=server, external_stylesheets=EXTERNAL_STYLESHEETS)
+    """One dashboard process: its Flask server, SocketIO instance and Dash app.
+
+    Nothing is created at import time, so every process of a production
+    server builds its own instance through ``create_app``.
+
+    Args:
+        message_queue: URL of the message queue (e.g. ``redis://localhost:6379/0``)
+            that relays SocketIO events between processes, so an event emitted
+            by one process reaches clients connected to another. None when
+            the dashboard runs in a single process.
+    """
+
+    def __init__(self, message_queue: str = None):
+        self.server = Flask(__name__)
+        self.socketio = SocketIO(self.server, message_queue=message_queue)
+        self.app = dash.Dash(__name__, server=self.server, external_stylesheets=EXTERNAL_STYLESHEETS)
         self.app.config.suppress_callback_exceptions = True
         self.app.index_string = load_index_html()
         self.app.layout = create_layout()
 
-        # Import Container here to avoid circular imports
-        from container import Container
-        self.services = Container.create_for_dashboard()
+        self.services = Container.create_for_dashboard(socketio=self.socketio)
         register_callbacks(self.app, self.services)
 
     def run(self):
-        socketio.run(server, **SERVER_CONFIG)
+        """Serve with the development server (see wsgi.py for production)."""
+        self.socketio.run(self.server, **SERVER_CONFIG)
+
+
+def create_app(message_queue: str = None) -> Dashboard:
+    """Build a dashboard; its ``server`` is the WSGI application."""
+    return Dashboard(message_queue=message_queue)
@@ -3,27 +3,55 @@ Domain layer for MercadoLibre Scraper.
 
 Pure Python types with no external dependencies.
 """
-from domain.enums import Currency
-from domain.value_objects import Money, Kilometers, SquareMeters
-from domain.entities import ProductListing, ProductDetail, CarProductDetail, PropertyProductDetail
+from domain.enums import Currency, ItemCondition, SortOrder, JobStatus
+from domain.value_objects import Money, Kilometers, SquareMeters, SearchFilters, Deadline
+from domain.entities import (
+    ProductListing, ProductDetail, CarProductDetail, PropertyProductDetail, ScrapeStats, PartialResult,
+    Estimate, PriceDistribution,
+)
 from domain.ports import (
     ScraperPort,
     ExchangeRatePort,
     ProgressNotifierPort,
     ProductExporterPort,
+    StreamingExporterPort,
+    ProductStorePort,
+    DetailSnapshotPort,
+    CrawlCheckpointPort,
+    CheckpointStorePort,
+    JobQueuePort,
+    ResultStorePort,
+    ResultPublisherPort,
 )
 
 __all__ = [
     'Currency',
+    'ItemCondition',
+    'SortOrder',
+    'JobStatus',
     'Money',
     'Kilometers',
     'SquareMeters',
+    'SearchFilters',
+    'Deadline',
     'ProductListing',
     'ProductDetail',
     'CarProductDetail',
     'PropertyProductDetail',
+    'ScrapeStats',
+    'PartialResult',
+    'Estimate',
+    'PriceDistribution',
     'ScraperPort',
     'ExchangeRatePort',
     'ProgressNotifierPort',
     'ProductExporterPort',
+    'StreamingExporterPort',
+    'ProductStorePort',
+    'DetailSnapshotPort',
+    'CrawlCheckpointPort',
+    'CheckpointStorePort',
+    'JobQueuePort',
+    'ResultStorePort',
+    'ResultPublisherPort',
 ]
@@ -19,20 +19,37 @@ class ProductListing:
         price: Price string (thousands separators already removed).
         post_link: URL to the product detail page.
         image_link: URL to the product image.
+        item_id: Retailer item ID parsed from post_link (e.g., "MLA123456789").
+        currency: Currency symbol shown next to the price (e.g., "U$S").
+        category: Category, when the card attributes identify it.
+        year: Vehicle year shown on the card.
+        km: Kilometers shown on the card.
+        m2: Surface shown on the card.
     """
     title: Optional[str] = None
     price: Optional[str] = None
     post_link: Optional[str] = None
     image_link: Optional[str] = None
+    item_id: Optional[str] = None
+    currency: Optional[str] = None
+    category: Optional[str] = None
+    year: Optional[str] = None
+    km: Optional[str] = None
+    m2: Optional[str] = None
 
     def to_dict(self) -> dict:
-        """Convert to dict."""
-        return {
+        """Convert to dict. Fields after image_link are only included when known."""
+        result = {
             'title': self.title,
             'price': self.price,
             'post_link': self.post_link,
             'image_link': self.image_link,
         }
+        for key in ('item_id', 'currency', 'category', 'year', 'km', 'm2'):
+            value = getattr(self, key)
+            if value is not None:
+                result[key] = value
+        return result
 
     @classmethod
     def from_dict(cls, data: dict) -> ProductListing:
@@ -42,6 +59,12 @@ class ProductListing:
             price=data.get('price'),
             post_link=data.get('post_link'),
             image_link=data.get('image_link'),
+            item_id=data.get('item_id'),
+            currency=data.get('currency'),
+            category=data.get('category'),
+            year=data.get('year'),
+            km=data.get('km'),
+            m2=data.get('m2'),
         )
 
 
@@ -57,6 +80,7 @@ class ProductDetail:
         link: Markdown-formatted canonical URL.
         shipping: Shipping/delivery info.
         category: Product category string.
+        item_id: Retailer item ID parsed from the canonical URL.
     """
     title: Optional[str] = None
     price: Optional[str] = None
@@ -65,11 +89,12 @@ class ProductDetail:
     link: Optional[str] = None
     shipping: Optional[str] = None
     category: Optional[str] = None
+    item_id: Optional[str] = None
 
     def to_dict(self) -> dict:
         """Convert to dict, omitting fields that are None."""
         result: dict = {}
-        for key in ('title', 'price', 'publication_date', 'author', 'link', 'shipping'):
+        for key in ('title', 'price', 'publication_date', 'author', 'link', 'shipping', 'item_id'):
             value = getattr(self, key)
             if value is not None:
                 result[key] = value
@@ -86,6 +111,7 @@ class ProductDetail:
             link=data.get('link'),
             shipping=data.get('shipping'),
             category=data.get('category'),
+            item_id=data.get('item_id'),
         )
 
 
@@ -118,6 +144,7 @@ class CarProductDetail(ProductDetail):
             link=data.get('link'),
             shipping=data.get('shipping'),
             category=data.get('category'),
+            item_id=data.get('item_id'),
             year=data.get('year'),
             km=data.get('km'),
         )
@@ -148,5 +175,89 @@ class PropertyProductDetail(ProductDetail):
             link=data.get('link'),
             shipping=data.get('shipping'),
             category=data.get('category'),
+            item_id=data.get('item_id'),
             m2=data.get('m2'),
         )
+
+
+@dataclass
+class ScrapeStats:
+    """Counters reported by a listing crawl.
+
+    Attributes:
+        pages: Result pages fetched.
+        items: Unique listings collected.
+        duplicates: Listings dropped because their item ID was already seen.
+        early_stop: True if pagination stopped because a page had no new items.
+        timed_out: True if pagination stopped because the deadline passed.
+        bytes_read: Size of the HTML downloaded (decoded characters).
+        request_errors: Page requests that failed.
+    """
+    pages: int = 0
+    items: int = 0
+    duplicates: int = 0
+    early_stop: bool = False
+    timed_out: bool = False
+    bytes_read: int = 0
+    request_errors: int = 0
+
+
+class PartialResult(list):
+    """A list of results that may have been cut short by a deadline.
+
+    Behaves as a plain list, so callers that only need the items are
+    unaffected; ``complete`` is False when work was left undone.
+    """
+
+    def __init__(self, items=(), complete: bool = True):
+        super().__init__(items)
+        self.complete = complete
+
+
+@dataclass(frozen=True)
+class Estimate:
+    """A point estimate with its confidence interval."""
+    value: float
+    low: float
+    high: float
+
+    def to_dict(self) -> dict:
+        return {'value': self.value, 'low': self.low, 'high': self.high}
+
+
+@dataclass(frozen=True)
+class PriceDistribution:
+    """Price distribution of a search, estimated from a sample of result pages.
+
+    Attributes:
+        total_results: Results the search reports.
+        sampled_pages: Result pages fetched.
+        sample_size: Priced listings in the sample.
+        confidence: Confidence level of the intervals (e.g. 0.95).
+        mean: Estimated mean price.
+        quantiles: Estimated price at each quantile (e.g. {0.5: median}).
+        histogram: Bins as dicts with 'low', 'high' and 'share' (an Estimate
+            of the fraction of listings in the bin).
+        currency: Currency of every price figure: 'USD', or 'local' for the
+            site's own currency (dollar prices converted when possible).
+    """
+    total_results: int
+    sampled_pages: int
+    sample_size: int
+    confidence: float
+    mean: Estimate
+    quantiles: dict[float, Estimate]
+    histogram: list[dict]
+    currency: str = 'local'
+
+    def to_dict(self) -> dict:
+        return {
+            'total_results': self.total_results,
+            'sampled_pages': self.sampled_pages,
+            'sample_size': self.sample_size,
+            'confidence': self.confidence,
+            'currency': self.currency,
+            'mean': self.mean.to_dict(),
+            'quantiles': {q: estimate.to_dict() for q, estimate in self.quantiles.items()},
+            'histogram': [{**bin_, 'share': bin_['share'].to_dict()} for bin_ in self.histogram],
+        }
@@ -11,3 +11,25 @@ class Currency(str, Enum):
     """Currency codes."""
     ARS = 'ARS'
     USD = 'USD'
+
+
+class ItemCondition(str, Enum):
+    """Condition of a listed item."""
+    NEW = 'new'
+    USED = 'used'
+
+
+class SortOrder(str, Enum):
+    """Order in which a search returns its listings."""
+    RELEVANCE = 'relevance'
+    PRICE_ASC = 'price_asc'
+    PRICE_DESC = 'price_desc'
+    NEWEST = 'newest'
+
+
+class JobStatus(str, Enum):
+    """Lifecycle of a background scrape job."""
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
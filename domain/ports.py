@@ -7,20 +7,44 @@ changing their inheritance — duck typing with static checking.
 """
 from __future__ import annotations
 
-from typing import Protocol, Any, Optional
+from typing import Protocol, Any, Iterable, Iterator, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from domain.entities import ScrapeStats
+    from domain.value_objects import SearchFilters, Deadline
+    from domain.enums import SortOrder
 
 
 class ScraperPort(Protocol):
     """Interface for web scraping operations."""
 
-    def get_page_content(self, url: str) -> Any:
-        """Fetch and parse a web page."""
+    def get_page_content(self, url: str, timeout: Optional[float] = None, stats: Optional[ScrapeStats] = None) -> Any:
+        """Fetch and parse a web page, counting its size or failure in ``stats``."""
         ...
 
     def scrape_product_list(
-        self, domain: str, product_name: str, user_scraping_limit: int
+        self, domain: str, product_name: str, user_scraping_limit: int,
+        stats: Optional[ScrapeStats] = None, checkpoint: Optional[CrawlCheckpointPort] = None,
+        filters: Optional[SearchFilters] = None, sort: Optional[SortOrder] = None,
+        deadline: Optional[Deadline] = None, progress_notifier: Optional[ProgressNotifierPort] = None,
     ) -> list[dict]:
-        """Scrape product listings from search results."""
+        """Scrape unique product listings from search results."""
+        ...
+
+    def iter_product_pages(
+        self, domain: str, product_name: str, user_scraping_limit: int,
+        stats: Optional[ScrapeStats] = None, checkpoint: Optional[CrawlCheckpointPort] = None,
+        filters: Optional[SearchFilters] = None, sort: Optional[SortOrder] = None,
+        deadline: Optional[Deadline] = None, progress_notifier: Optional[ProgressNotifierPort] = None,
+    ) -> Iterator[list[dict]]:
+        """Yield unique product listings one result page at a time."""
+        ...
+
+    def sample_product_pages(
+        self, domain: str, product_name: str, sample_pages: int,
+        filters: Optional[SearchFilters] = None, seed: Optional[int] = None,
+    ) -> tuple[int, int, list[list[dict]]]:
+        """Fetch randomly chosen result pages: (total_results, reachable_pages, pages)."""
         ...
 
     def scrape_product_details(self, soup: Any) -> dict:
@@ -39,8 +63,12 @@ class ExchangeRatePort(Protocol):
 class ProgressNotifierPort(Protocol):
     """Interface for notifying scraping progress."""
 
-    def notify_progress(self, current: int, total: int) -> None:
-        """Notify progress update."""
+    def notify_progress(self, current: int, total: int, metrics: Optional[dict] = None) -> None:
+        """Notify progress update.
+
+        ``metrics`` holds optional counters or rates (e.g. ``items``,
+        ``bytes``, ``errors``, ``pages_per_sec``, ``eta``).
+        """
         ...
 
 
@@ -50,3 +78,117 @@ class ProductExporterPort(Protocol):
     def export(self, data: list[dict], product_name: str) -> None:
         """Export product data (e.g., to CSV)."""
         ...
+
+
+class StreamingExporterPort(ProductExporterPort, Protocol):
+    """Exporter that can also write results page by page while they stream."""
+
+    def export_stream(self, batches: Iterable[list[dict]], product_name: str) -> Iterator[list[dict]]:
+        """Write each batch as it arrives and yield it on unchanged."""
+        ...
+
+
+class ProductStorePort(Protocol):
+    """Interface for persisting scraped listings and details over time."""
+
+    def save_listings(self, listings: list[dict], product_name: str, domain: str) -> None:
+        """Persist a batch of search listings for a query and country."""
+        ...
+
+    def save_details(self, details: list[dict]) -> None:
+        """Persist a batch of product details."""
+        ...
+
+
+class DetailSnapshotPort(Protocol):
+    """Interface for the last known detail of each item, used by incremental scraping."""
+
+    def load_snapshots(self, item_ids: list[str]) -> dict[str, dict]:
+        """Return {item_id: {'fingerprint': str, 'detail': dict}} for the known items."""
+        ...
+
+    def save_snapshots(self, snapshots: dict[str, dict]) -> None:
+        """Insert or replace snapshots keyed by item ID."""
+        ...
+
+
+class CrawlCheckpointPort(Protocol):
+    """Interface for the saved progress of one crawl job."""
+
+    def completed_pages(self) -> dict[int, list[dict]]:
+        """Return {offset: listings} for the result pages already scraped."""
+        ...
+
+    def record_page(self, offset: int, items: list[dict]) -> None:
+        """Persist the listings of a scraped result page."""
+        ...
+
+    def completed_details(self) -> dict[str, dict]:
+        """Return {url: detail} for the detail pages already fetched."""
+        ...
+
+    def record_detail(self, url: str, detail: dict) -> None:
+        """Persist a fetched product detail."""
+        ...
+
+
+class CheckpointStorePort(Protocol):
+    """Interface for opening and discarding crawl checkpoints by job ID."""
+
+    def open(self, job_id: str) -> CrawlCheckpointPort:
+        """Open (or resume) the checkpoint of a job."""
+        ...
+
+    def discard(self, job_id: str) -> None:
+        """Delete the checkpoint of a finished job."""
+        ...
+
+
+class JobQueuePort(Protocol):
+    """Interface for a shared queue of crawl tasks leased by workers."""
+
+    def enqueue(self, kind: str, payload: dict, priority: int = 0) -> int:
+        """Add a task and return its ID."""
+        ...
+
+    def enqueue_items(
+        self, kind: str, field: str, items: list[str], chunk_size: int, dedupe_prefix: str, priority: int = 0,
+    ) -> list[int]:
+        """Enqueue ``items`` in chunked tasks, skipping items already enqueued under ``dedupe_prefix``."""
+        ...
+
+    def lease(self, worker_id: str, lease_seconds: float = 60) -> Optional[dict]:
+        """Claim the next pending task, or return None when the queue is empty."""
+        ...
+
+    def heartbeat(self, task_id: int, worker_id: str, lease_seconds: float = 60) -> bool:
+        """Extend a lease; return False if the worker no longer holds it."""
+        ...
+
+    def complete(self, task_id: int, worker_id: str) -> None:
+        """Mark a leased task as done."""
+        ...
+
+    def fail(self, task_id: int, worker_id: str, error: str) -> None:
+        """Release a leased task after an error, to retry or give up."""
+        ...
+
+
+class ResultStorePort(Protocol):
+    """Interface for keeping search results on the server between requests."""
+
+    def put(self, key: str, rows: list[dict]) -> bool:
+        """Store ``rows`` under ``key``; return False if they were not kept."""
+        ...
+
+    def get(self, key: str) -> Optional[list[dict]]:
+        """Return the rows stored under ``key``, or None if missing or expired."""
+        ...
+
+
+class ResultPublisherPort(Protocol):
+    """Interface for pushing partial results of a running job to its subscribers."""
+
+    def publish(self, job_id: str, channel: str, rows: list[dict], columns: Optional[list[dict]] = None) -> None:
+        """Send ``rows`` (and optionally their table columns) to the clients following ``job_id``."""
+        ...
@@ -7,9 +7,11 @@ belongs in the respective scraper package.
 from __future__ import annotations
 
 import re
+import time
 from dataclasses import dataclass
+from typing import Optional
 
-from domain.enums import Currency
+from domain.enums import Currency, ItemCondition
 
 
 @dataclass(frozen=True)
@@ -75,3 +77,60 @@ class SquareMeters:
             return cls(value=float(number_str))
         except ValueError:
             return None
+
+
+@dataclass(frozen=True)
+class SearchFilters:
+    """Structured filters for a product search.
+
+    Scrapers translate them into the retailer's own search filters, so the
+    site only returns matching listings. Ranges are inclusive and either
+    end may be left open.
+
+    Attributes:
+        min_price / max_price: Price range, in the site's currency.
+        condition: New or used items only.
+        min_year / max_year: Model year range (vehicles).
+        min_km / max_km: Mileage range (vehicles).
+        location: Region/state name (e.g., "Capital Federal").
+        free_shipping: Only listings with free shipping.
+    """
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+    condition: Optional[ItemCondition] = None
+    min_year: Optional[int] = None
+    max_year: Optional[int] = None
+    min_km: Optional[int] = None
+    max_km: Optional[int] = None
+    location: Optional[str] = None
+    free_shipping: bool = False
+
+    def __post_init__(self):
+        for low, high in ((self.min_price, self.max_price), (self.min_year, self.max_year),
+                          (self.min_km, self.max_km)):
+            if low is not None and high is not None and low > high:
+                raise ValueError(f"Invalid range: {low} > {high}")
+
+    def is_empty(self) -> bool:
+        return self == SearchFilters()
+
+
+# Floor for per-request timeouts derived from a nearly expired ``Deadline``.
+MIN_REQUEST_TIMEOUT = 0.5
+
+
+@dataclass(frozen=True)
+class Deadline:
+    """A point in time (on the monotonic clock) by which work must finish."""
+    expires_at: float
+
+    @classmethod
+    def after(cls, seconds: float) -> Deadline:
+        return cls(time.monotonic() + seconds)
+
+    def remaining(self) -> float:
+        """Seconds left, never negative."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
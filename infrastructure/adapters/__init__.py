@@ -1,11 +1,27 @@
 from infrastructure.adapters.socketio_notifier import SocketIOProgressNotifier
 from infrastructure.adapters.null_notifier import NullProgressNotifier
+from infrastructure.adapters.throttled_notifier import ThrottledProgressNotifier
+from infrastructure.adapters.socketio_publisher import SocketIOResultPublisher
 from infrastructure.adapters.dolarapi_client import DolarApiExchangeRate
 from infrastructure.adapters.csv_exporter import CsvProductExporter
+from infrastructure.adapters.parquet_exporter import ParquetProductExporter
+from infrastructure.adapters.export_manifest import ExportManifest
+from infrastructure.adapters.sqlite_store import SqliteProductStore
+from infrastructure.adapters.jsonl_checkpoint import JsonlCheckpointStore
+from infrastructure.adapters.sqlite_job_queue import SqliteJobQueue
+from infrastructure.adapters.memory_result_store import InMemoryResultStore
 
 __all__ = [
     'SocketIOProgressNotifier',
     'NullProgressNotifier',
+    'ThrottledProgressNotifier',
+    'SocketIOResultPublisher',
     'DolarApiExchangeRate',
     'CsvProductExporter',
+    'ParquetProductExporter',
+    'ExportManifest',
+    'SqliteProductStore',
+    'JsonlCheckpointStore',
+    'SqliteJobQueue',
+    'InMemoryResultStore',
 ]
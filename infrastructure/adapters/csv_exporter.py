@@ -1,33 +1,83 @@
 """CSV adapter for ProductExporterPort."""
 import os
+from typing import Iterable, Iterator
 
 import pandas as pd
+from infrastructure.adapters.export_manifest import ExportManifest
 from log_config import get_logger
 
 logger = get_logger(__name__)
 
 
 class CsvProductExporter:
-    """Exports product data to CSV files."""
+    """Exports product data to CSV files and records them in the export manifest."""
 
-    def __init__(self, data_directory: str, csv_separator: str):
+    def __init__(self, data_directory: str, csv_separator: str, manifest: ExportManifest = None):
         self.data_directory = data_directory
         self.csv_separator = csv_separator
+        self.manifest = manifest or ExportManifest.for_directory(data_directory)
 
-    def export(self, data: list[dict], product_name: str) -> None:
-        try:
-            filename = f"{product_name.replace(' ', '-')}.csv"
-            logger.info(f"Preparando para exportar datos del producto: {product_name}")
+    def _prepare_file_path(self, product_name: str) -> str:
+        filename = f"{product_name.replace(' ', '-')}.csv"
+        logger.info(f"Preparando para exportar datos del producto: {product_name}")
+
+        if not os.path.exists(self.data_directory):
+            os.makedirs(self.data_directory)
+            logger.info(f"Creado el directorio de datos: {self.data_directory}")
 
-            if not os.path.exists(self.data_directory):
-                os.makedirs(self.data_directory)
-                logger.info(f"Creado el directorio de datos: {self.data_directory}")
+        return os.path.join(self.data_directory, filename)
 
+    def export(self, data: list[dict], product_name: str) -> None:
+        try:
+            file_path = self._prepare_file_path(product_name)
             df = pd.DataFrame(data)
-            file_path = os.path.join(self.data_directory, filename)
 
             df.to_csv(file_path, sep=self.csv_separator)
+            self.manifest.record(product_name, file_path, len(df), 'csv')
             logger.info(f"Datos exportados exitosamente a {file_path}")
 
         except Exception as e:
             logger.error(f"Error al exportar datos a CSV: {e}")
+
+    def export_stream(self, batches: Iterable[list[dict]], product_name: str) -> Iterator[list[dict]]:
+        """Append each batch to the CSV as it arrives and yield it on unchanged.
+
+        The header is the union of the columns seen so far, in first-seen
+        order like ``export``. When a batch brings new columns, the rows
+        already written are rewritten under the widened header. The
+        manifest entry is recorded at the end.
+        """
+        file_path = None
+        columns: list = []
+        rows = 0
+        for batch in batches:
+            try:
+                if file_path is None:
+                    file_path = self._prepare_file_path(product_name)
+                df = pd.DataFrame(batch, index=range(rows, rows + len(batch)))
+                new_columns = [c for c in df.columns if c not in columns]
+                if new_columns:
+                    columns += new_columns
+                    if rows:
+                        self._widen_header(file_path, columns)
+                df = df.reindex(columns=columns)
+                if rows:
+                    df.to_csv(file_path, sep=self.csv_separator, mode='a', header=False)
+                else:
+                    df.to_csv(file_path, sep=self.csv_separator)
+                rows += len(batch)
+            except Exception as e:
+                logger.error(f"Error al exportar datos a CSV: {e}")
+            yield batch
+
+        if rows:
+            self.manifest.record(product_name, file_path, rows, 'csv')
+            logger.info(f"Datos exportados exitosamente a {file_path}")
+
+    def _widen_header(self, file_path: str, columns: list) -> None:
+        """Rewrite the CSV written so far with ``columns`` as its header."""
+        written = pd.read_csv(file_path, sep=self.csv_separator, index_col=0, dtype=str, keep_default_na=False)
+        written.index.name = None
+        tmp_path = f"{file_path}.tmp"
+        written.reindex(columns=columns).to_csv(tmp_path, sep=self.csv_separator)
+        os.replace(tmp_path, file_path)
@@ -1,7 +1,9 @@
 """DolarAPI adapter for ExchangeRatePort."""
 from __future__ import annotations
 
-from typing import Optional
+import threading
+import time
+from typing import Callable, Optional
 
 import requests
 from log_config import get_logger
@@ -10,16 +12,39 @@ logger = get_logger(__name__)
 
 
 class DolarApiExchangeRate:
-    """Fetches USD/ARS blue exchange rate from dolarapi.com."""
+    """Fetches USD/ARS blue exchange rate from dolarapi.com.
+
+    The rate is cached for ``ttl`` seconds, so the callers converting each
+    page or batch of a job share one request. When a refresh fails, the
+    last rate fetched (if any) is returned instead.
+
+    Args:
+        ttl: Seconds a fetched rate is reused.
+        timeout: Timeout in seconds of each request to dolarapi.com.
+        clock: Monotonic clock; the default is ``time.monotonic``.
+    """
 
     URL = "https://dolarapi.com/v1/dolares/blue"
 
+    def __init__(self, ttl: float = 300, timeout: float = 5, clock: Callable[[], float] = time.monotonic):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.clock = clock
+        self._rate: Optional[float] = None
+        self._expires_at = float('-inf')
+        self._lock = threading.Lock()
+
     def get_usd_to_ars_rate(self) -> Optional[float]:
-        try:
-            response = requests.get(self.URL)
-            response.raise_for_status()
-            data = response.json()
-            return data['venta']
-        except requests.RequestException as e:
-            logger.error(f"Error al obtener la tasa de cambio USD: {e}")
-            return None
+        # Held while fetching, so concurrent callers wait for one request instead of each sending theirs.
+        with self._lock:
+            if self.clock() < self._expires_at:
+                return self._rate
+            try:
+                response = requests.get(self.URL, timeout=self.timeout)
+                response.raise_for_status()
+                data = response.json()
+                self._rate = data['venta']
+                self._expires_at = self.clock() + self.ttl
+            except requests.RequestException as e:
+                logger.error(f"Error al obtener la tasa de cambio USD: {e}")
+            return self._rate
@@ -0,0 +1,146 @@
+"""Manifest index of exported files.
+
+Exporters record every file they write (query, country, timestamp, row
+count, format and path) in a ``manifest.jsonl`` log at the root of the data
+directory, so finding "the latest export for query X" or "everything
+exported since T" does not need to glob and stat the whole directory.
+"""
+from __future__ import annotations
+
+import bisect
+import itertools
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Optional
+
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class ExportManifest:
+    """Append-only log of exports, one JSON line per entry.
+
+    Lookups are served from in-memory indexes: ``latest`` is a dict lookup
+    for any combination of query, country and format, and ``since`` is a
+    binary search over the entries sorted by timestamp. Each record is a
+    single ``O_APPEND`` write of one line, so recording costs the same no
+    matter how many exports the log already holds, and processes exporting
+    to the same directory at once do not lose each other's entries. Lines
+    appended by other processes are read incrementally from the last offset
+    seen.
+
+    Use ``for_directory`` to share one instance per directory, so lookups
+    are served from memory instead of reloading the file.
+
+    Args:
+        directory: Data directory the manifest indexes. Paths are stored
+            relative to it.
+    """
+
+    FILENAME = 'manifest.jsonl'
+
+    _instances: dict[str, ExportManifest] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def for_directory(cls, directory: str) -> ExportManifest:
+        """The manifest of ``directory`` shared by everything in this process."""
+        key = os.path.abspath(directory)
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(directory)
+            return cls._instances[key]
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.path = os.path.join(directory, self.FILENAME)
+        self._lock = threading.Lock()
+        self._entries: list[dict] = []
+        self._timestamps: list[str] = []
+        self._latest: dict[tuple, dict] = {}
+        self._offset = 0
+        self._read_new_lines()
+
+    def _read_new_lines(self) -> None:
+        """Index the complete lines appended since the last read."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size < self._offset:
+            # The log was replaced by a shorter one: index it from scratch.
+            self._entries, self._timestamps, self._latest, self._offset = [], [], {}, 0
+        if size == self._offset:
+            return
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(self._offset)
+                data = f.read(size - self._offset)
+        except OSError as e:
+            logger.error(f"No se pudo leer el manifiesto {self.path}: {e}")
+            return
+        # A line still being written by another process is left for the next read.
+        complete = data[:data.rfind(b'\n') + 1]
+        self._offset += len(complete)
+        for line in complete.splitlines():
+            try:
+                self._index(json.loads(line))
+            except (json.JSONDecodeError, KeyError) as e:
+                logger.error(f"Entrada inválida en el manifiesto {self.path}: {e}")
+
+    def _index(self, entry: dict) -> None:
+        position = bisect.bisect_right(self._timestamps, entry['timestamp'])
+        self._timestamps.insert(position, entry['timestamp'])
+        self._entries.insert(position, entry)
+        fields = (entry['query'], entry['country'], entry['format'])
+        # Index every combination of (query, country, format) with None as wildcard.
+        for mask in itertools.product((True, False), repeat=3):
+            key = tuple(value if keep else None for value, keep in zip(fields, mask))
+            current = self._latest.get(key)
+            if current is None or current['timestamp'] <= entry['timestamp']:
+                self._latest[key] = entry
+
+    def record(
+        self, query: str, path: str, row_count: int, file_format: str,
+        country: Optional[str] = None, timestamp: Optional[datetime] = None,
+    ) -> dict:
+        """Append an export to the log and index it."""
+        entry = {
+            'query': query,
+            'country': country,
+            'timestamp': (timestamp or datetime.now()).isoformat(timespec='microseconds'),
+            'row_count': row_count,
+            'format': file_format,
+            'path': os.path.relpath(path, self.directory),
+        }
+        line = (json.dumps(entry, ensure_ascii=False) + '\n').encode('utf-8')
+        os.makedirs(self.directory, exist_ok=True)
+        with self._lock:
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+            self._read_new_lines()
+        return entry
+
+    def latest(
+        self, query: Optional[str] = None, country: Optional[str] = None, file_format: Optional[str] = None,
+    ) -> Optional[dict]:
+        """Return the most recent export matching the given fields, or None."""
+        with self._lock:
+            self._read_new_lines()
+            return self._latest.get((query, country, file_format))
+
+    def since(self, timestamp: datetime) -> list[dict]:
+        """Return the exports recorded at or after ``timestamp``, oldest first."""
+        with self._lock:
+            self._read_new_lines()
+            start = bisect.bisect_left(self._timestamps, timestamp.isoformat(timespec='microseconds'))
+            return self._entries[start:]
+
+    def absolute_path(self, entry: dict) -> str:
+        return os.path.join(self.directory, entry['path'])
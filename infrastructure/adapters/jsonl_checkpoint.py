@@ -0,0 +1,126 @@
+"""JSON Lines adapter for CheckpointStorePort.
+
+Each job ID gets one append-only file. Every completed page or detail is
+a single appended line, so checkpointing after each page costs one small
+write. Only when records are superseded (a page or detail recorded again)
+is the file compacted: rewritten with one line per key and replaced
+atomically.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class JsonlCrawlCheckpoint:
+    """Checkpoint of a single crawl job backed by a JSON Lines file.
+
+    Thread-safe: detail batches record from several threads at once.
+
+    Args:
+        path: File holding the checkpoint records.
+        compact_every: Superseded records tolerated in the file before it
+            is compacted.
+    """
+
+    def __init__(self, path: str, compact_every: int = 100):
+        self.path = path
+        self.compact_every = compact_every
+        self._pages: dict[int, list[dict]] = {}
+        self._details: dict[str, dict] = {}
+        self._superseded = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, 'rb') as f:
+            data = f.read()
+        for line in data.splitlines():
+            try:
+                self._apply(json.loads(line))
+            except json.JSONDecodeError:
+                # A crash mid-write leaves a truncated last line; skip it.
+                continue
+        if data and not data.endswith(b'\n'):
+            # Cut the truncated line, so the next record starts on a line of its own.
+            with open(self.path, 'r+b') as f:
+                f.truncate(data.rfind(b'\n') + 1)
+        logger.info(
+            f"Checkpoint {self.path} cargado: {len(self._pages)} páginas, {len(self._details)} detalles."
+        )
+
+    def _apply(self, record: dict) -> None:
+        if record.get('type') == 'page':
+            records, key, value = self._pages, record['offset'], record['items']
+        elif record.get('type') == 'detail':
+            records, key, value = self._details, record['url'], record['detail']
+        else:
+            return
+        if key in records:
+            self._superseded += 1
+        records[key] = value
+
+    def completed_pages(self) -> dict[int, list[dict]]:
+        with self._lock:
+            return dict(self._pages)
+
+    def completed_details(self) -> dict[str, dict]:
+        with self._lock:
+            return dict(self._details)
+
+    def record_page(self, offset: int, items: list[dict]) -> None:
+        self._append({'type': 'page', 'offset': offset, 'items': items})
+
+    def record_detail(self, url: str, detail: dict) -> None:
+        self._append({'type': 'detail', 'url': url, 'detail': detail})
+
+    def _append(self, record: dict) -> None:
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            self._apply(record)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(line + '\n')
+            if self._superseded >= self.compact_every:
+                self._compact()
+
+    def _compact(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for offset, items in self._pages.items():
+                f.write(json.dumps({'type': 'page', 'offset': offset, 'items': items},
+                                   ensure_ascii=False, default=str) + '\n')
+            for url, detail in self._details.items():
+                f.write(json.dumps({'type': 'detail', 'url': url, 'detail': detail},
+                                   ensure_ascii=False, default=str) + '\n')
+        os.replace(tmp_path, self.path)
+        self._superseded = 0
+
+
+class JsonlCheckpointStore:
+    """Creates and discards per-job JSON Lines checkpoints in a directory."""
+
+    def __init__(self, directory: str, compact_every: int = 100):
+        self.directory = directory
+        self.compact_every = compact_every
+
+    def _path(self, job_id: str) -> str:
+        safe_id = re.sub(r'[^\w.-]', '_', job_id)
+        return os.path.join(self.directory, f"{safe_id}.jsonl")
+
+    def open(self, job_id: str) -> JsonlCrawlCheckpoint:
+        os.makedirs(self.directory, exist_ok=True)
+        return JsonlCrawlCheckpoint(self._path(job_id), self.compact_every)
+
+    def discard(self, job_id: str) -> None:
+        path = self._path(job_id)
+        if os.path.exists(path):
+            os.remove(path)
+            logger.info(f"Checkpoint {path} eliminado.")
@@ -0,0 +1,90 @@
+"""In-memory adapter for ResultStorePort.
+
+Keeps each dashboard search's results in the server process, so callbacks
+pass a short key instead of shipping the serialized rows to the browser
+and back.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+
+class InMemoryResultStore:
+    """Bounded LRU store of result rows, with a time to live per entry.
+
+    Entries expire ``ttl`` seconds after they were stored. When storing an
+    entry would exceed ``max_entries`` entries or ``max_rows`` rows in
+    total, the least recently used entries are evicted first. A single
+    result larger than ``max_rows`` is not stored at all.
+
+    Args:
+        max_entries: Results kept at once.
+        max_rows: Rows kept at once, across all results.
+        ttl: Seconds a result is kept after it was stored.
+        clock: Monotonic clock; the default is ``time.monotonic``.
+    """
+
+    def __init__(
+        self, max_entries: int = 64, max_rows: int = 50_000, ttl: float = 3600,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: OrderedDict[str, tuple[float, list[dict]]] = OrderedDict()
+        self._rows = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def put(self, key: str, rows: list[dict]) -> bool:
+        if len(rows) > self.max_rows:
+            logger.warning(f"Resultado '{key}' con {len(rows)} filas excede el límite de {self.max_rows}; no se guarda.")
+            return False
+        rows = list(rows)
+        with self._lock:
+            self._remove(key)
+            self._purge_expired()
+            while self._entries and (
+                len(self._entries) >= self.max_entries or self._rows + len(rows) > self.max_rows
+            ):
+                self._remove(next(iter(self._entries)))
+            self._entries[key] = (self.clock() + self.ttl, rows)
+            self._rows += len(rows)
+        return True
+
+    def get(self, key: str) -> Optional[list[dict]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, rows = entry
+            if expires_at <= self.clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return rows
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._rows -= len(entry[1])
+
+    def _purge_expired(self) -> None:
+        now = self.clock()
+        for key in [key for key, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            self._remove(key)
@@ -1,8 +1,9 @@
 """Null adapter for ProgressNotifierPort (tests, CLI, API)."""
+from typing import Optional
 
 
 class NullProgressNotifier:
     """No-op progress notifier — silently discards all notifications."""
 
-    def notify_progress(self, current: int, total: int) -> None:
+    def notify_progress(self, current: int, total: int, metrics: Optional[dict] = None) -> None:
         pass
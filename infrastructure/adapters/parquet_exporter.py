@@ -0,0 +1,114 @@
+"""Parquet adapter for ProductExporterPort."""
+from __future__ import annotations
+
+import os
+import uuid
+from datetime import datetime
+from typing import Iterable, Iterator, Optional
+
+import pandas as pd
+
+from domain.value_objects import Kilometers, SquareMeters
+from infrastructure.adapters.export_manifest import ExportManifest
+from application.services.price_conversion import currency_code
+from utils import format_filename, parse_scraped_number
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+
+def _parse_km(value) -> Optional[int]:
+    km = Kilometers.from_string(value)
+    return km.value if km else None
+
+
+def _parse_m2(value) -> Optional[float]:
+    m2 = SquareMeters.from_string(value)
+    return m2.value if m2 else None
+
+
+class ParquetProductExporter:
+    """Exports product data to compressed Parquet files.
+
+    Files are partitioned hive-style by country, query and scrape date, so
+    analytics jobs can prune partitions and read typed columns directly::
+
+        {data_directory}/country=ar/query=notebook/scrape_date=2026-10-19/part-*.parquet
+
+    ``price``, ``km``, ``year`` and ``m2`` are stored as numeric columns
+    instead of the scraped strings, and ``currency`` holds the ISO code of
+    each price's currency.
+
+    Args:
+        data_directory: Root directory of the partitioned dataset.
+        country: Default country partition, used when ``export`` is called
+            through ``ProductExporterPort`` without an explicit country.
+        compression: Parquet compression codec (``zstd``, ``snappy``, ...).
+        manifest: Export manifest to record files in. Defaults to the one
+            at the root of ``data_directory``.
+    """
+
+    def __init__(
+        self, data_directory: str, country: str = 'ar', compression: str = 'zstd',
+        manifest: ExportManifest = None,
+    ):
+        self.data_directory = data_directory
+        self.country = country
+        self.compression = compression
+        self.manifest = manifest or ExportManifest.for_directory(data_directory)
+
+    def export(self, data: list[dict], product_name: str, country: Optional[str] = None) -> None:
+        try:
+            scraped_at = datetime.now()
+            country = country or self.country
+            partition_dir = self.partition_path(product_name, country, scraped_at)
+            logger.info(f"Preparando para exportar datos del producto: {product_name}")
+
+            os.makedirs(partition_dir, exist_ok=True)
+
+            df = self.to_typed_frame(data, country)
+            filename = f"part-{scraped_at:%H%M%S}-{uuid.uuid4().hex[:8]}.parquet"
+            file_path = os.path.join(partition_dir, filename)
+
+            df.to_parquet(file_path, engine='pyarrow', compression=self.compression, index=False)
+            self.manifest.record(product_name, file_path, len(df), 'parquet', country=country, timestamp=scraped_at)
+            logger.info(f"Datos exportados exitosamente a {file_path}")
+
+        except Exception as e:
+            logger.error(f"Error al exportar datos a Parquet: {e}")
+
+    def export_stream(
+        self, batches: Iterable[list[dict]], product_name: str, country: Optional[str] = None,
+    ) -> Iterator[list[dict]]:
+        """Write each batch as its own part file as it arrives and yield it on unchanged."""
+        for batch in batches:
+            if batch:
+                self.export(batch, product_name, country)
+            yield batch
+
+    def partition_path(self, product_name: str, country: str, scraped_at: datetime) -> str:
+        """Return the partition directory for a given query, country and date."""
+        return os.path.join(
+            self.data_directory,
+            f"country={country}",
+            f"query={format_filename(product_name)}",
+            f"scrape_date={scraped_at:%Y-%m-%d}",
+        )
+
+    @staticmethod
+    def to_typed_frame(data: list[dict], country: Optional[str] = None) -> pd.DataFrame:
+        """Build a DataFrame with numeric dtypes for the known numeric columns.
+
+        Priced rows get the ISO code of their currency on the ``country`` site.
+        """
+        df = pd.DataFrame(data)
+        if 'price' in df.columns:
+            df['currency'] = [currency_code(row, country) for row in data]
+            df['price'] = df['price'].map(parse_scraped_number).astype('Float64')
+        if 'km' in df.columns:
+            df['km'] = df['km'].map(_parse_km).astype('Int64')
+        if 'year' in df.columns:
+            df['year'] = pd.to_numeric(df['year'], errors='coerce').astype('Int64')
+        if 'm2' in df.columns:
+            df['m2'] = df['m2'].map(_parse_m2).astype('Float64')
+        return df
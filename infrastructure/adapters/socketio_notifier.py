@@ -1,11 +1,22 @@
 """SocketIO adapter for ProgressNotifierPort."""
+from typing import Optional
 
 
 class SocketIOProgressNotifier:
-    """Notifies scraping progress via SocketIO websocket events."""
+    """Notifies scraping progress via SocketIO websocket events.
 
-    def __init__(self, socketio_instance):
+    With a ``room`` (a job ID), progress only reaches the clients following
+    that job (see ``register_subscriptions``) and carries its ``job_id``;
+    otherwise it is broadcast to every client.
+    """
+
+    def __init__(self, socketio_instance, room: Optional[str] = None):
         self.socketio = socketio_instance
+        self.room = room
 
-    def notify_progress(self, current: int, total: int) -> None:
-        self.socketio.emit('scrape_status', {'progress': current, 'total': total})
+    def notify_progress(self, current: int, total: int, metrics: Optional[dict] = None) -> None:
+        payload = {'progress': current, 'total': total, **(metrics or {})}
+        if self.room is None:
+            self.socketio.emit('scrape_status', payload)
+        else:
+            self.socketio.emit('scrape_status', {**payload, 'job_id': self.room}, to=self.room)
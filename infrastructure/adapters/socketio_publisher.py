@@ -0,0 +1,33 @@
+"""SocketIO adapter for ResultPublisherPort."""
+from typing import Optional
+
+# Event carrying a batch of rows of a running job.
+ROWS_EVENT = 'job_rows'
+
+
+class SocketIOResultPublisher:
+    """Pushes partial results to the SocketIO room named after the job ID.
+
+    Browsers join the room by emitting ``subscribe`` with the job ID (see
+    ``register_subscriptions``), so each client only receives the rows of
+    the jobs it started.
+    """
+
+    def __init__(self, socketio_instance):
+        self.socketio = socketio_instance
+
+    def publish(self, job_id: str, channel: str, rows: list[dict], columns: Optional[list[dict]] = None) -> None:
+        payload = {'job_id': job_id, 'channel': channel, 'rows': rows}
+        if columns is not None:
+            payload['columns'] = columns
+        self.socketio.emit(ROWS_EVENT, payload, to=job_id)
+
+
+def register_subscriptions(socketio_instance) -> None:
+    """Let clients join the room of a job to receive its rows."""
+    from flask_socketio import join_room
+
+    @socketio_instance.on('subscribe')
+    def subscribe(data):
+        if data and data.get('job_id'):
+            join_room(data['job_id'])
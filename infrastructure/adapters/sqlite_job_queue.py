@@ -0,0 +1,216 @@
+"""SQLite adapter for JobQueuePort.
+
+A task queue in a local SQLite file, so several worker processes on one
+machine can split a large crawl without running an external broker.
+
+Single host only: SQLite's WAL mode and ``BEGIN IMMEDIATE`` locking rely
+on file locks that network filesystems (NFS, SMB) do not implement
+reliably, so a queue file shared between machines can grant the same
+lease twice or be corrupted. Workers on several machines need a
+server-backed JobQueuePort.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    kind TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    priority INTEGER NOT NULL DEFAULT 0,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker_id TEXT,
+    lease_expires REAL,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_pending ON tasks (status, priority DESC, id);
+CREATE INDEX IF NOT EXISTS idx_tasks_lease ON tasks (status, lease_expires);
+CREATE TABLE IF NOT EXISTS task_items (
+    item_key TEXT PRIMARY KEY,
+    task_id INTEGER NOT NULL
+);
+"""
+
+
+class SqliteJobQueue:
+    """Task queue with leases, heartbeats and retries, stored in SQLite.
+
+    ``lease`` claims the highest-priority pending task inside a
+    ``BEGIN IMMEDIATE`` transaction, so concurrent workers never claim the
+    same task. A leased task belongs to its worker until the lease expires;
+    workers extend it with ``heartbeat`` while they run. Tasks whose lease
+    expired (the worker crashed or hung) go back to pending on the next
+    ``lease`` call. Failed tasks are retried until ``max_attempts``.
+
+    Args:
+        db_path: Path to the SQLite file (``:memory:`` for tests).
+        max_attempts: Leases a task gets before it is marked as failed.
+        clock: Wall-clock function; the default is ``time.time``.
+    """
+
+    def __init__(self, db_path: str, max_attempts: int = 3, clock: Callable[[], float] = time.time):
+        self.db_path = db_path
+        self.max_attempts = max_attempts
+        self.clock = clock
+        if db_path != ':memory:':
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode: transactions are opened explicitly where needed.
+        self._conn = sqlite3.connect(db_path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def enqueue(self, kind: str, payload: dict, priority: int = 0) -> int:
+        return self.enqueue_many([(kind, payload, priority)])[0]
+
+    def enqueue_many(self, tasks: list[tuple[str, dict, int]]) -> list[int]:
+        """Add several ``(kind, payload, priority)`` tasks in one transaction."""
+        now = self.clock()
+        ids = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for kind, payload, priority in tasks:
+                    cursor = self._conn.execute(
+                        "INSERT INTO tasks (kind, payload, priority, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                        (kind, json.dumps(payload, ensure_ascii=False), priority, now, now),
+                    )
+                    ids.append(cursor.lastrowid)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return ids
+
+    def enqueue_items(
+        self, kind: str, field: str, items: list[str], chunk_size: int, dedupe_prefix: str, priority: int = 0,
+    ) -> list[int]:
+        """Enqueue ``items`` in tasks of ``chunk_size`` (payload ``{field: chunk}``), each item once.
+
+        Items already enqueued under the same ``dedupe_prefix`` are skipped,
+        so a task that fans out work and is rerun after its worker died
+        does not enqueue the same items again.
+        """
+        now = self.clock()
+        ids = []
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                new_items = [
+                    item for item in dict.fromkeys(items)
+                    if self._conn.execute(
+                        "INSERT OR IGNORE INTO task_items (item_key, task_id) VALUES (?, 0)",
+                        (f"{dedupe_prefix}:{item}",),
+                    ).rowcount
+                ]
+                for start in range(0, len(new_items), chunk_size):
+                    chunk = new_items[start:start + chunk_size]
+                    cursor = self._conn.execute(
+                        "INSERT INTO tasks (kind, payload, priority, created_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                        (kind, json.dumps({field: chunk}, ensure_ascii=False), priority, now, now),
+                    )
+                    ids.append(cursor.lastrowid)
+                    self._conn.executemany(
+                        "UPDATE task_items SET task_id = ? WHERE item_key = ?",
+                        [(cursor.lastrowid, f"{dedupe_prefix}:{item}") for item in chunk],
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if len(new_items) < len(items):
+            logger.info(f"Se omitieron {len(items) - len(new_items)} elementos ya encolados ({dedupe_prefix}).")
+        return ids
+
+    def lease(self, worker_id: str, lease_seconds: float = 60) -> Optional[dict]:
+        now = self.clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._requeue_expired(now)
+                row = self._conn.execute(
+                    "SELECT id, kind, payload, attempts FROM tasks WHERE status = 'pending' "
+                    "ORDER BY priority DESC, id LIMIT 1"
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE tasks SET status = 'leased', worker_id = ?, lease_expires = ?, "
+                        "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                        (worker_id, now + lease_seconds, now, row['id']),
+                    )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return {
+            'id': row['id'],
+            'kind': row['kind'],
+            'payload': json.loads(row['payload']),
+            'attempts': row['attempts'] + 1,
+        }
+
+    def _requeue_expired(self, now: float) -> int:
+        cursor = self._conn.execute(
+            "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+            "worker_id = NULL, lease_expires = NULL, error = 'lease expired', updated_at = ? "
+            "WHERE status = 'leased' AND lease_expires < ?",
+            (self.max_attempts, now, now),
+        )
+        if cursor.rowcount:
+            logger.warning(f"Se liberaron {cursor.rowcount} tareas con lease vencido.")
+        return cursor.rowcount
+
+    def heartbeat(self, task_id: int, worker_id: str, lease_seconds: float = 60) -> bool:
+        now = self.clock()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND worker_id = ?",
+                (now + lease_seconds, now, task_id, worker_id),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, task_id: int, worker_id: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE tasks SET status = 'done', lease_expires = NULL, error = NULL, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND worker_id = ?",
+                (self.clock(), task_id, worker_id),
+            )
+
+    def fail(self, task_id: int, worker_id: str, error: str) -> None:
+        with self._lock:
+            self._conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= ? THEN 'failed' ELSE 'pending' END, "
+                "worker_id = NULL, lease_expires = NULL, error = ?, updated_at = ? "
+                "WHERE id = ? AND status = 'leased' AND worker_id = ?",
+                (self.max_attempts, error, self.clock(), task_id, worker_id),
+            )
+
+    def counts(self) -> dict[str, int]:
+        """Return the number of tasks per status."""
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM tasks GROUP BY status").fetchall()
+        return {row['status']: row['n'] for row in rows}
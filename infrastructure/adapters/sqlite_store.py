@@ -0,0 +1,237 @@
+"""SQLite adapter for ProductStorePort and DetailSnapshotPort.
+
+Keeps every scraped listing and detail as a timestamped row, so price
+history and per-day rankings can be answered with indexed queries instead
+of re-reading exported CSVs.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from domain.value_objects import Kilometers, SquareMeters
+from application.services.price_conversion import currency_code
+from utils import format_filename, parse_scraped_number
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    id INTEGER PRIMARY KEY,
+    item_id TEXT NOT NULL,
+    country TEXT NOT NULL,
+    query TEXT NOT NULL,
+    scraped_at TEXT NOT NULL,
+    title TEXT,
+    price REAL,
+    currency TEXT,
+    post_link TEXT,
+    image_link TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_listings_item ON listings (item_id, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_listings_query ON listings (country, query, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_listings_scraped_at ON listings (scraped_at);
+
+CREATE TABLE IF NOT EXISTS details (
+    id INTEGER PRIMARY KEY,
+    item_id TEXT NOT NULL,
+    scraped_at TEXT NOT NULL,
+    title TEXT,
+    price REAL,
+    currency TEXT,
+    category TEXT,
+    year INTEGER,
+    km INTEGER,
+    m2 REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_details_item ON details (item_id, scraped_at);
+CREATE INDEX IF NOT EXISTS idx_details_scraped_at ON details (scraped_at);
+
+CREATE TABLE IF NOT EXISTS detail_snapshots (
+    item_id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    detail TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+"""
+
+# Columns added after the first schema: (table, column, type), added to older databases on open.
+_ADDED_COLUMNS = (
+    ('listings', 'currency', 'TEXT'),
+)
+
+# Stay well below SQLITE_MAX_VARIABLE_NUMBER for IN (...) lookups.
+_IN_CLAUSE_CHUNK = 500
+
+
+def _normalize_query(product_name: str) -> str:
+    return format_filename(product_name.strip())
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(str(value).strip())
+    except (TypeError, ValueError):
+        return None
+
+
+class SqliteProductStore:
+    """Persists listings and details in a local SQLite database.
+
+    The database runs in WAL mode so readers (dashboards, analytics) never
+    block the scraper, and each batch is written with a single
+    ``executemany`` inside one transaction. Rows without an ``item_id`` are
+    skipped, since the item ID is what ties a listing to its history.
+
+    Args:
+        db_path: Path to the SQLite file (``:memory:`` for tests).
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        if db_path != ':memory:':
+            directory = os.path.dirname(db_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._add_missing_columns()
+
+    def _add_missing_columns(self) -> None:
+        for table, column, column_type in _ADDED_COLUMNS:
+            columns = {row['name'] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def save_listings(
+        self, listings: list[dict], product_name: str, domain: str,
+        scraped_at: Optional[datetime] = None,
+    ) -> None:
+        timestamp = (scraped_at or datetime.now()).isoformat(timespec='seconds')
+        query = _normalize_query(product_name)
+        rows = [
+            (
+                listing['item_id'], domain, query, timestamp,
+                listing.get('title'), parse_scraped_number(listing.get('price')), currency_code(listing, domain),
+                listing.get('post_link'), listing.get('image_link'),
+            )
+            for listing in listings if listing.get('item_id')
+        ]
+        if len(rows) < len(listings):
+            logger.warning(f"Se omitieron {len(listings) - len(rows)} publicaciones sin item_id.")
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO listings "
+                "(item_id, country, query, scraped_at, title, price, currency, post_link, image_link) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        logger.info(f"Guardadas {len(rows)} publicaciones de '{query}' ({domain}) en {self.db_path}")
+
+    def save_details(self, details: list[dict], scraped_at: Optional[datetime] = None) -> None:
+        timestamp = (scraped_at or datetime.now()).isoformat(timespec='seconds')
+        rows = []
+        for detail in details:
+            if not detail.get('item_id'):
+                continue
+            km = Kilometers.from_string(detail.get('km'))
+            m2 = SquareMeters.from_string(detail.get('m2'))
+            rows.append((
+                detail['item_id'], timestamp, detail.get('title'),
+                parse_scraped_number(detail.get('price')), currency_code(detail),
+                detail.get('category'), _to_int(detail.get('year')),
+                km.value if km else None, m2.value if m2 else None,
+                json.dumps(detail, ensure_ascii=False, default=str),
+            ))
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT INTO details (item_id, scraped_at, title, price, currency, category, year, km, m2, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        logger.info(f"Guardados {len(rows)} detalles en {self.db_path}")
+
+    def load_snapshots(self, item_ids: list[str]) -> dict[str, dict]:
+        snapshots = {}
+        with self._lock:
+            for start in range(0, len(item_ids), _IN_CLAUSE_CHUNK):
+                chunk = item_ids[start:start + _IN_CLAUSE_CHUNK]
+                placeholders = ', '.join('?' for _ in chunk)
+                rows = self._conn.execute(
+                    f"SELECT item_id, fingerprint, detail FROM detail_snapshots WHERE item_id IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+                for row in rows:
+                    snapshots[row['item_id']] = {
+                        'fingerprint': row['fingerprint'],
+                        'detail': json.loads(row['detail']),
+                    }
+        return snapshots
+
+    def save_snapshots(self, snapshots: dict[str, dict]) -> None:
+        timestamp = datetime.now().isoformat(timespec='seconds')
+        rows = [
+            (item_id, snapshot['fingerprint'], json.dumps(snapshot['detail'], ensure_ascii=False, default=str), timestamp)
+            for item_id, snapshot in snapshots.items()
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO detail_snapshots (item_id, fingerprint, detail, updated_at) "
+                "VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def price_history(self, item_id: str) -> list[dict]:
+        """Return every observed listing price for an item, oldest first."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT scraped_at, price, country, query FROM listings "
+                "WHERE item_id = ? ORDER BY scraped_at",
+                (item_id,),
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def cheapest(
+        self, product_name: str, domain: str, limit: int = 50, day: Optional[date] = None,
+        currency: Optional[str] = None,
+    ) -> list[dict]:
+        """Return the cheapest distinct items seen for a query on a given day (default today).
+
+        Prices are only comparable within one currency, so items are ranked
+        in ``currency`` (an ISO code); by default, the currency most of that
+        day's listings are priced in.
+        """
+        day = day or date.today()
+        start = day.isoformat()
+        end = (day + timedelta(days=1)).isoformat()
+        where = "country = ? AND query = ? AND scraped_at >= ? AND scraped_at < ? AND price IS NOT NULL"
+        params = (domain, _normalize_query(product_name), start, end)
+        with self._lock:
+            if currency is None:
+                majority = self._conn.execute(
+                    f"SELECT currency FROM listings WHERE {where} GROUP BY currency ORDER BY COUNT(*) DESC LIMIT 1",
+                    params,
+                ).fetchone()
+                currency = majority['currency'] if majority else None
+            rows = self._conn.execute(
+                "SELECT item_id, MIN(price) AS price, currency, title, post_link, image_link, scraped_at "
+                f"FROM listings WHERE {where} AND currency IS ? "
+                "GROUP BY item_id ORDER BY price LIMIT ?",
+                (*params, currency, limit),
+            ).fetchall()
+        return [dict(row) for row in rows]
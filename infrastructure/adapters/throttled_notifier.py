@@ -0,0 +1,118 @@
+"""Rate-limiting decorator for any ProgressNotifierPort.
+
+Scrapers report progress after every page, from the crawling thread. With
+concurrent fetching that becomes a burst of events that floods the socket
+and makes the scraper wait on the emitter. This decorator returns at once,
+keeps only the latest update, and forwards it from its own thread at most
+once per interval, adding throughput and ETA figures.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Optional
+
+from log_config import get_logger
+
+if TYPE_CHECKING:
+    from domain.ports import ProgressNotifierPort
+
+logger = get_logger(__name__)
+
+
+class ThrottledProgressNotifier:
+    """Coalesces progress updates and emits them from a background thread.
+
+    Every update replaces the pending one; the emitter thread forwards the
+    latest update to ``inner`` at most once every ``min_interval`` seconds,
+    so the last update of a crawl is always delivered, just possibly late.
+
+    The forwarded metrics add, to the per-crawl counters the scraper
+    reports (``items``, ``bytes``, ``errors``), the rates since the crawl
+    started: ``pages_per_sec``, ``items_per_sec``, ``bytes_per_sec``, plus
+    ``eta`` in seconds. Rates are measured from the first update of a
+    crawl, so they are None until the second one. A crawl starts when
+    ``total`` changes or ``current`` goes back; since crawls running at
+    once would interleave their updates, give each job its own notifier.
+
+    Args:
+        inner: ProgressNotifierPort receiving the throttled updates.
+        min_interval: Minimum seconds between forwarded updates.
+        clock: Monotonic clock; the default is ``time.monotonic``.
+    """
+
+    def __init__(
+        self, inner: ProgressNotifierPort, min_interval: float = 0.5, clock: Callable[[], float] = time.monotonic,
+    ):
+        self.inner = inner
+        self.min_interval = min_interval
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._pending: Optional[tuple[int, int, dict]] = None
+        self._run_start: Optional[tuple[float, int, int, dict]] = None
+        self._last_current = 0
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+
+    def notify_progress(self, current: int, total: int, metrics: Optional[dict] = None) -> None:
+        now = self.clock()
+        metrics = dict(metrics or {})
+        with self._lock:
+            start = self._run_start
+            if start is None or total != start[2] or current < self._last_current:
+                self._run_start = start = (now, current, total, metrics)
+            self._last_current = current
+            self._pending = (current, total, self._with_rates(now, current, total, metrics, start))
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._emit_loop, name='progress-notifier', daemon=True)
+                self._thread.start()
+        self._wakeup.set()
+
+    def flush(self) -> None:
+        """Forward the pending update now, from the calling thread."""
+        with self._lock:
+            pending, self._pending = self._pending, None
+        if pending:
+            self._forward(pending)
+
+    def close(self) -> None:
+        """Stop the emitter thread after forwarding the pending update."""
+        with self._lock:
+            self._closed = True
+            thread = self._thread
+        self._wakeup.set()
+        if thread is not None:
+            thread.join()
+        self.flush()
+
+    def _emit_loop(self) -> None:
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            with self._lock:
+                pending, self._pending = self._pending, None
+                closed = self._closed
+            if pending:
+                self._forward(pending)
+            if closed:
+                return
+            time.sleep(self.min_interval)
+
+    def _forward(self, update: tuple[int, int, dict]) -> None:
+        try:
+            self.inner.notify_progress(*update)
+        except Exception as e:
+            logger.error(f"Error al notificar el progreso: {e}")
+
+    def _with_rates(self, now: float, current: int, total: int, metrics: dict, start: tuple) -> dict:
+        started_at, start_pages, _, start_metrics = start
+        elapsed = now - started_at
+        pages = current - start_pages
+        rates = {}
+        for name in ('pages', 'items', 'bytes'):
+            done = pages if name == 'pages' else metrics.get(name, 0) - start_metrics.get(name, 0)
+            rates[f'{name}_per_sec'] = round(done / elapsed, 2) if elapsed > 0 else None
+        pages_per_sec = rates['pages_per_sec']
+        eta = round(max(total - current, 0) / pages_per_sec, 1) if pages_per_sec else None
+        return {**metrics, **rates, 'eta': eta}
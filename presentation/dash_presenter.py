@@ -15,22 +15,26 @@ logger = get_logger(__name__)
 
 
 class DashPresenter:
+    """Formats scraping results for Dash DataTables.
+
+    Holds no per-request state: each method works on the data it is given
+    and returns new data, so one instance can serve concurrent callbacks.
+    """
 
     def __init__(self, exchange_rate_provider: ExchangeRatePort):
-        self.df = pd.DataFrame()
         self.exchange_rate_provider = exchange_rate_provider
 
     def prepare_table_data(self, data: list[dict]) -> tuple[list[dict], list[dict]]:
-        self.df = pd.DataFrame(data)
+        df = pd.DataFrame(data)
         columns = []
-        if not self.df.empty:
-            self.convert_price()
+        if not df.empty:
+            df = self.convert_price(df)
 
-            if 'post_link' in self.df.columns:
-                self.df['post_link'] = self.df['post_link'].apply(format_link_to_markdown)
+            if 'post_link' in df.columns:
+                df['post_link'] = df['post_link'].apply(format_link_to_markdown)
 
-            sort_column = 'price' if 'price' in self.df.columns else self.df.columns[0]
-            sorted_df = self.df.sort_values(by=sort_column, ascending=True)
+            sort_column = 'price' if 'price' in df.columns else df.columns[0]
+            sorted_df = df.sort_values(by=sort_column, ascending=True)
 
             if 'price' in sorted_df.columns:
                 sorted_df["price"] = sorted_df["price"].apply(format_price_for_display)
@@ -65,24 +69,27 @@ class DashPresenter:
     def fetch_usd_exchange_rate(self) -> Optional[float]:
         return self.exchange_rate_provider.get_usd_to_ars_rate()
 
-    def convert_price(self) -> None:
-        if 'price' not in self.df.columns:
-            return
+    def convert_price(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Return a copy of ``df`` with ``price_pesos`` and ``price_usd`` columns added."""
+        if 'price' not in df.columns:
+            return df
 
         logger.info("Inicio de la conversión de precios.")
         exchange_rate = self.fetch_usd_exchange_rate()
         if exchange_rate is None:
             logger.error("No se pudo obtener la tasa de cambio USD para la conversión.")
-            return
+            return df
 
         logger.info(f"Tasa de cambio obtenida: {exchange_rate}")
 
-        self.df['price'] = self.df['price'].astype(str)
-        self.df[['price_pesos', 'price_usd']] = self.df.apply(lambda row: self.convert_single_price(row['price'], exchange_rate), axis=1)
+        df = df.copy()
+        df['price'] = df['price'].astype(str)
+        df[['price_pesos', 'price_usd']] = df.apply(lambda row: self.convert_single_price(row['price'], exchange_rate), axis=1)
 
-        self.df['price_pesos'] = pd.to_numeric(self.df['price_pesos'], errors='coerce')
-        self.df['price_usd'] = pd.to_numeric(self.df['price_usd'], errors='coerce')
+        df['price_pesos'] = pd.to_numeric(df['price_pesos'], errors='coerce')
+        df['price_usd'] = pd.to_numeric(df['price_usd'], errors='coerce')
         logger.info("Conversión de precios completada.")
+        return df
 
     def convert_single_price(self, value: str, exchange_rate: float) -> pd.Series:
         if "U$S" in value:
@@ -95,15 +102,14 @@ class DashPresenter:
             return pd.Series([number, converted_value_usd])
 
     def remove_empty_columns(self, df, columns):
-        for column in columns:
-            if column in df.columns and df[column].isnull().all():
-                logger.info(f"Eliminando columna vacía: {column}")
-                df.drop(columns=[column], inplace=True)
-        return df
+        empty = [column for column in columns if column in df.columns and df[column].isnull().all()]
+        for column in empty:
+            logger.info(f"Eliminando columna vacía: {column}")
+        return df.drop(columns=empty)
 
     def process_and_convert_products(self, products: list[dict]) -> tuple[list[dict], list[dict]]:
-        self.df = pd.DataFrame(products)
-        self.convert_price()
-        self.df = self.remove_empty_columns(self.df, ['shipping', 'cuotas'])
-        columns = self.generate_columns(self.df.to_dict('records'))
-        return self.df.to_dict('records'), columns
+        df = self.convert_price(pd.DataFrame(products))
+        df = self.remove_empty_columns(df, ['shipping', 'cuotas'])
+        records = df.to_dict('records')
+        columns = self.generate_columns(records) if records else []
+        return records, columns
@@ -0,0 +1,98 @@
+"""Server-side downsampling of scatter plot points.
+
+A browser can draw a few thousand markers comfortably; tens of thousands
+freeze it, and at screen resolution most of them overlap anyway. Points
+are aggregated into a grid of screen-sized cells instead, one marker per
+occupied cell, while outliers are kept as individual markers so they do
+not disappear into a cell average.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class AggregatedPoints:
+    """Markers to draw: one per occupied cell plus one per outlier.
+
+    Attributes:
+        x, y: Marker positions (the mean of the points in each cell).
+        color: Mean color value of each marker (NaN if none of its points had one).
+        count: Points each marker stands for (1 for outliers).
+    """
+    x: np.ndarray
+    y: np.ndarray
+    color: np.ndarray
+    count: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+
+def _robust_outliers(values: np.ndarray, threshold: float) -> np.ndarray:
+    """Points whose modified z-score (median and MAD based) exceeds ``threshold``."""
+    median = np.median(values)
+    mad = np.median(np.abs(values - median))
+    if mad == 0:
+        return np.zeros(len(values), dtype=bool)
+    return 0.6745 * np.abs(values - median) / mad > threshold
+
+
+def aggregate_points(
+    x, y, color=None, x_range: Optional[tuple[float, float]] = None, y_range: Optional[tuple[float, float]] = None,
+    resolution: tuple[int, int] = (400, 300), outlier_threshold: float = 3.5,
+) -> AggregatedPoints:
+    """Aggregate points into a ``resolution`` grid over the visible ranges.
+
+    Points outside ``x_range``/``y_range`` (the current zoom; the data
+    extent by default) are dropped, so zooming in and aggregating again
+    gives finer cells over the visible area. Points with a robust z-score
+    above ``outlier_threshold`` on either axis are returned unaggregated.
+
+    Args:
+        x, y: Point coordinates; rows where either is NaN are ignored.
+        color: Optional value averaged per cell for the marker color.
+        x_range, y_range: Visible ``(min, max)`` of each axis.
+        resolution: Cells along x and y, roughly the plot size in pixels
+            divided by the marker size.
+        outlier_threshold: Modified z-score above which a point is kept as is.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    color = np.full(len(x), np.nan) if color is None else np.asarray(color, dtype=float)
+
+    keep = np.isfinite(x) & np.isfinite(y)
+    if x_range is not None:
+        keep &= (x >= x_range[0]) & (x <= x_range[1])
+    if y_range is not None:
+        keep &= (y >= y_range[0]) & (y <= y_range[1])
+    x, y, color = x[keep], y[keep], color[keep]
+    if not len(x):
+        return AggregatedPoints(x, y, color, np.zeros(0, dtype=int))
+
+    outliers = _robust_outliers(x, outlier_threshold) | _robust_outliers(y, outlier_threshold)
+    inliers = ~outliers
+    bx, by, bc = x[inliers], y[inliers], color[inliers]
+
+    columns, rows = resolution
+    x_low, x_high = x_range if x_range is not None else (bx.min(initial=0), bx.max(initial=0))
+    y_low, y_high = y_range if y_range is not None else (by.min(initial=0), by.max(initial=0))
+    ix = np.clip(((bx - x_low) / ((x_high - x_low) or 1) * columns).astype(int), 0, columns - 1)
+    iy = np.clip(((by - y_low) / ((y_high - y_low) or 1) * rows).astype(int), 0, rows - 1)
+    cells, inverse, counts = np.unique(ix * rows + iy, return_inverse=True, return_counts=True)
+
+    colored = np.isfinite(bc)
+    color_counts = np.bincount(inverse, weights=colored, minlength=len(cells))
+    color_sums = np.bincount(inverse, weights=np.where(colored, bc, 0), minlength=len(cells))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cell_colors = np.where(color_counts > 0, color_sums / color_counts, np.nan)
+
+    return AggregatedPoints(
+        x=np.concatenate([np.bincount(inverse, weights=bx, minlength=len(cells)) / counts, x[outliers]]),
+        y=np.concatenate([np.bincount(inverse, weights=by, minlength=len(cells)) / counts, y[outliers]]),
+        color=np.concatenate([cell_colors, color[outliers]]),
+        count=np.concatenate([counts, np.ones(int(outliers.sum()), dtype=int)]),
+    )
@@ -0,0 +1,205 @@
+"""Server-side paging, sorting and filtering for Dash DataTables.
+
+With ``page_action``, ``sort_action`` and ``filter_action`` set to
+``'custom'``, a DataTable sends its current page, ``sort_by`` and
+``filter_query`` to a callback instead of receiving every row up front.
+``PagedTable`` answers those requests from a columnar copy of the rows.
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Callable, Optional, TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from log_config import get_logger
+
+if TYPE_CHECKING:
+    from domain.ports import ResultStorePort
+
+logger = get_logger(__name__)
+
+_OPERATORS = ('<=', '>=', '!=', '=', '<', '>', 'eq', 'ne', 'le', 'ge', 'lt', 'gt', 'contains', 'datestartswith')
+_FILTER_PART = re.compile(
+    r"^\{(?P<column>[^}]+)\}\s*(?P<case>[si]?)(?P<operator>"
+    + '|'.join(re.escape(op) for op in _OPERATORS)
+    + r")\s*(?P<value>.*)$"
+)
+_SYMBOLS = {'=': 'eq', '!=': 'ne', '<': 'lt', '<=': 'le', '>': 'gt', '>=': 'ge'}
+
+
+def parse_filter_query(filter_query: str) -> list[tuple[str, str, object, bool]]:
+    """Split a DataTable ``filter_query`` into ``(column, operator, value, case_insensitive)`` terms.
+
+    Terms are joined with ``&&``. Operators are normalised to their word
+    form (``eq``, ``lt``, ``contains``...). Quoted values stay strings;
+    unquoted values that look like numbers become floats. Terms that do
+    not parse are ignored.
+    """
+    terms = []
+    for part in (filter_query or '').split(' && '):
+        match = _FILTER_PART.match(part.strip())
+        if not match:
+            continue
+        raw = match['value'].strip()
+        if len(raw) >= 2 and raw[0] == raw[-1] and raw[0] in '"\'`':
+            value = raw[1:-1]
+        else:
+            try:
+                value = float(raw)
+            except ValueError:
+                value = raw
+        operator = _SYMBOLS.get(match['operator'], match['operator'])
+        terms.append((match['column'], operator, value, match['case'] == 'i'))
+    return terms
+
+
+class PagedTable:
+    """Columnar result set queried one page at a time.
+
+    Each distinct filter and sort combination is evaluated once with
+    vectorised pandas operations and kept as an array of row positions,
+    so later pages of the same view are a slice of that array: their cost
+    depends on the page size, not on the number of rows.
+
+    Sorting and filtering use ``records`` when given: one dict per row
+    holding the values to query, such as numbers parsed from formatted
+    strings. Terms on columns the records lack are ignored and logged.
+
+    Args:
+        rows: Table rows, as sent to a DataTable.
+        max_views: Filter/sort combinations kept per table.
+        records: Values sorted and filtered on, in the order of ``rows``;
+            ``rows`` themselves by default.
+    """
+
+    def __init__(self, rows: list[dict], max_views: int = 8, records: Optional[list[dict]] = None):
+        self.rows = rows
+        self.df = pd.DataFrame(rows if records is None else records)
+        self.max_views = max_views
+        self._views: OrderedDict[tuple, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.df)
+
+    def page(
+        self, page_current: int, page_size: int, filter_query: str = '', sort_by: Optional[list[dict]] = None,
+    ) -> tuple[list[dict], int]:
+        """Return the rows of one page and the number of pages of the view."""
+        positions, page_count = self._page_positions(page_current, page_size, filter_query, sort_by)
+        page = self.df.iloc[positions]
+        return page.replace({np.nan: None}).to_dict('records'), page_count
+
+    def source_page(
+        self, page_current: int, page_size: int, filter_query: str = '', sort_by: Optional[list[dict]] = None,
+    ) -> tuple[list[dict], int]:
+        """Like ``page``, but return the original row dicts, with their values untouched by pandas."""
+        positions, page_count = self._page_positions(page_current, page_size, filter_query, sort_by)
+        return [self.rows[position] for position in positions], page_count
+
+    def _page_positions(
+        self, page_current: int, page_size: int, filter_query: str, sort_by: Optional[list[dict]],
+    ) -> tuple[np.ndarray, int]:
+        positions = self._view(filter_query or '', tuple(
+            (sort['column_id'], sort.get('direction') != 'desc') for sort in (sort_by or [])
+        ))
+        page_count = max(math.ceil(len(positions) / page_size), 1)
+        start = min(page_current or 0, page_count - 1) * page_size
+        return positions[start:start + page_size], page_count
+
+    def _view(self, filter_query: str, sort_key: tuple) -> np.ndarray:
+        key = (filter_query, sort_key)
+        with self._lock:
+            if key in self._views:
+                self._views.move_to_end(key)
+                return self._views[key]
+
+        df = self.df
+        terms = parse_filter_query(filter_query) if filter_query else []
+        ignored = {column for column, *_ in terms} | {column for column, _ in sort_key}
+        ignored -= set(df.columns)
+        if ignored:
+            logger.info(f"Se ignoran el orden y los filtros por columnas sin datos: {', '.join(sorted(ignored))}")
+        if terms:
+            df = df[self._mask(df, terms)]
+        sort_key = tuple((column, ascending) for column, ascending in sort_key if column in df.columns)
+        if sort_key and not df.empty:
+            df = df.sort_values(
+                by=[column for column, _ in sort_key],
+                ascending=[ascending for _, ascending in sort_key],
+                kind='stable',
+                na_position='last',
+            )
+        positions = self.df.index.get_indexer(df.index)
+
+        with self._lock:
+            self._views[key] = positions
+            while len(self._views) > self.max_views:
+                self._views.popitem(last=False)
+        return positions
+
+    @staticmethod
+    def _mask(df: pd.DataFrame, terms: list[tuple[str, str, object, bool]]) -> pd.Series:
+        mask = pd.Series(True, index=df.index)
+        for column, operator, value, case_insensitive in terms:
+            if column not in df.columns:
+                continue
+            series = df[column]
+            if operator in ('contains', 'datestartswith'):
+                text = series.astype(str)
+                if operator == 'contains':
+                    mask &= text.str.contains(str(value), case=not case_insensitive, regex=False) & series.notna()
+                else:
+                    mask &= text.str.startswith(str(value)) & series.notna()
+                continue
+            if isinstance(value, float):
+                series = pd.to_numeric(series, errors='coerce')
+            elif case_insensitive:
+                series, value = series.astype(str).str.lower(), value.lower()
+            comparison = {
+                'eq': series.eq, 'ne': series.ne, 'lt': series.lt, 'le': series.le, 'gt': series.gt, 'ge': series.ge,
+            }[operator]
+            mask &= comparison(value).fillna(False).astype(bool)
+        return mask
+
+
+class PagedTableCache:
+    """Builds ``PagedTable`` instances from a result store and reuses them across requests.
+
+    A table is rebuilt only when the rows stored under its key change or
+    are evicted from the store.
+
+    Args:
+        results: Store holding the table rows by key.
+        max_tables: Tables kept at once.
+        build: Builds the table of a list of rows; ``PagedTable`` by default.
+    """
+
+    def __init__(
+        self, results: ResultStorePort, max_tables: int = 8, build: Callable[[list[dict]], PagedTable] = PagedTable,
+    ):
+        self.results = results
+        self.max_tables = max_tables
+        self.build = build
+        self._tables: OrderedDict[str, tuple[list[dict], PagedTable]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[PagedTable]:
+        rows = self.results.get(key)
+        with self._lock:
+            cached = self._tables.pop(key, None)
+            if rows is None:
+                return None
+            if cached is not None and cached[0] is rows:
+                table = cached[1]
+            else:
+                table = self.build(rows)
+            self._tables[key] = (rows, table)
+            while len(self._tables) > self.max_tables:
+                self._tables.popitem(last=False)
+        return table
@@ -0,0 +1,47 @@
+"""Category attributes shown on MercadoLibre search result cards.
+
+Car cards list the year and kilometers (e.g. "2018 · 85.000 Km", or
+"85,000 Km" on sites with a decimal point) and property cards the surface
+("60 m² cubiertos"), so these fields are often available without fetching
+the detail page.
+"""
+import re
+
+from scrapers.mercadolibre.enums import ProductCategory
+
+ATTRIBUTE_SELECTOR = (
+    '.poly-attributes_list__item, .poly-attributes-list__item, .ui-search-card-attributes__attribute'
+)
+
+_YEAR = re.compile(r'^(19|20)\d{2}$')
+# Kilometers are whole numbers, so either mark can only group thousands.
+_KM = re.compile(r'^(\d[\d.,]*)\s*km$', re.IGNORECASE)
+
+
+def extract_card_attributes(post):
+    """Extract year, km and m² from a search result card.
+
+    Args:
+        post: BeautifulSoup element of the listing card.
+
+    Returns:
+        dict: The attributes found, in the same format the detail page
+            scrapers use ('year': "2018", 'km': "85.000 km" as the site
+            writes it, 'm2': "60 m² cubiertos"), plus 'category' when they
+            identify it.
+    """
+    attributes = {}
+    for element in post.select(ATTRIBUTE_SELECTOR):
+        text = element.get_text(' ', strip=True)
+        if _YEAR.match(text):
+            attributes['year'] = text
+        elif _KM.match(text):
+            attributes['km'] = f"{_KM.match(text).group(1)} km"
+        elif 'm²' in text:
+            attributes['m2'] = text
+
+    if 'year' in attributes or 'km' in attributes:
+        attributes['category'] = ProductCategory.CAR.value
+    elif 'm2' in attributes:
+        attributes['category'] = ProductCategory.PROPERTY.value
+    return attributes
@@ -0,0 +1,93 @@
+"""
+Streaming deduplication of search listings by item ID.
+
+Search pages repeat promoted items and overlap between offsets. Both
+deduplicators expose the same ``add(key) -> bool`` contract so the scraper
+does not care which one it gets:
+
+- ``SeenSet``: exact, one entry per item. Default for a single search.
+- ``BloomFilter``: fixed memory, small false-positive rate. Meant to be
+  shared across runs by long-running monitors that see millions of items;
+  safe to share between concurrent searches.
+"""
+from __future__ import annotations
+
+import hashlib
+import math
+import threading
+
+
+class SeenSet:
+    """Exact set of seen keys."""
+
+    def __init__(self):
+        self._seen = set()
+
+    def add(self, key: str) -> bool:
+        """Add a key. Returns True if it had not been seen before."""
+        if key in self._seen:
+            return False
+        self._seen.add(key)
+        return True
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._seen
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+
+class BloomFilter:
+    """Probabilistic set with bounded memory.
+
+    Sized for ``capacity`` keys at the given false-positive rate. A false
+    positive means a new item is treated as a duplicate; there are no false
+    negatives.
+
+    Args:
+        capacity: Expected number of distinct keys.
+        error_rate: Target false-positive probability.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, error_rate: float = 0.001):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity must be positive and error_rate between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        for i in range(self.num_hashes):
+            yield (h1 + i * h2) % self.num_bits
+
+    def add(self, key: str) -> bool:
+        """Add a key. Returns True if it was (probably) not seen before."""
+        positions = list(self._positions(key))
+        is_new = False
+        with self._lock:
+            for position in positions:
+                byte, bit = divmod(position, 8)
+                if not self._bits[byte] & (1 << bit):
+                    self._bits[byte] |= 1 << bit
+                    is_new = True
+            if is_new:
+                self._count += 1
+        return is_new
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._bits[p // 8] & (1 << (p % 8)) for p in self._positions(key))
+
+    def __len__(self) -> int:
+        return self._count
+
+
+def listing_key(listing: dict):
+    """Deduplication key of a listing: its item ID, falling back to the link."""
+    return listing.get('item_id') or listing.get('post_link')
@@ -0,0 +1,67 @@
+"""Translation of SearchFilters and SortOrder into MercadoLibre search URL segments.
+
+MercadoLibre encodes listing filters and the sort order in the search path,
+e.g. ``/capital-federal/notebook_OrderId_PRICE_PriceRange_100000-500000``.
+Open upper bounds are written as ``*``.
+"""
+from __future__ import annotations
+
+import unicodedata
+from typing import Optional
+
+from domain.enums import ItemCondition, SortOrder
+from domain.value_objects import SearchFilters
+from utils import format_filename
+
+CONDITION_IDS = {
+    ItemCondition.NEW: '2230284',
+    ItemCondition.USED: '2230581',
+}
+
+# "Most recent" is only offered by vehicle and real estate listings.
+SORT_SEGMENTS = {
+    SortOrder.RELEVANCE: '',
+    SortOrder.PRICE_ASC: '_OrderId_PRICE',
+    SortOrder.PRICE_DESC: '_OrderId_PRICE*DESC',
+    SortOrder.NEWEST: '_OrderId_BEGINS*DESC',
+}
+
+
+def _range(low: Optional[int], high: Optional[int], unit: str = '') -> str:
+    upper = '*' if high is None else high
+    return f"{low or 0}{unit}-{upper}{unit}"
+
+
+def filters_segment(filters: Optional[SearchFilters]) -> str:
+    """Return the filter segment appended to the search query, or '' without filters."""
+    if not filters:
+        return ''
+    parts = []
+    if filters.min_price is not None or filters.max_price is not None:
+        parts.append(f"_PriceRange_{_range(filters.min_price, filters.max_price)}")
+    if filters.condition is not None:
+        parts.append(f"_ITEM*CONDITION_{CONDITION_IDS[ItemCondition(filters.condition)]}")
+    if filters.min_year is not None or filters.max_year is not None:
+        parts.append(f"_YEAR_{_range(filters.min_year, filters.max_year)}")
+    if filters.min_km is not None or filters.max_km is not None:
+        parts.append(f"_KILOMETERS_{_range(filters.min_km, filters.max_km, 'km')}")
+    if filters.free_shipping:
+        parts.append("_CostoEnvio_Gratis")
+    return ''.join(parts)
+
+
+def location_path(filters: Optional[SearchFilters]) -> str:
+    """Return the location path prefix of the search (e.g. 'cordoba/' for 'Córdoba'), or ''.
+
+    MercadoLibre location slugs carry no accents, so they are stripped.
+    """
+    if not filters or not filters.location:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', filters.location.strip())
+    stripped = ''.join(char for char in decomposed if not unicodedata.combining(char))
+    return f"{format_filename(stripped)}/"
+
+
+def sort_segment(sort: Optional[SortOrder]) -> str:
+    """Return the sort segment of the search URL, or '' for the default relevance order."""
+    return SORT_SEGMENTS[SortOrder(sort)] if sort else ''
@@ -0,0 +1,46 @@
+"""
+MercadoLibre item ID parsing.
+
+Every MercadoLibre publication has a canonical ID made of the site prefix
+and a number (e.g. ``MLA1234567890``). Listing links show it in several
+shapes, so it is the only stable key to identify an item across runs.
+"""
+from __future__ import annotations
+
+import re
+from typing import Optional
+from urllib.parse import urlparse, parse_qs, unquote
+
+# Site prefixes: MLA (AR), MLB (BR), MLM (MX), MCO (CO), MPE (PE), MBO (BO), ...
+_ITEM_ID_PATTERN = re.compile(r'\b(M[A-Z]{2})-?(\d{6,})')
+
+
+def extract_item_id(url: Optional[str]) -> Optional[str]:
+    """Extract the canonical item ID from a MercadoLibre URL.
+
+    Handles article links (``/MLA-123456789-titulo-_JM``), catalog product
+    links whose real item is in the ``wid`` parameter (``/p/MLA1234?...#wid=MLA5678``)
+    and Markdown-wrapped links produced by the presentation layer.
+
+    Example:
+        >>> extract_item_id("https://articulo.mercadolibre.com.ar/MLA-123456789-gol-trend-_JM")
+        'MLA123456789'
+
+    Returns:
+        The item ID without dash, or None if the URL does not contain one.
+    """
+    if not url or not isinstance(url, str):
+        return None
+
+    parsed = urlparse(unquote(url))
+    params = parse_qs(parsed.query)
+    params.update(parse_qs(parsed.fragment))
+    for value in params.get('wid', []):
+        match = _ITEM_ID_PATTERN.search(value)
+        if match:
+            return f"{match.group(1)}{match.group(2)}"
+
+    match = _ITEM_ID_PATTERN.search(parsed.path) or _ITEM_ID_PATTERN.search(url)
+    if match:
+        return f"{match.group(1)}{match.group(2)}"
+    return None
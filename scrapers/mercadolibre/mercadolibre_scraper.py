@@ -6,12 +6,22 @@ This module provides the main scraping functionality for MercadoLibre across
 automatically detects and routes to specialized scrapers when needed.
 """
 
+import functools
+import random
+
 import requests
 from bs4 import BeautifulSoup
 
 from utils import format_filename, format_link_to_markdown
 from scrapers.mercadolibre.enums import ProductCategory
-from domain.entities import ProductListing, ProductDetail, CarProductDetail, PropertyProductDetail
+from scrapers.mercadolibre.item_id import extract_item_id
+from scrapers.mercadolibre.card_attributes import extract_card_attributes
+from scrapers.mercadolibre.dedup import SeenSet, listing_key
+from scrapers.mercadolibre.filters import filters_segment, location_path, sort_segment
+from domain.entities import (
+    ProductListing, ProductDetail, CarProductDetail, PropertyProductDetail, ScrapeStats,
+)
+from domain.value_objects import MIN_REQUEST_TIMEOUT
 from log_config import get_logger
 logger = get_logger(__name__)
 
@@ -41,6 +51,10 @@ def detect_category(soup):
         return ProductCategory.OTHERS
 
 
+class _DeadlineExceeded(Exception):
+    """Raised internally when a crawl's deadline passes."""
+
+
 class MercadoLibreScraper:
     """
     Main scraper for MercadoLibre product listings.
@@ -48,23 +62,36 @@ class MercadoLibreScraper:
     Implements ScraperPort protocol without inheriting from a base class.
 
     Args:
-        progress_notifier: Optional ProgressNotifierPort implementation.
+        progress_notifier: Optional ProgressNotifierPort implementation, used
+            by crawls that are not given their own.
         config: Optional dict with 'base_url', 'page_increment', 'max_pages'.
+        deduplicator: Optional ``add(key) -> bool`` set shared across searches
+            (e.g. a ``BloomFilter`` for long-running monitors). By default each
+            search deduplicates with its own exact ``SeenSet``.
+        session: Optional ``requests.Session`` to fetch pages with, so
+            concurrent searches share its connection pool.
+
+    The scraper keeps no per-crawl state: one instance can serve concurrent
+    crawls, each counting its downloads and errors in its own ``ScrapeStats``.
     """
 
-    def __init__(self, progress_notifier=None, config=None):
-        self.data = []
+    def __init__(self, progress_notifier=None, config=None, deduplicator=None, session=None):
         self.progress_notifier = progress_notifier
+        self.deduplicator = deduplicator
+        self.http = session or requests
         _cfg = config or DEFAULT_CONFIG
         self.base_url = _cfg['base_url']
         self.page_increment = _cfg['page_increment']
         self.max_pages = _cfg['max_pages']
 
-    def get_page_content(self, url):
+    def get_page_content(self, url, timeout=None, stats=None):
         """Fetch and parse a web page.
 
         Args:
             url (str): URL to fetch.
+            timeout (float, optional): Request timeout in seconds.
+            stats (ScrapeStats, optional): Crawl stats whose ``bytes_read``
+                or ``request_errors`` count this request.
 
         Returns:
             BeautifulSoup: Parsed HTML content.
@@ -73,10 +100,15 @@ class MercadoLibreScraper:
             Exception: If the HTTP request fails.
         """
         try:
-            response = requests.get(url)
+            response = self.http.get(url, timeout=timeout)
             response.raise_for_status()
-            return BeautifulSoup(response.text, 'html.parser')
+            html = response.text
+            if stats is not None:
+                stats.bytes_read += len(html)
+            return BeautifulSoup(html, 'html.parser')
         except requests.RequestException as e:
+            if stats is not None:
+                stats.request_errors += 1
             logger.error(f"Error al obtener la página {url}: {e}")
             raise Exception(f"Error al obtener la página {url}: {e}")
 
@@ -102,18 +134,25 @@ class MercadoLibreScraper:
             post: BeautifulSoup element representing a product listing.
 
         Returns:
-            dict: Dictionary with 'title', 'price', 'post_link', and 'image_link'.
+            dict: Dictionary with 'title', 'price', 'post_link', 'image_link'
+                and, when present, 'item_id', 'currency' and the category
+                attributes shown on the card ('year', 'km', 'm2').
         """
         title_element = post.find('h2')
         price_value = self.format_price(post.find('span', class_='andes-money-amount__fraction'))
+        currency_element = post.find('span', class_='andes-money-amount__currency-symbol')
         post_link_element = post.find("a")
         img_element = post.find("img")
+        post_link = post_link_element['href'] if post_link_element else None
 
         listing = ProductListing(
             title=title_element.text if title_element else None,
             price=price_value if price_value else None,
-            post_link=post_link_element['href'] if post_link_element else None,
+            post_link=post_link,
             image_link=img_element.get('data-src', img_element.get('src')) if img_element else None,
+            item_id=extract_item_id(post_link),
+            currency=currency_element.text.strip() if currency_element else None,
+            **extract_card_attributes(post),
         )
         return listing.to_dict()
 
@@ -132,18 +171,51 @@ class MercadoLibreScraper:
             return int(results_element.text.split()[0].replace('.', '').replace(',', ''))
         return 0
 
-    def scrape_page_results(self, url):
+    def search_url(self, domain, product_name, search_segment='', filters=None, offset=None, sort=None):
+        """
+        Build the URL of a search results page.
+
+        Args:
+            domain (str): Country domain code (e.g., 'ar').
+            product_name (str): Search query.
+            search_segment (str, optional): Extra URL segment such as a sort
+                order (``'_OrderId_PRICE'``).
+            filters (SearchFilters, optional): Filters applied by the site.
+            offset (int, optional): Position of the first result of the page;
+                omitted for the first page.
+            sort (SortOrder, optional): Server-side sort order.
+
+        Returns:
+            str: Search URL.
+        """
+        url = self.base_url.format(domain=domain) + location_path(filters) + format_filename(product_name)
+        segment = sort_segment(sort) + filters_segment(filters) + search_segment
+        if offset is not None:
+            return f"{url}_Desde_{offset}{segment}_NoIndex_True"
+        return f"{url}{segment}_NoIndex_True" if segment else url
+
+    def count_results(self, domain, product_name, search_segment='', filters=None):
+        """
+        Return the total number of results a search reports, fetching only its first page.
+        """
+        return self.get_total_results(
+            self.get_page_content(self.search_url(domain, product_name, search_segment, filters))
+        )
+
+    def scrape_page_results(self, url, timeout=None, stats=None):
         """
         Scrape all product listings from a single search results page.
 
         Args:
             url (str): URL of the search results page.
+            timeout (float, optional): Request timeout in seconds.
+            stats (ScrapeStats, optional): Passed to ``get_page_content``.
 
         Returns:
             list: List of dictionaries, each containing product data.
         """
         logger.debug(f"Comenzando scrape_page_results para URL: {url}")
-        soup = self.get_page_content(url)
+        soup = self.get_page_content(url, timeout, stats)
 
         if not soup:
             logger.warning("No se pudo obtener el contenido de la página.")
@@ -175,15 +247,17 @@ class MercadoLibreScraper:
             dict: Dictionary with all extracted product details.
         """
         category = detect_category(soup)
+        link = self.extract_link(soup)
 
         base_kwargs = dict(
             title=self.extract_title(soup),
             price=self.extract_price(soup),
             publication_date=self.extract_publication_date(soup),
             author=self.extract_author(soup),
-            link=self.extract_link(soup),
+            link=link,
             shipping=self.extract_shipping(soup),
             category=category,
+            item_id=extract_item_id(link),
         )
 
         if category == ProductCategory.CAR:
@@ -247,47 +321,209 @@ class MercadoLibreScraper:
         shipping_element = soup.find('span', string=lambda text: text and "Llega" in text)
         return shipping_element.text if shipping_element else None
 
-    def scrape_product_list(self, domain, product_name, user_scraping_limit):
+    def scrape_product_list(
+        self, domain, product_name, user_scraping_limit, stats=None, checkpoint=None, filters=None,
+        sort=None, deadline=None, search_segment='', progress_notifier=None,
+    ):
         """
         Scrape multiple pages of product listings for a search query.
 
+        Collects every page yielded by ``iter_product_pages`` into one list.
+
         Args:
             domain (str): Country domain code (e.g., 'ar', 'mx', 'br').
             product_name (str): Search query/product name to scrape.
             user_scraping_limit (int): Maximum number of products to collect.
+            stats (ScrapeStats, optional): Filled with page, item, duplicate
+                and early-stop counts.
+            checkpoint (CrawlCheckpointPort, optional): Pages already recorded
+                in the checkpoint are reused instead of refetched, and every
+                newly scraped page is recorded, so a failed crawl can resume.
+            filters (SearchFilters, optional): Filters pushed into the search
+                URL, so the site only returns matching listings.
+            sort (SortOrder, optional): Order the site returns listings in;
+                relevance by default.
+            deadline (Deadline, optional): No page is requested once it has
+                passed, and each request times out when it does; the pages
+                collected so far are returned and ``stats.timed_out`` is set.
+            search_segment (str, optional): Extra URL segment appended after
+                the filters (e.g. a sort order).
+            progress_notifier (ProgressNotifierPort, optional): Receives the
+                progress of this crawl only, instead of the scraper's notifier.
 
         Returns:
             list: List of dictionaries, each containing product data from listings.
         """
-        cleaned_name = format_filename(product_name)
-        base_url = self.base_url.format(domain=domain)
+        all_data = []
+        pages = self.iter_product_pages(
+            domain, product_name, user_scraping_limit, stats, checkpoint, filters=filters, sort=sort,
+            deadline=deadline, search_segment=search_segment, progress_notifier=progress_notifier,
+        )
+        for page_data in pages:
+            all_data.extend(page_data)
+        return all_data
+
+    def iter_product_pages(
+        self, domain, product_name, user_scraping_limit, stats=None, checkpoint=None, filters=None,
+        sort=None, deadline=None, search_segment='', progress_notifier=None,
+    ):
+        """
+        Yield the listings of a search one result page at a time.
 
-        soup = self.get_page_content(base_url + cleaned_name)
+        Each page is yielded as soon as it is parsed, and the next page is
+        only requested when the consumer asks for it. Listings are
+        deduplicated by item ID as pages arrive, so repeated ads do not count
+        toward the limit. Pagination stops early when a page yields no new
+        items.
+
+        Takes the same arguments as ``scrape_product_list``.
+
+        Yields:
+            list: Non-empty list of new listing dicts for each page.
+        """
+        stats = stats if stats is not None else ScrapeStats()
+        notifier = progress_notifier or self.progress_notifier
+        seen = self.deduplicator if self.deduplicator is not None else SeenSet()
+        completed_pages = checkpoint.completed_pages() if checkpoint else {}
+
+        first_url = self.search_url(domain, product_name, search_segment, filters, sort=sort)
+        try:
+            soup = self._fetch_within(first_url, deadline, functools.partial(self.get_page_content, stats=stats))
+        except _DeadlineExceeded:
+            stats.timed_out = True
+            logger.warning("Se agotó el tiempo antes de obtener la primera página.")
+            return
         total_results = self.get_total_results(soup)
 
         products_per_page = len(soup.find_all('li', class_='ui-search-layout__item'))
+        if not products_per_page:
+            logger.warning("La primera página no devolvió publicaciones.")
+            return
         estimated_total_pages = total_results // products_per_page + (total_results % products_per_page > 0)
 
         scraping_limit = min(total_results, user_scraping_limit)
         logger.info(f"Se obtuvieron {total_results} resultados. Se limitará el scraping a {scraping_limit} resultados.")
 
-        all_data = []
-
         for i in range(0, min(estimated_total_pages, self.max_pages)):
-            if len(all_data) >= scraping_limit:
+            if stats.items >= scraping_limit:
                 logger.info(f"Se alcanzó el límite de {scraping_limit} productos. Terminando.")
                 break
 
-            url = f"{base_url}{cleaned_name}_Desde_{(i * self.page_increment) + 1}_NoIndex_True"
-            scraped_page_data = self.scrape_page_results(url)
+            offset = (i * self.page_increment) + 1
+            if offset in completed_pages:
+                scraped_page_data = completed_pages[offset]
+                logger.info(f"Página {i + 1} recuperada del checkpoint.")
+            else:
+                url = self.search_url(domain, product_name, search_segment, filters, offset=offset, sort=sort)
+                try:
+                    scraped_page_data = self._fetch_within(
+                        url, deadline, functools.partial(self.scrape_page_results, stats=stats),
+                    )
+                except _DeadlineExceeded:
+                    stats.timed_out = True
+                    logger.warning(f"Se agotó el tiempo en la página {i + 1}. Se devuelven resultados parciales.")
+                    break
+                if checkpoint and scraped_page_data:
+                    checkpoint.record_page(offset, scraped_page_data)
+
             if not scraped_page_data:
                 logger.warning(f"La página {i + 1} no devolvió datos. Terminando.")
                 break
 
-            all_data.extend(scraped_page_data)
+            stats.pages += 1
+            new_items = self.drop_duplicates(scraped_page_data, seen, stats)
+            if not new_items:
+                stats.early_stop = True
+                logger.info(f"La página {i + 1} no trajo publicaciones nuevas. Terminando.")
+                break
+
+            stats.items += len(new_items)
             logger.info(f"Scraping de página {i + 1} de {estimated_total_pages} completado")
 
-            if self.progress_notifier:
-                self.progress_notifier.notify_progress(i, estimated_total_pages)
+            if notifier:
+                notifier.notify_progress(i + 1, estimated_total_pages, {
+                    'items': stats.items, 'bytes': stats.bytes_read, 'errors': stats.request_errors,
+                })
 
-        return all_data
+            yield new_items
+
+        logger.info(
+            f"Publicaciones únicas: {stats.items}. Duplicadas descartadas: {stats.duplicates}. "
+            f"Corte anticipado: {'sí' if stats.early_stop else 'no'}."
+        )
+
+    def sample_product_pages(self, domain, product_name, sample_pages, filters=None, seed=None):
+        """
+        Fetch a few result pages chosen uniformly at random instead of crawling them all.
+
+        The first page gives the total number of results, from which the
+        reachable ``_Desde_`` offsets are known; ``sample_pages`` of them are
+        drawn without replacement. Only pages within ``max_pages`` (and the
+        site's own pagination cap) can be drawn, so for very large searches
+        the sample covers the reachable results only; narrow them with
+        ``filters`` when that matters.
+
+        Args:
+            domain (str): Country domain code (e.g., 'ar').
+            product_name (str): Search query.
+            sample_pages (int): Number of result pages to fetch.
+            filters (SearchFilters, optional): Filters pushed into the search URL.
+            seed (int, optional): Seed for a reproducible sample.
+
+        Returns:
+            tuple: ``(total_results, reachable_pages, pages)`` where ``pages``
+            is a list with the listings of each sampled page.
+        """
+        soup = self.get_page_content(self.search_url(domain, product_name, filters=filters))
+        total_results = self.get_total_results(soup)
+        first_page = [self.extract_post_data(post) for post in soup.find_all('li', class_='ui-search-layout__item')]
+        if not first_page:
+            return total_results, 0, []
+
+        reachable_pages = min(-(-total_results // len(first_page)), self.max_pages)
+        chosen = sorted(random.Random(seed).sample(range(reachable_pages), min(sample_pages, reachable_pages)))
+        logger.info(f"Muestreando {len(chosen)} de {reachable_pages} páginas para '{product_name}'.")
+
+        pages = []
+        for index in chosen:
+            if index == 0:
+                pages.append(first_page)
+                continue
+            offset = (index * self.page_increment) + 1
+            page = self.scrape_page_results(self.search_url(domain, product_name, filters=filters, offset=offset))
+            if page:
+                pages.append(page)
+        return total_results, reachable_pages, pages
+
+    @staticmethod
+    def _fetch_within(url, deadline, fetch):
+        """Call ``fetch(url)``, with a timeout derived from ``deadline`` when given.
+
+        Raises:
+            _DeadlineExceeded: If the deadline passed before or during the request.
+        """
+        if deadline is None:
+            return fetch(url)
+        if deadline.expired():
+            raise _DeadlineExceeded()
+        try:
+            return fetch(url, max(deadline.remaining(), MIN_REQUEST_TIMEOUT))
+        except Exception:
+            if deadline.expired():
+                raise _DeadlineExceeded()
+            raise
+
+    @staticmethod
+    def drop_duplicates(page_data, seen, stats):
+        """Return the listings of a page whose key has not been seen yet.
+
+        Listings without an item ID or link cannot be deduplicated and are kept.
+        """
+        new_items = []
+        for item in page_data:
+            key = listing_key(item)
+            if key is None or seen.add(key):
+                new_items.append(item)
+            else:
+                stats.duplicates += 1
+        return new_items
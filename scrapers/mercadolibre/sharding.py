@@ -0,0 +1,260 @@
+"""Price-range sharding for searches larger than MercadoLibre's pagination cap.
+
+MercadoLibre stops paginating a search after roughly 2,000 results, so a
+broad query such as "notebook" can never be crawled past its first pages.
+Each price range is a separate search with its own cap, though: splitting
+the query into price-range shards that each stay under the cap covers the
+whole category, and the shards can be crawled in parallel.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, replace
+from typing import Optional
+
+from scrapers.mercadolibre.dedup import SeenSet, listing_key
+from domain.entities import ScrapeStats
+from domain.enums import SortOrder
+from domain.value_objects import SearchFilters, Deadline
+from utils import decimal_mark, parse_scraped_number
+from log_config import get_logger
+
+logger = get_logger(__name__)
+
+# Results MercadoLibre paginates through for a single search.
+SEARCH_RESULT_CAP = 2000
+
+
+@dataclass(frozen=True)
+class PriceShard:
+    """A price range of a search and the number of results it reports."""
+    low: int
+    high: int
+    total: int
+
+    def apply(self, filters: Optional[SearchFilters] = None) -> SearchFilters:
+        """Return ``filters`` restricted to the price range of the shard."""
+        return replace(filters or SearchFilters(), min_price=self.low, max_price=self.high)
+
+
+class ShardPlanner:
+    """Splits a search into price ranges that each fit under the result cap.
+
+    Starting from the whole price range, any range reporting more results
+    than ``cap`` is bisected and both halves are probed again, recursively.
+    Each probe fetches a single results page. Ranges with no results are
+    dropped; a range one peso wide that still exceeds the cap is kept as is.
+
+    Args:
+        scraper: MercadoLibreScraper used to probe result counts.
+        cap: Results a shard may report; defaults to what a single search
+            can paginate through.
+    """
+
+    def __init__(self, scraper, cap: Optional[int] = None):
+        self.scraper = scraper
+        self.cap = cap or min(SEARCH_RESULT_CAP, scraper.page_increment * scraper.max_pages)
+
+    def max_price(self, domain: str, product_name: str, filters: Optional[SearchFilters] = None) -> Optional[int]:
+        """Highest listed price of a search, read from its price-descending first page."""
+        soup = self.scraper.get_page_content(
+            self.scraper.search_url(domain, product_name, filters=filters, sort=SortOrder.PRICE_DESC)
+        )
+        post = soup.find('li', class_='ui-search-layout__item') if soup else None
+        if post is None:
+            return None
+        price = parse_scraped_number(self.scraper.extract_post_data(post).get('price'), decimal_mark(domain))
+        return int(price) + 1 if price is not None else None
+
+    def plan(
+        self, domain: str, product_name: str, min_price: int = 0, max_price: Optional[int] = None,
+        filters: Optional[SearchFilters] = None,
+    ) -> list[PriceShard]:
+        """Return the shards covering [min_price, max_price], ordered by price.
+
+        Other ``filters`` are kept on every probe, so the shards split the
+        filtered search.
+        """
+        if max_price is None:
+            max_price = self.max_price(domain, product_name, filters)
+            if max_price is None:
+                return []
+
+        shards = []
+        pending = [(min_price, max_price)]
+        while pending:
+            low, high = pending.pop()
+            probe = PriceShard(low, high, 0).apply(filters)
+            total = self.scraper.count_results(domain, product_name, filters=probe)
+            if total == 0:
+                continue
+            if total <= self.cap or high <= low:
+                if total > self.cap:
+                    logger.warning(f"El rango {low}-{high} tiene {total} resultados y no se puede dividir más.")
+                shards.append(PriceShard(low, high, total))
+                continue
+            middle = (low + high) // 2
+            pending.append((middle + 1, high))
+            pending.append((low, middle))
+
+        shards.sort(key=lambda shard: shard.low)
+        logger.info(
+            f"'{product_name}' dividido en {len(shards)} rangos de precio "
+            f"({sum(shard.total for shard in shards)} resultados)."
+        )
+        return shards
+
+
+class ShardedMercadoLibreScraper:
+    """ScraperPort that crawls large searches as concurrent price-range shards.
+
+    Searches whose limit fits under the cap are delegated to the wrapped
+    scraper unchanged. Larger ones are planned with ``ShardPlanner``, each
+    shard is crawled in its own thread, and the shard results are merged
+    without duplicates (by item ID) as they complete. Page checkpoints are
+    not used for sharded crawls, since shard pages share offsets.
+
+    Args:
+        scraper: MercadoLibreScraper doing the fetching, shared by the
+            shard threads.
+        max_workers: Shards crawled at once.
+        cap: Passed to ``ShardPlanner``.
+        slots: Optional concurrency budget shared with other crawls (such
+            as ``BatchRunner``), with ``try_acquire(host)`` and
+            ``release(host)``. The calling job already holds one slot and
+            crawls through a single shard thread; further threads are only
+            started for the slots available when the crawl starts, so
+            shards never exceed the global or per-host limits.
+    """
+
+    def __init__(self, scraper, max_workers: int = 4, cap: Optional[int] = None, slots=None):
+        self.scraper = scraper
+        self.max_workers = max_workers
+        self.planner = ShardPlanner(scraper, cap)
+        self.slots = slots
+
+    def get_page_content(self, url, timeout=None, stats=None):
+        return self.scraper.get_page_content(url, timeout, stats)
+
+    def scrape_product_details(self, soup):
+        return self.scraper.scrape_product_details(soup)
+
+    def sample_product_pages(self, domain, product_name, sample_pages, filters=None, seed=None):
+        return self.scraper.sample_product_pages(domain, product_name, sample_pages, filters, seed)
+
+    def scrape_product_list(
+        self, domain, product_name, user_scraping_limit, stats=None, checkpoint=None, filters=None, sort=None,
+        deadline=None, progress_notifier=None,
+    ):
+        all_data = []
+        pages = self.iter_product_pages(
+            domain, product_name, user_scraping_limit, stats, checkpoint, filters, sort, deadline, progress_notifier,
+        )
+        for page_data in pages:
+            all_data.extend(page_data)
+        return all_data
+
+    def iter_product_pages(
+        self, domain, product_name, user_scraping_limit, stats=None, checkpoint=None, filters=None, sort=None,
+        deadline=None, progress_notifier=None,
+    ):
+        """Yield the new listings of each shard as it completes, up to the limit.
+
+        Shards complete in any order, so ``sort`` only orders the listings
+        within each shard. With a ``deadline``, every shard stops at it and
+        ``stats.timed_out`` is set if any of them did. A ``progress_notifier``
+        receives the progress of each shard crawl.
+        """
+        if user_scraping_limit <= self.planner.cap:
+            yield from self.scraper.iter_product_pages(
+                domain, product_name, user_scraping_limit, stats, checkpoint, filters=filters, sort=sort,
+                deadline=deadline, **self._notifier_option(progress_notifier),
+            )
+            return
+
+        stats = stats if stats is not None else ScrapeStats()
+        min_price = filters.min_price if filters and filters.min_price is not None else 0
+        max_price = filters.max_price if filters else None
+        shards = self.planner.plan(domain, product_name, min_price, max_price, filters)
+        extra_slots = self._acquire_slots(domain, min(self.max_workers, len(shards)) - 1)
+        try:
+            yield from self._crawl_shards(
+                domain, product_name, user_scraping_limit, stats, shards, filters, sort, deadline,
+                workers=self.max_workers if self.slots is None else 1 + extra_slots,
+                progress_notifier=progress_notifier,
+            )
+        finally:
+            for _ in range(extra_slots):
+                self.slots.release(domain)
+
+    def _acquire_slots(self, domain: str, wanted: int) -> int:
+        if self.slots is None:
+            return 0
+        acquired = 0
+        while acquired < wanted and self.slots.try_acquire(domain):
+            acquired += 1
+        return acquired
+
+    def _crawl_shards(
+        self, domain, product_name, user_scraping_limit, stats, shards, filters, sort, deadline, workers,
+        progress_notifier=None,
+    ):
+        seen = SeenSet()
+        executor = ThreadPoolExecutor(max_workers=max(workers, 1))
+        try:
+            futures = {
+                executor.submit(
+                    self._crawl_shard, domain, product_name, shard, filters, sort, deadline, progress_notifier,
+                ): shard
+                for shard in shards
+            }
+            for future in as_completed(futures):
+                if stats.items >= user_scraping_limit:
+                    break
+                shard = futures[future]
+                try:
+                    shard_data, shard_stats = future.result()
+                except Exception as e:
+                    logger.error(f"Error en el rango {shard.low}-{shard.high}: {e}")
+                    continue
+
+                stats.pages += shard_stats.pages
+                stats.duplicates += shard_stats.duplicates
+                stats.bytes_read += shard_stats.bytes_read
+                stats.request_errors += shard_stats.request_errors
+                stats.timed_out = stats.timed_out or shard_stats.timed_out
+                new_items = []
+                for item in shard_data:
+                    key = listing_key(item)
+                    if key is None or seen.add(key):
+                        new_items.append(item)
+                    else:
+                        stats.duplicates += 1
+                new_items = new_items[:user_scraping_limit - stats.items]
+                stats.items += len(new_items)
+                if new_items:
+                    yield new_items
+        finally:
+            # Also reached when the consumer stops early (GeneratorExit): queued shards never start.
+            executor.shutdown(cancel_futures=True)
+
+        logger.info(
+            f"Crawl por rangos terminado: {stats.items} publicaciones únicas en {len(shards)} rangos, "
+            f"{stats.duplicates} duplicadas descartadas."
+        )
+
+    def _crawl_shard(
+        self, domain, product_name, shard: PriceShard, filters: Optional[SearchFilters], sort: Optional[SortOrder],
+        deadline: Optional[Deadline], progress_notifier=None,
+    ):
+        shard_stats = ScrapeStats()
+        data = self.scraper.scrape_product_list(
+            domain, product_name, shard.total, stats=shard_stats, filters=shard.apply(filters), sort=sort,
+            deadline=deadline, **self._notifier_option(progress_notifier),
+        )
+        return data, shard_stats
+
+    @staticmethod
+    def _notifier_option(progress_notifier) -> dict:
+        """Keyword argument passing ``progress_notifier`` to the scraper, only when set."""
+        return {'progress_notifier': progress_notifier} if progress_notifier else {}
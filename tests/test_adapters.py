@@ -39,6 +39,16 @@ class TestSocketIOProgressNotifier:
             'scrape_status', {'progress': 3, 'total': 10}
         )
 
+    def test_notify_progress_emits_to_job_room(self):
+        from infrastructure.adapters.socketio_notifier import SocketIOProgressNotifier
+
+        mock_socketio = Mock()
+        SocketIOProgressNotifier(mock_socketio, room='job-1').notify_progress(3, 10, {'items': 50})
+
+        mock_socketio.emit.assert_called_once_with(
+            'scrape_status', {'progress': 3, 'total': 10, 'items': 50, 'job_id': 'job-1'}, to='job-1'
+        )
+
     def test_multiple_notifications(self):
         from infrastructure.adapters.socketio_notifier import SocketIOProgressNotifier
 
@@ -51,6 +61,116 @@ class TestSocketIOProgressNotifier:
 
         assert mock_socketio.emit.call_count == 3
 
+    def test_notify_progress_with_metrics(self):
+        from infrastructure.adapters.socketio_notifier import SocketIOProgressNotifier
+
+        mock_socketio = Mock()
+        SocketIOProgressNotifier(mock_socketio).notify_progress(3, 10, {'eta': 7.0})
+
+        mock_socketio.emit.assert_called_once_with('scrape_status', {'progress': 3, 'total': 10, 'eta': 7.0})
+
+
+class TestThrottledProgressNotifier:
+    """ThrottledProgressNotifier should coalesce updates and add throughput metrics."""
+
+    def _wait_for_calls(self, inner, count):
+        import time
+        for _ in range(200):
+            if inner.notify_progress.call_count >= count:
+                return
+            time.sleep(0.01)
+        raise AssertionError('notifier did not emit')
+
+    def test_coalesces_updates_to_latest(self):
+        from infrastructure.adapters.throttled_notifier import ThrottledProgressNotifier
+
+        inner = Mock()
+        notifier = ThrottledProgressNotifier(inner, min_interval=60)
+
+        notifier.notify_progress(1, 100)
+        self._wait_for_calls(inner, 1)
+        for page in range(2, 101):
+            notifier.notify_progress(page, 100)
+        notifier.flush()
+
+        assert inner.notify_progress.call_count == 2
+        assert inner.notify_progress.call_args.args[:2] == (100, 100)
+
+    def test_metrics_include_rates_and_eta(self):
+        from infrastructure.adapters.throttled_notifier import ThrottledProgressNotifier
+
+        now = [0.0]
+        inner = Mock()
+        notifier = ThrottledProgressNotifier(inner, min_interval=60, clock=lambda: now[0])
+        notifier._closed = True  # no emitter thread: updates are forwarded with flush
+
+        notifier.notify_progress(1, 10, {'items': 50, 'bytes': 1000, 'errors': 1})
+        notifier.flush()
+        now[0] = 2.0
+        notifier.notify_progress(5, 10, {'items': 250, 'bytes': 9000, 'errors': 2})
+        notifier.flush()
+
+        first = inner.notify_progress.call_args_list[0].args[2]
+        metrics = inner.notify_progress.call_args_list[1].args[2]
+        assert first['pages_per_sec'] is None and first['eta'] is None
+        assert metrics['pages_per_sec'] == 2.0
+        assert metrics['items_per_sec'] == 100.0
+        assert metrics['bytes_per_sec'] == 4000.0
+        assert metrics['errors'] == 2
+        assert metrics['eta'] == 2.5
+        assert metrics['items'] == 250
+
+    def test_new_crawl_resets_rates(self):
+        from infrastructure.adapters.throttled_notifier import ThrottledProgressNotifier
+
+        now = [0.0]
+        inner = Mock()
+        notifier = ThrottledProgressNotifier(inner, clock=lambda: now[0])
+        notifier._closed = True
+
+        notifier.notify_progress(1, 10)
+        now[0] = 1.0
+        notifier.notify_progress(9, 10)
+        now[0] = 5.0
+        notifier.notify_progress(1, 10)
+        notifier.flush()
+
+        assert inner.notify_progress.call_args.args[2]['pages_per_sec'] is None
+
+    def test_close_delivers_pending_update(self):
+        from infrastructure.adapters.throttled_notifier import ThrottledProgressNotifier
+
+        inner = Mock()
+        notifier = ThrottledProgressNotifier(inner, min_interval=0.01)
+        notifier.notify_progress(3, 10)
+        notifier.close()
+
+        assert inner.notify_progress.call_args.args[:2] == (3, 10)
+
+
+class TestSocketIOResultPublisher:
+    """SocketIOResultPublisher should push rows to the room of the job."""
+
+    def test_publish_emits_to_job_room(self):
+        from infrastructure.adapters.socketio_publisher import SocketIOResultPublisher
+
+        mock_socketio = Mock()
+        SocketIOResultPublisher(mock_socketio).publish('job-1', 'table-initial', [{'title': 'A'}], [{'id': 'title'}])
+
+        mock_socketio.emit.assert_called_once_with(
+            'job_rows',
+            {'job_id': 'job-1', 'channel': 'table-initial', 'rows': [{'title': 'A'}], 'columns': [{'id': 'title'}]},
+            to='job-1',
+        )
+
+    def test_publish_without_columns(self):
+        from infrastructure.adapters.socketio_publisher import SocketIOResultPublisher
+
+        mock_socketio = Mock()
+        SocketIOResultPublisher(mock_socketio).publish('job-1', 'live-scatter', [{'km': 1}])
+
+        assert 'columns' not in mock_socketio.emit.call_args.args[1]
+
 
 class TestDolarApiExchangeRate:
     """DolarApiExchangeRate should fetch from dolarapi.com."""
@@ -69,7 +189,25 @@ class TestDolarApiExchangeRate:
             rate = client.get_usd_to_ars_rate()
 
             assert rate == 1200.0
-            mock_get.assert_called_once_with("https://dolarapi.com/v1/dolares/blue")
+            mock_get.assert_called_once_with("https://dolarapi.com/v1/dolares/blue", timeout=5)
+
+    def test_rate_is_cached_until_ttl(self):
+        from infrastructure.adapters.dolarapi_client import DolarApiExchangeRate
+        import requests
+
+        now = [0.0]
+        client = DolarApiExchangeRate(ttl=60, clock=lambda: now[0])
+
+        with patch('infrastructure.adapters.dolarapi_client.requests.get') as mock_get:
+            mock_get.return_value.json.return_value = {'venta': 1200.0}
+            assert client.get_usd_to_ars_rate() == 1200.0
+            assert client.get_usd_to_ars_rate() == 1200.0
+            assert mock_get.call_count == 1
+
+            now[0] = 61.0
+            mock_get.side_effect = requests.RequestException('Network error')
+            assert client.get_usd_to_ars_rate() == 1200.0
+            assert mock_get.call_count == 2
 
     def test_get_rate_returns_none_on_error(self):
         from infrastructure.adapters.dolarapi_client import DolarApiExchangeRate
@@ -116,6 +254,40 @@ class TestCsvProductExporter:
             assert os.path.exists(subdir)
             assert os.path.exists(os.path.join(subdir, 'test.csv'))
 
+    def test_export_stream_matches_export(self):
+        from infrastructure.adapters.csv_exporter import CsvProductExporter
+
+        batches = [[{'title': 'P1', 'price': '100'}], [{'price': '200', 'title': 'P2'}]]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exporter = CsvProductExporter(tmpdir, ';')
+            exporter.export(batches[0] + batches[1], 'full')
+            assert list(exporter.export_stream(iter(batches), 'streamed')) == batches
+
+            with open(os.path.join(tmpdir, 'full.csv')) as f:
+                expected = f.read()
+            with open(os.path.join(tmpdir, 'streamed.csv')) as f:
+                assert f.read() == expected
+            assert exporter.manifest.latest('streamed')['row_count'] == 2
+
+    def test_export_stream_keeps_columns_first_seen_in_later_batches(self):
+        from infrastructure.adapters.csv_exporter import CsvProductExporter
+
+        batches = [
+            [{'title': 'P1', 'price': '100'}, {'title': 'P2', 'price': ''}],
+            [{'title': 'Auto', 'price': '9000', 'year': '2020', 'km': '85.000 km'}],
+            [{'title': 'P3', 'price': '300'}],
+        ]
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exporter = CsvProductExporter(tmpdir, ';')
+            exporter.export([row for batch in batches for row in batch], 'full')
+            list(exporter.export_stream(iter(batches), 'streamed'))
+
+            with open(os.path.join(tmpdir, 'full.csv')) as f:
+                expected = f.read()
+            with open(os.path.join(tmpdir, 'streamed.csv')) as f:
+                assert f.read() == expected
+            assert 'year' in expected.splitlines()[0]
+
     def test_export_uses_correct_separator(self):
         from infrastructure.adapters.csv_exporter import CsvProductExporter
 
@@ -129,3 +301,469 @@ class TestCsvProductExporter:
             with open(file_path) as f:
                 content = f.read()
             assert '|' in content
+
+
+class TestParquetProductExporter:
+    """ParquetProductExporter should write typed, partitioned Parquet files."""
+
+    def _partition_files(self, root):
+        found = []
+        for dirpath, _, filenames in os.walk(root):
+            found.extend(os.path.join(dirpath, f) for f in filenames if f.endswith('.parquet'))
+        return found
+
+    def test_export_writes_partitioned_file(self):
+        from infrastructure.adapters.parquet_exporter import ParquetProductExporter
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exporter = ParquetProductExporter(tmpdir, country='mx')
+            exporter.export([{'title': 'P1', 'price': '100'}], 'Notebook Gamer')
+
+            files = self._partition_files(tmpdir)
+            assert len(files) == 1
+            parts = os.path.relpath(files[0], tmpdir).split(os.sep)
+            assert parts[0] == 'country=mx'
+            assert parts[1] == 'query=notebook-gamer'
+            assert parts[2].startswith('scrape_date=')
+
+    def test_export_country_override(self):
+        from infrastructure.adapters.parquet_exporter import ParquetProductExporter
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exporter = ParquetProductExporter(tmpdir)
+            exporter.export([{'title': 'P1', 'price': '100'}], 'test', country='cl')
+
+            assert os.path.isdir(os.path.join(tmpdir, 'country=cl'))
+
+    def test_export_uses_numeric_types(self):
+        import pandas as pd
+        from infrastructure.adapters.parquet_exporter import ParquetProductExporter
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            exporter = ParquetProductExporter(tmpdir)
+            data = [
+                {'title': 'Gol', 'price': 'U$S 15.000', 'km': '50.000 km', 'year': '2015'},
+                {'title': 'Gol', 'price': '$ 9.500.000', 'km': None, 'year': None},
+            ]
+            exporter.export(data, 'gol trend')
+
+            df = pd.read_parquet(self._partition_files(tmpdir)[0])
+            assert df['price'].tolist() == [15000.0, 9500000.0]
+            assert df['km'].iloc[0] == 50000
+            assert df['year'].iloc[0] == 2015
+            assert df['currency'].tolist() == ['USD', 'ARS']
+            assert pd.api.types.is_integer_dtype(df['km'])
+
+    def test_export_uses_the_local_currency_of_the_country(self):
+        import pandas as pd
+        from infrastructure.adapters.parquet_exporter import ParquetProductExporter
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            ParquetProductExporter(tmpdir, country='mx').export(
+                [{'price': '$ 15,000'}, {'price': '2000', 'currency': 'US$'}], 'gol',
+            )
+
+            df = pd.read_parquet(self._partition_files(tmpdir)[0])
+            assert df['currency'].tolist() == ['MXN', 'USD']
+            assert df['price'].tolist() == [15000.0, 2000.0]
+
+
+class TestSqliteProductStore:
+    """SqliteProductStore should persist listings/details and answer indexed queries."""
+
+    def _make_store(self):
+        from infrastructure.adapters.sqlite_store import SqliteProductStore
+        return SqliteProductStore(':memory:')
+
+    def test_uses_wal_mode_for_file_databases(self, tmp_path):
+        from infrastructure.adapters.sqlite_store import SqliteProductStore
+
+        store = SqliteProductStore(str(tmp_path / 'db' / 'ml.db'))
+        mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == 'wal'
+        store.close()
+
+    def test_price_history(self):
+        from datetime import datetime
+
+        store = self._make_store()
+        listing = {'item_id': 'MLA1', 'title': 'Gol', 'price': '100000', 'post_link': 'x'}
+        store.save_listings([listing], 'gol trend', 'ar', scraped_at=datetime(2026, 1, 1, 10))
+        store.save_listings([{**listing, 'price': '90000'}], 'gol trend', 'ar', scraped_at=datetime(2026, 1, 2, 10))
+
+        history = store.price_history('MLA1')
+        assert [h['price'] for h in history] == [100000.0, 90000.0]
+        assert history[0]['query'] == 'gol-trend'
+
+    def test_cheapest_returns_distinct_items_for_the_day(self):
+        from datetime import date, datetime
+
+        store = self._make_store()
+        morning = datetime(2026, 1, 1, 9)
+        evening = datetime(2026, 1, 1, 21)
+        store.save_listings([
+            {'item_id': 'MLA1', 'price': '300'},
+            {'item_id': 'MLA2', 'price': '100'},
+            {'item_id': 'MLA3', 'price': '200'},
+        ], 'gol trend', 'ar', scraped_at=morning)
+        store.save_listings([{'item_id': 'MLA1', 'price': '50'}], 'gol trend', 'ar', scraped_at=evening)
+        store.save_listings([{'item_id': 'MLA9', 'price': '1'}], 'gol trend', 'mx', scraped_at=morning)
+
+        cheapest = store.cheapest('gol trend', 'ar', limit=2, day=date(2026, 1, 1))
+        assert [(c['item_id'], c['price']) for c in cheapest] == [('MLA1', 50.0), ('MLA2', 100.0)]
+
+    def test_cheapest_ranks_within_one_currency(self):
+        from datetime import date, datetime
+
+        store = self._make_store()
+        store.save_listings([
+            {'item_id': 'MLA1', 'price': '15000', 'currency': 'U$S'},
+            {'item_id': 'MLA2', 'price': '9000000', 'currency': '$'},
+            {'item_id': 'MLA3', 'price': '8000000', 'currency': '$'},
+        ], 'gol', 'ar', scraped_at=datetime(2026, 1, 1, 9))
+
+        pesos = store.cheapest('gol', 'ar', day=date(2026, 1, 1))
+        dollars = store.cheapest('gol', 'ar', day=date(2026, 1, 1), currency='USD')
+
+        assert [(c['item_id'], c['currency']) for c in pesos] == [('MLA3', 'ARS'), ('MLA2', 'ARS')]
+        assert [c['item_id'] for c in dollars] == ['MLA1']
+
+    def test_adds_currency_column_to_older_databases(self, tmp_path):
+        import sqlite3
+        from infrastructure.adapters.sqlite_store import SqliteProductStore
+
+        path = str(tmp_path / 'old.db')
+        conn = sqlite3.connect(path)
+        conn.execute(
+            "CREATE TABLE listings (id INTEGER PRIMARY KEY, item_id TEXT NOT NULL, country TEXT NOT NULL, "
+            "query TEXT NOT NULL, scraped_at TEXT NOT NULL, title TEXT, price REAL, post_link TEXT, image_link TEXT)"
+        )
+        conn.close()
+
+        store = SqliteProductStore(path)
+        store.save_listings([{'item_id': 'MLM1', 'price': '15,000'}], 'gol', 'mx')
+
+        assert store._conn.execute("SELECT price, currency FROM listings").fetchone()[:] == (15000.0, 'MXN')
+        store.close()
+
+    def test_skips_listings_without_item_id(self):
+        store = self._make_store()
+        store.save_listings([{'title': 'sin id', 'price': '1'}], 'test', 'ar')
+
+        count = store._conn.execute("SELECT COUNT(*) FROM listings").fetchone()[0]
+        assert count == 0
+
+    def test_save_details_parses_typed_columns(self):
+        store = self._make_store()
+        store.save_details([{
+            'item_id': 'MLA1', 'title': 'Gol', 'price': 'U$S 15.000',
+            'year': '2015', 'km': '50.000 km', 'category': 'car',
+        }])
+
+        row = store._conn.execute("SELECT price, currency, year, km FROM details").fetchone()
+        assert tuple(row) == (15000.0, 'USD', 2015, 50000)
+
+    def test_save_details_uses_the_local_currency_of_the_item_site(self):
+        store = self._make_store()
+        store.save_details([{'item_id': 'MLM1', 'price': '$ 15,000'}])
+
+        row = store._conn.execute("SELECT price, currency FROM details").fetchone()
+        assert tuple(row) == (15000.0, 'MXN')
+
+    def test_snapshots_round_trip(self):
+        store = self._make_store()
+        store.save_snapshots({'MLA1': {'fingerprint': 'f1', 'detail': {'title': 'Gol'}}})
+        store.save_snapshots({'MLA1': {'fingerprint': 'f2', 'detail': {'title': 'Gol GTI'}}})
+
+        snapshots = store.load_snapshots(['MLA1', 'MLA2'])
+        assert snapshots == {'MLA1': {'fingerprint': 'f2', 'detail': {'title': 'Gol GTI'}}}
+
+
+class TestJsonlCheckpointStore:
+    """JsonlCheckpointStore should persist crawl progress across runs."""
+
+    def test_resume_from_same_job_id(self, tmp_path):
+        from infrastructure.adapters.jsonl_checkpoint import JsonlCheckpointStore
+
+        store = JsonlCheckpointStore(str(tmp_path))
+        checkpoint = store.open('ar-gol-100')
+        checkpoint.record_page(1, [{'item_id': 'MLA1'}])
+        checkpoint.record_detail('https://x/1', {'title': 'Gol'})
+
+        resumed = store.open('ar-gol-100')
+        assert resumed.completed_pages() == {1: [{'item_id': 'MLA1'}]}
+        assert resumed.completed_details() == {'https://x/1': {'title': 'Gol'}}
+        assert store.open('otro-job').completed_pages() == {}
+
+    def test_appends_one_line_per_record_and_compacts_superseded_ones(self, tmp_path):
+        from infrastructure.adapters.jsonl_checkpoint import JsonlCheckpointStore
+
+        store = JsonlCheckpointStore(str(tmp_path), compact_every=2)
+        checkpoint = store.open('job')
+        for offset in (1, 51, 101):
+            checkpoint.record_page(offset, [])
+        checkpoint.record_page(1, [{'item_id': 'MLA1'}])
+        with open(checkpoint.path) as f:
+            assert len(f.readlines()) == 4
+
+        checkpoint.record_page(51, [{'item_id': 'MLA2'}])
+        with open(checkpoint.path) as f:
+            assert len(f.readlines()) == 3
+        assert store.open('job').completed_pages()[1] == [{'item_id': 'MLA1'}]
+
+    def test_ignores_truncated_last_line(self, tmp_path):
+        from infrastructure.adapters.jsonl_checkpoint import JsonlCheckpointStore
+
+        store = JsonlCheckpointStore(str(tmp_path))
+        checkpoint = store.open('job')
+        checkpoint.record_page(1, [{'item_id': 'MLA1'}])
+        with open(checkpoint.path, 'a') as f:
+            f.write('{"type": "page", "offs')
+
+        assert list(store.open('job').completed_pages()) == [1]
+
+    def test_record_after_truncated_line_survives(self, tmp_path):
+        from infrastructure.adapters.jsonl_checkpoint import JsonlCheckpointStore
+
+        store = JsonlCheckpointStore(str(tmp_path))
+        checkpoint = store.open('job')
+        checkpoint.record_page(1, [{'item_id': 'MLA1'}])
+        with open(checkpoint.path, 'a') as f:
+            f.write('{"type": "page", "offs')
+
+        store.open('job').record_page(51, [{'item_id': 'MLA2'}])
+
+        assert sorted(store.open('job').completed_pages()) == [1, 51]
+
+    def test_discard_removes_checkpoint(self, tmp_path):
+        from infrastructure.adapters.jsonl_checkpoint import JsonlCheckpointStore
+
+        store = JsonlCheckpointStore(str(tmp_path))
+        store.open('job/with:odd chars').record_page(1, [])
+        store.discard('job/with:odd chars')
+
+        assert os.listdir(tmp_path) == []
+
+
+class TestExportManifest:
+    """ExportManifest should index exports without scanning the directory."""
+
+    def test_latest_by_query_country_and_format(self, tmp_path):
+        from datetime import datetime
+        from infrastructure.adapters.export_manifest import ExportManifest
+
+        manifest = ExportManifest(str(tmp_path))
+        manifest.record('gol', str(tmp_path / 'gol-1.csv'), 10, 'csv', timestamp=datetime(2026, 1, 1))
+        manifest.record('gol', str(tmp_path / 'gol.parquet'), 10, 'parquet', country='ar', timestamp=datetime(2026, 1, 2))
+        manifest.record('gol', str(tmp_path / 'gol-2.csv'), 12, 'csv', timestamp=datetime(2026, 1, 3))
+        manifest.record('notebook', str(tmp_path / 'nb.csv'), 5, 'csv', timestamp=datetime(2026, 1, 4))
+
+        assert manifest.latest('gol')['path'] == 'gol-2.csv'
+        assert manifest.latest('gol', country='ar')['path'] == 'gol.parquet'
+        assert manifest.latest(file_format='csv')['path'] == 'nb.csv'
+        assert manifest.latest('otro') is None
+
+    def test_since_returns_entries_in_order(self, tmp_path):
+        from datetime import datetime
+        from infrastructure.adapters.export_manifest import ExportManifest
+
+        manifest = ExportManifest(str(tmp_path))
+        for day in (3, 1, 2):
+            manifest.record(f'q{day}', str(tmp_path / f'q{day}.csv'), day, 'csv', timestamp=datetime(2026, 1, day))
+
+        assert [e['query'] for e in manifest.since(datetime(2026, 1, 2))] == ['q2', 'q3']
+
+    def test_persists_and_reloads(self, tmp_path):
+        from infrastructure.adapters.export_manifest import ExportManifest
+
+        ExportManifest(str(tmp_path)).record('gol', str(tmp_path / 'gol.csv'), 3, 'csv')
+
+        reloaded = ExportManifest(str(tmp_path))
+        assert reloaded.latest('gol')['row_count'] == 3
+
+    def test_appends_one_line_per_entry(self, tmp_path):
+        import json
+        from infrastructure.adapters.export_manifest import ExportManifest
+
+        manifest = ExportManifest(str(tmp_path))
+        for i in range(3):
+            manifest.record(f'q{i}', str(tmp_path / f'q{i}.csv'), i, 'csv')
+
+        with open(manifest.path) as f:
+            assert [json.loads(line)['query'] for line in f] == ['q0', 'q1', 'q2']
+
+    def test_reads_entries_appended_by_other_writers(self, tmp_path):
+        from infrastructure.adapters.export_manifest import ExportManifest
+
+        reader = ExportManifest(str(tmp_path))
+        ExportManifest(str(tmp_path)).record('gol', str(tmp_path / 'gol.csv'), 3, 'csv')
+        with open(reader.path, 'a') as f:
+            f.write('{"query": "incompleta"')
+
+        assert reader.latest('gol')['row_count'] == 3
+        assert reader.latest('incompleta') is None
+
+    def test_for_directory_shares_one_instance(self, tmp_path):
+        from infrastructure.adapters.export_manifest import ExportManifest
+
+        assert ExportManifest.for_directory(str(tmp_path)) is ExportManifest.for_directory(str(tmp_path) + '/')
+
+    def test_concurrent_writers_keep_every_entry(self, tmp_path):
+        import threading
+        from datetime import datetime
+        from infrastructure.adapters.export_manifest import ExportManifest
+
+        # Separate instances stand in for separate processes: only O_APPEND keeps their lines apart.
+        writers = [ExportManifest(str(tmp_path)) for _ in range(4)]
+
+        def _record(manifest, writer):
+            for i in range(10):
+                manifest.record(f'q{writer}-{i}', str(tmp_path / f'q{writer}-{i}.csv'), 1, 'csv')
+
+        threads = [threading.Thread(target=_record, args=(m, n)) for n, m in enumerate(writers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(ExportManifest(str(tmp_path)).since(datetime.min)) == 40
+
+    def test_csv_exporter_records_export(self, tmp_path):
+        from infrastructure.adapters.csv_exporter import CsvProductExporter
+        from infrastructure.adapters.export_manifest import ExportManifest
+
+        CsvProductExporter(str(tmp_path), ';').export([{'title': 'P1'}, {'title': 'P2'}], 'test product')
+
+        entry = ExportManifest(str(tmp_path)).latest('test product')
+        assert entry['path'] == 'test-product.csv'
+        assert entry['row_count'] == 2
+        assert entry['format'] == 'csv'
+
+
+class TestSqliteJobQueue:
+    """SqliteJobQueue should hand each task to one worker and recover dead workers' tasks."""
+
+    def _queue(self, tmp_path, **kwargs):
+        from infrastructure.adapters.sqlite_job_queue import SqliteJobQueue
+        return SqliteJobQueue(str(tmp_path / 'queue.db'), **kwargs)
+
+    def test_lease_by_priority_then_fifo(self, tmp_path):
+        queue = self._queue(tmp_path)
+        queue.enqueue('search', {'query': 'a'})
+        queue.enqueue('search', {'query': 'b'}, priority=5)
+        queue.enqueue('search', {'query': 'c'})
+
+        leased = [queue.lease('w1')['payload']['query'] for _ in range(3)]
+        assert leased == ['b', 'a', 'c']
+        assert queue.lease('w1') is None
+
+    def test_enqueue_items_skips_items_already_enqueued(self, tmp_path):
+        queue = self._queue(tmp_path)
+
+        first = queue.enqueue_items('details', 'urls', ['a', 'b', 'c'], 2, dedupe_prefix='queue-1')
+        again = queue.enqueue_items('details', 'urls', ['b', 'c', 'd'], 2, dedupe_prefix='queue-1')
+        other_job = queue.enqueue_items('details', 'urls', ['a'], 2, dedupe_prefix='queue-2')
+
+        assert len(first) == 2 and len(again) == 1 and len(other_job) == 1
+        payloads = [queue.lease('w1')['payload']['urls'] for _ in range(4)]
+        assert payloads == [['a', 'b'], ['c'], ['d'], ['a']]
+
+    def test_task_is_leased_once_across_connections(self, tmp_path):
+        first = self._queue(tmp_path)
+        second = self._queue(tmp_path)
+        first.enqueue('search', {'query': 'a'})
+
+        assert first.lease('w1') is not None
+        assert second.lease('w2') is None
+
+    def test_expired_lease_is_requeued(self, tmp_path):
+        now = [1000.0]
+        queue = self._queue(tmp_path, clock=lambda: now[0])
+        task_id = queue.enqueue('search', {'query': 'a'})
+        queue.lease('dead-worker', lease_seconds=10)
+
+        now[0] += 5
+        assert queue.heartbeat(task_id, 'dead-worker', lease_seconds=10)
+        now[0] += 9
+        assert queue.lease('w2') is None
+        now[0] += 2
+        task = queue.lease('w2')
+        assert task['id'] == task_id
+        assert task['attempts'] == 2
+        assert not queue.heartbeat(task_id, 'dead-worker')
+        queue.complete(task_id, 'w2')
+        assert queue.counts() == {'done': 1}
+
+    def test_fail_retries_until_max_attempts(self, tmp_path):
+        queue = self._queue(tmp_path, max_attempts=2)
+        queue.enqueue('details', {'urls': ['u']})
+
+        queue.fail(queue.lease('w1')['id'], 'w1', 'timeout')
+        assert queue.counts() == {'pending': 1}
+        queue.fail(queue.lease('w1')['id'], 'w1', 'timeout')
+        assert queue.counts() == {'failed': 1}
+        assert queue.lease('w1') is None
+
+
+class TestInMemoryResultStore:
+    """Tests for InMemoryResultStore."""
+
+    def _store(self, **kwargs):
+        from infrastructure.adapters.memory_result_store import InMemoryResultStore
+
+        now = [0.0]
+        store = InMemoryResultStore(clock=lambda: now[0], **kwargs)
+        return store, now
+
+    def test_put_and_get(self):
+        store, _ = self._store()
+
+        assert store.put('job-1', [{'title': 'A'}]) is True
+        assert store.get('job-1') == [{'title': 'A'}]
+        assert store.get('job-2') is None
+
+    def test_entries_expire(self):
+        store, now = self._store(ttl=10)
+        store.put('job-1', [{'title': 'A'}])
+
+        now[0] = 9
+        assert store.get('job-1') is not None
+        now[0] = 10
+        assert store.get('job-1') is None
+        assert len(store) == 0
+
+    def test_least_recently_used_is_evicted_by_entries(self):
+        store, _ = self._store(max_entries=2)
+        store.put('a', [{}])
+        store.put('b', [{}])
+        store.get('a')
+        store.put('c', [{}])
+
+        assert store.get('a') is not None
+        assert store.get('b') is None
+        assert store.get('c') is not None
+
+    def test_evicted_by_total_rows(self):
+        store, _ = self._store(max_rows=5)
+        store.put('a', [{}] * 3)
+        store.put('b', [{}] * 2)
+        store.put('c', [{}] * 2)
+
+        assert store.get('a') is None
+        assert store.get('b') is not None
+        assert store.get('c') is not None
+
+    def test_oversized_result_is_not_stored(self):
+        store, _ = self._store(max_rows=2)
+        store.put('a', [{}])
+
+        assert store.put('big', [{}] * 3) is False
+        assert store.get('big') is None
+        assert store.get('a') is not None
+
+    def test_replacing_a_key_frees_its_rows(self):
+        store, _ = self._store(max_rows=3)
+        store.put('a', [{}] * 3)
+        store.put('a', [{}] * 3)
+
+        assert len(store.get('a')) == 3
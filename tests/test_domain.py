@@ -171,6 +171,12 @@ class TestProductListing:
         assert d['title'] is None
         assert d['price'] is None
 
+    def test_item_id_included_when_present(self):
+        listing = ProductListing(title='Test', item_id='MLA123456789')
+        d = listing.to_dict()
+        assert d['item_id'] == 'MLA123456789'
+        assert ProductListing.from_dict(d).item_id == 'MLA123456789'
+
 
 class TestProductDetail:
     """Tests for ProductDetail entity."""
@@ -145,6 +145,21 @@ class TestMercadoLibreScraper:
         assert data['price'] == '100000'
         assert data['post_link'] == 'https://articulo.mercadolibre.com.ar/test'
         assert data['image_link'] == 'https://http2.mlstatic.com/test.jpg'
+        assert 'item_id' not in data
+
+    def test_extract_post_data_includes_item_id(self, scraper):
+        """Should parse the item ID from the listing link."""
+        html = '''
+        <li class="ui-search-layout__item">
+            <h2>Gol Trend</h2>
+            <a href="https://auto.mercadolibre.com.ar/MLA-1234567890-gol-trend-_JM">Link</a>
+        </li>
+        '''
+        post = BeautifulSoup(html, 'html.parser').find('li')
+
+        data = scraper.extract_post_data(post)
+
+        assert data['item_id'] == 'MLA1234567890'
 
 
 class TestScrapePageResults:
@@ -375,6 +390,24 @@ class TestGetPageContent:
 
             assert 'Error al obtener la página' in str(exc_info.value)
 
+    def test_counts_bytes_and_errors(self):
+        """Should count downloaded HTML and failed requests in the caller's stats."""
+        import requests
+        from domain.entities import ScrapeStats
+        scraper = _make_scraper()
+        stats, other = ScrapeStats(), ScrapeStats()
+
+        with patch('scrapers.mercadolibre.mercadolibre_scraper.requests.get') as mock_get:
+            mock_get.return_value = Mock(text='<html></html>')
+            scraper.get_page_content('https://example.com', stats=stats)
+            scraper.get_page_content('https://example.com', stats=other)
+            mock_get.side_effect = requests.RequestException('Connection error')
+            with pytest.raises(Exception):
+                scraper.get_page_content('https://example.com', stats=stats)
+
+        assert (stats.bytes_read, stats.request_errors) == (len('<html></html>'), 1)
+        assert (other.bytes_read, other.request_errors) == (len('<html></html>'), 0)
+
 
 class TestPriceParser:
     """Tests for ML-specific price parser."""
@@ -420,6 +453,450 @@ class TestPriceParser:
         assert m.amount == 500.0
 
 
+class TestDeduplication:
+    """Tests for listing deduplication and early stop in scrape_product_list."""
+
+    def _first_page(self, total, per_page):
+        items = ''.join('<li class="ui-search-layout__item"></li>' for _ in range(per_page))
+        html = f'<span class="ui-search-search-result__quantity-results">{total} resultados</span><ul>{items}</ul>'
+        return BeautifulSoup(html, 'html.parser')
+
+    def _items(self, *ids):
+        return [{'item_id': i, 'post_link': f'https://x/{i}'} for i in ids]
+
+    def test_duplicates_do_not_count_toward_limit(self):
+        from domain.entities import ScrapeStats
+        scraper = _make_scraper()
+        pages = [self._items('A', 'B', 'A'), self._items('B', 'C', 'D')]
+
+        with patch.object(scraper, 'get_page_content', return_value=self._first_page(300, 3)), \
+                patch.object(scraper, 'scrape_page_results', side_effect=pages):
+            stats = ScrapeStats()
+            results = scraper.scrape_product_list('ar', 'gol', 4, stats=stats)
+
+        assert [r['item_id'] for r in results] == ['A', 'B', 'C', 'D']
+        assert stats.duplicates == 2
+        assert stats.pages == 2
+        assert stats.items == 4
+
+    def test_stops_early_when_page_has_no_new_items(self):
+        from domain.entities import ScrapeStats
+        scraper = _make_scraper()
+        pages = [self._items('A', 'B'), self._items('A', 'B'), self._items('C')]
+
+        with patch.object(scraper, 'get_page_content', return_value=self._first_page(300, 2)), \
+                patch.object(scraper, 'scrape_page_results', side_effect=pages) as mock_page:
+            stats = ScrapeStats()
+            results = scraper.scrape_product_list('ar', 'gol', 100, stats=stats)
+
+        assert len(results) == 2
+        assert stats.early_stop is True
+        assert mock_page.call_count == 2
+
+    def test_shared_deduplicator_skips_items_from_previous_runs(self):
+        from scrapers.mercadolibre.mercadolibre_scraper import MercadoLibreScraper
+        from scrapers.mercadolibre.dedup import BloomFilter
+
+        scraper = MercadoLibreScraper(config=TEST_CONFIG, deduplicator=BloomFilter(capacity=1000))
+        with patch.object(scraper, 'get_page_content', return_value=self._first_page(2, 2)), \
+                patch.object(scraper, 'scrape_page_results', side_effect=[self._items('A', 'B'), self._items('B', 'C')]):
+            first = scraper.scrape_product_list('ar', 'gol', 100)
+            second = scraper.scrape_product_list('ar', 'gol', 100)
+
+        assert [r['item_id'] for r in first] == ['A', 'B']
+        assert [r['item_id'] for r in second] == ['C']
+
+
+class TestIterProductPages:
+    """iter_product_pages should yield pages lazily."""
+
+    def test_yields_each_page_before_fetching_the_next(self):
+        scraper = _make_scraper()
+        first_page = TestDeduplication()._first_page(300, 2)
+        pages = [[{'item_id': 'A'}], [{'item_id': 'B'}]]
+
+        with patch.object(scraper, 'get_page_content', return_value=first_page), \
+                patch.object(scraper, 'scrape_page_results', side_effect=pages) as mock_page:
+            stream = scraper.iter_product_pages('ar', 'gol', 100)
+            assert next(stream) == [{'item_id': 'A'}]
+            assert mock_page.call_count == 1
+            assert next(stream) == [{'item_id': 'B'}]
+
+    def test_empty_first_page_yields_nothing(self):
+        scraper = _make_scraper()
+
+        with patch.object(scraper, 'get_page_content', return_value=BeautifulSoup('<div></div>', 'html.parser')):
+            assert list(scraper.iter_product_pages('ar', 'gol', 100)) == []
+
+
+class TestCheckpointResume:
+    """scrape_product_list should reuse checkpointed pages."""
+
+    def test_reuses_completed_pages_and_records_new_ones(self):
+        scraper = _make_scraper()
+        first_page = TestDeduplication()._first_page(300, 2)
+        checkpoint = Mock()
+        checkpoint.completed_pages.return_value = {1: [{'item_id': 'A'}, {'item_id': 'B'}]}
+
+        with patch.object(scraper, 'get_page_content', return_value=first_page), \
+                patch.object(scraper, 'scrape_page_results', return_value=[{'item_id': 'C'}]) as mock_page:
+            results = scraper.scrape_product_list('ar', 'gol', 3, checkpoint=checkpoint)
+
+        assert [r['item_id'] for r in results] == ['A', 'B', 'C']
+        assert mock_page.call_count == 1
+        assert '_Desde_51_' in mock_page.call_args.args[0]
+        checkpoint.record_page.assert_called_once_with(51, [{'item_id': 'C'}])
+
+
+class TestDedupStructures:
+    """Tests for SeenSet and BloomFilter."""
+
+    def test_seen_set(self):
+        from scrapers.mercadolibre.dedup import SeenSet
+
+        seen = SeenSet()
+        assert seen.add('MLA1') is True
+        assert seen.add('MLA1') is False
+        assert 'MLA1' in seen
+        assert len(seen) == 1
+
+    def test_bloom_filter_has_no_false_negatives(self):
+        from scrapers.mercadolibre.dedup import BloomFilter
+
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        keys = [f'MLA{i}' for i in range(1000)]
+        assert all(bloom.add(k) for k in keys[:10])
+        for k in keys:
+            bloom.add(k)
+        assert all(k in bloom for k in keys)
+        assert bloom.add('MLA1') is False
+
+    def test_bloom_filter_false_positive_rate(self):
+        from scrapers.mercadolibre.dedup import BloomFilter
+
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f'MLA{i}')
+        false_positives = sum(f'MLB{i}' in bloom for i in range(2000))
+        assert false_positives < 100
+
+    def test_bloom_filter_rejects_invalid_parameters(self):
+        from scrapers.mercadolibre.dedup import BloomFilter
+
+        with pytest.raises(ValueError):
+            BloomFilter(capacity=0)
+
+
+class TestItemId:
+    """Tests for MercadoLibre item ID extraction."""
+
+    def test_article_link(self):
+        from scrapers.mercadolibre.item_id import extract_item_id
+
+        url = "https://auto.mercadolibre.com.ar/MLA-1234567890-volkswagen-gol-trend-_JM#position=1"
+        assert extract_item_id(url) == 'MLA1234567890'
+
+    def test_catalog_link_prefers_wid(self):
+        from scrapers.mercadolibre.item_id import extract_item_id
+
+        url = "https://www.mercadolibre.com.ar/notebook/p/MLA22222222#polycard_client=search&wid=MLA1111111111"
+        assert extract_item_id(url) == 'MLA1111111111'
+
+    def test_markdown_link(self):
+        from scrapers.mercadolibre.item_id import extract_item_id
+
+        assert extract_item_id("[Link](https://articulo.mercadolibre.com.mx/MLM-987654321-x)") == 'MLM987654321'
+
+    def test_no_id(self):
+        from scrapers.mercadolibre.item_id import extract_item_id
+
+        assert extract_item_id("https://example.com/product") is None
+        assert extract_item_id(None) is None
+
+
+class TestPriceSharding:
+    """Tests for price-range shard planning and sharded crawls."""
+
+    PRICES = [100] * 30 + [1500] * 30 + [2500] * 5 + [3900] * 5
+
+    def _count(self, domain, product_name, search_segment='', filters=None):
+        return sum(1 for price in self.PRICES if filters.min_price <= price <= filters.max_price)
+
+    def test_plan_bisects_ranges_over_cap(self):
+        from scrapers.mercadolibre.sharding import ShardPlanner
+
+        scraper = _make_scraper()
+        with patch.object(scraper, 'count_results', side_effect=self._count):
+            shards = ShardPlanner(scraper, cap=40).plan('ar', 'notebook', 0, 4000)
+
+        assert [(s.low, s.high, s.total) for s in shards] == [(0, 1000, 30), (1001, 2000, 30), (2001, 4000, 10)]
+
+    def test_plan_keeps_unsplittable_range(self):
+        from scrapers.mercadolibre.sharding import ShardPlanner
+
+        scraper = _make_scraper()
+        with patch.object(scraper, 'count_results', side_effect=self._count):
+            shards = ShardPlanner(scraper, cap=20).plan('ar', 'notebook', 100, 100)
+
+        assert [(s.low, s.high, s.total) for s in shards] == [(100, 100, 30)]
+
+    def test_sharded_crawl_merges_without_duplicates(self):
+        from scrapers.mercadolibre.sharding import ShardedMercadoLibreScraper, PriceShard
+
+        inner = Mock(page_increment=50, max_pages=100)
+        by_range = {
+            (0, 10): [{'item_id': 'A'}, {'item_id': 'B'}],
+            (11, 20): [{'item_id': 'B'}, {'item_id': 'C'}],
+        }
+        inner.scrape_product_list.side_effect = \
+            lambda d, q, limit, stats, filters, sort, deadline: by_range[(filters.min_price, filters.max_price)]
+        sharded = ShardedMercadoLibreScraper(inner, cap=1)
+
+        with patch.object(sharded.planner, 'plan', return_value=[PriceShard(0, 10, 2), PriceShard(11, 20, 2)]):
+            results = sharded.scrape_product_list('ar', 'notebook', 10)
+
+        assert sorted(r['item_id'] for r in results) == ['A', 'B', 'C']
+
+    def test_sharded_crawl_uses_only_spare_slots(self):
+        import threading
+        import time
+        from application.services.batch_runner import BatchRunner
+        from scrapers.mercadolibre.sharding import ShardedMercadoLibreScraper, PriceShard
+
+        lock = threading.Lock()
+        active = [0, 0]
+
+        def _crawl(d, q, limit, stats, filters, sort, deadline):
+            with lock:
+                active[0] += 1
+                active[1] = max(active)
+            time.sleep(0.02)
+            with lock:
+                active[0] -= 1
+            return [{'item_id': str(filters.min_price)}]
+
+        inner = Mock(page_increment=50, max_pages=100)
+        inner.scrape_product_list.side_effect = _crawl
+        # The job itself holds one of the two 'ar' slots, so only one more shard thread fits.
+        runner = BatchRunner(lambda country: None, max_concurrency=8, max_per_host=2)
+        assert runner.try_acquire('ar')
+        sharded = ShardedMercadoLibreScraper(inner, max_workers=4, cap=1, slots=runner)
+
+        shards = [PriceShard(i * 10, i * 10 + 9, 1) for i in range(6)]
+        with patch.object(sharded.planner, 'plan', return_value=shards):
+            results = sharded.scrape_product_list('ar', 'notebook', 10)
+
+        assert len(results) == 6
+        assert active[1] <= 2
+        assert runner.try_acquire('ar') and not runner.try_acquire('ar')
+
+    def test_closing_stream_early_cancels_queued_shards(self):
+        from scrapers.mercadolibre.sharding import ShardedMercadoLibreScraper, PriceShard
+
+        inner = Mock(page_increment=50, max_pages=100)
+        inner.scrape_product_list.side_effect = \
+            lambda d, q, limit, stats, filters, sort, deadline: [{'item_id': str(filters.min_price)}]
+        sharded = ShardedMercadoLibreScraper(inner, max_workers=1, cap=1)
+
+        shards = [PriceShard(i * 10, i * 10 + 9, 1) for i in range(20)]
+        with patch.object(sharded.planner, 'plan', return_value=shards):
+            pages = sharded.iter_product_pages('ar', 'notebook', 100)
+            next(pages)
+            pages.close()
+
+        assert inner.scrape_product_list.call_count < len(shards)
+
+    def test_small_limit_is_not_sharded(self):
+        from scrapers.mercadolibre.sharding import ShardedMercadoLibreScraper
+
+        inner = Mock(page_increment=50, max_pages=100)
+        inner.iter_product_pages.return_value = iter([[{'item_id': 'A'}]])
+        sharded = ShardedMercadoLibreScraper(inner)
+
+        assert sharded.scrape_product_list('ar', 'notebook', 50) == [{'item_id': 'A'}]
+        inner.iter_product_pages.assert_called_once_with(
+            'ar', 'notebook', 50, None, None, filters=None, sort=None, deadline=None,
+        )
+
+
+class TestSearchFilters:
+    """Tests for pushing SearchFilters into MercadoLibre search URLs."""
+
+    def test_filters_segment(self):
+        from domain import SearchFilters, ItemCondition
+        from scrapers.mercadolibre.filters import filters_segment
+
+        filters = SearchFilters(
+            min_price=1000, max_price=5000, condition=ItemCondition.USED,
+            min_year=2015, min_km=0, max_km=80000, free_shipping=True,
+        )
+        assert filters_segment(filters) == (
+            '_PriceRange_1000-5000_ITEM*CONDITION_2230581_YEAR_2015-*_KILOMETERS_0km-80000km_CostoEnvio_Gratis'
+        )
+        assert filters_segment(SearchFilters()) == ''
+        assert filters_segment(None) == ''
+
+    def test_location_path_strips_accents(self):
+        from domain import SearchFilters
+        from scrapers.mercadolibre.filters import location_path
+
+        assert location_path(SearchFilters(location=' Córdoba ')) == 'cordoba/'
+        assert location_path(SearchFilters(location='Neuquén Capital')) == 'neuquen-capital/'
+        assert location_path(None) == ''
+
+    def test_sort_order_segment_comes_first(self):
+        from domain import SearchFilters, SortOrder
+
+        scraper = _make_scraper()
+        url = scraper.search_url('ar', 'gol', filters=SearchFilters(max_price=100), sort=SortOrder.PRICE_ASC)
+
+        assert url == 'https://listado.mercadolibre.com.ar/gol_OrderId_PRICE_PriceRange_0-100_NoIndex_True'
+
+    def test_invalid_range_raises(self):
+        from domain import SearchFilters
+
+        with pytest.raises(ValueError):
+            SearchFilters(min_price=10, max_price=5)
+
+    def test_filters_are_added_to_search_and_page_urls(self):
+        from domain import SearchFilters
+
+        scraper = _make_scraper()
+        page = TestDeduplication()._first_page(100, 2)
+        filters = SearchFilters(max_price=100, location='Capital Federal')
+
+        with patch.object(scraper, 'get_page_content', return_value=page) as mock_get, \
+                patch.object(scraper, 'scrape_page_results', return_value=[]) as mock_page:
+            scraper.scrape_product_list('ar', 'gol', 10, filters=filters)
+
+        assert mock_get.call_args.args[0] == \
+            'https://listado.mercadolibre.com.ar/capital-federal/gol_PriceRange_0-100_NoIndex_True'
+        assert mock_page.call_args.args[0] == \
+            'https://listado.mercadolibre.com.ar/capital-federal/gol_Desde_1_PriceRange_0-100_NoIndex_True'
+
+
+class TestDeadline:
+    """Tests for deadline-bounded crawls."""
+
+    def test_stops_at_deadline_with_partial_results(self):
+        from domain.entities import ScrapeStats
+
+        scraper = _make_scraper()
+        deadline = Mock()
+        deadline.expired.side_effect = [False, False, True]
+        deadline.remaining.return_value = 5.0
+        pages = [[{'item_id': 'A'}], [{'item_id': 'B'}]]
+
+        with patch.object(scraper, 'get_page_content', return_value=TestDeduplication()._first_page(300, 1)), \
+                patch.object(scraper, 'scrape_page_results', side_effect=pages) as mock_page:
+            stats = ScrapeStats()
+            results = scraper.scrape_product_list('ar', 'gol', 100, stats=stats, deadline=deadline)
+
+        assert results == [{'item_id': 'A'}]
+        assert stats.timed_out is True
+        assert mock_page.call_args.args[1] == 5.0
+
+    def test_request_timeout_after_deadline_returns_partial_results(self):
+        from domain.entities import ScrapeStats
+
+        scraper = _make_scraper()
+        deadline = Mock()
+        deadline.expired.side_effect = [False, False, False, True]
+        deadline.remaining.return_value = 0.1
+
+        with patch.object(scraper, 'get_page_content', return_value=TestDeduplication()._first_page(300, 1)), \
+                patch.object(scraper, 'scrape_page_results', side_effect=[[{'item_id': 'A'}], Exception('timeout')]):
+            stats = ScrapeStats()
+            results = scraper.scrape_product_list('ar', 'gol', 100, stats=stats, deadline=deadline)
+
+        assert results == [{'item_id': 'A'}]
+        assert stats.timed_out is True
+
+
+class TestSamplePages:
+    """Tests for random result-page sampling."""
+
+    def test_samples_distinct_reachable_pages(self):
+        scraper = _make_scraper()
+        first = TestDeduplication()._first_page(1000, 50)
+
+        with patch.object(scraper, 'get_page_content', return_value=first), \
+                patch.object(scraper, 'scrape_page_results', return_value=[{'price': '1'}]) as mock_page:
+            total, reachable, pages = scraper.sample_product_pages('ar', 'gol', 3, seed=7)
+
+        assert (total, reachable) == (1000, 10)
+        assert len(pages) == 3
+        offsets = {call.args[0].split('_Desde_')[1].split('_')[0] for call in mock_page.call_args_list}
+        assert len(offsets) == mock_page.call_count
+        assert all(int(offset) % 50 == 1 for offset in offsets)
+
+    def test_sample_is_capped_by_reachable_pages(self):
+        scraper = _make_scraper()
+        first = TestDeduplication()._first_page(100, 50)
+
+        with patch.object(scraper, 'get_page_content', return_value=first), \
+                patch.object(scraper, 'scrape_page_results', return_value=[{'price': '1'}]):
+            _, reachable, pages = scraper.sample_product_pages('ar', 'gol', 5, seed=1)
+
+        assert reachable == 2
+        assert len(pages) == 2
+
+
+class TestCardAttributes:
+    """Tests for category attributes read from search result cards."""
+
+    def test_car_card(self):
+        scraper = _make_scraper()
+        html = """
+        <li class="ui-search-layout__item">
+            <h2>VW Gol</h2>
+            <span class="andes-money-amount__currency-symbol">U$S</span>
+            <span class="andes-money-amount__fraction">15.000</span>
+            <a href="https://auto.mercadolibre.com.ar/MLA-123456789-gol"></a>
+            <ul class="poly-attributes_list">
+                <li class="poly-attributes_list__item">2018</li>
+                <li class="poly-attributes_list__item">85.000 Km</li>
+            </ul>
+        </li>"""
+        post = BeautifulSoup(html, 'html.parser').find('li')
+
+        result = scraper.extract_post_data(post)
+
+        assert result['currency'] == 'U$S'
+        assert result['category'] == 'car'
+        assert result['year'] == '2018'
+        assert result['km'] == '85.000 km'
+
+    def test_car_card_with_comma_thousands(self):
+        from scrapers.mercadolibre.card_attributes import extract_card_attributes
+
+        html = """<div><ul>
+            <li class="poly-attributes_list__item">2019</li>
+            <li class="poly-attributes_list__item">85,000 Km</li>
+        </ul></div>"""
+
+        attributes = extract_card_attributes(BeautifulSoup(html, 'html.parser'))
+
+        assert attributes == {'year': '2019', 'km': '85,000 km', 'category': 'car'}
+
+    def test_property_card(self):
+        from scrapers.mercadolibre.card_attributes import extract_card_attributes
+
+        html = """<div><ul>
+            <li class="ui-search-card-attributes__attribute">3 ambientes</li>
+            <li class="ui-search-card-attributes__attribute">60 m² cubiertos</li>
+        </ul></div>"""
+
+        attributes = extract_card_attributes(BeautifulSoup(html, 'html.parser'))
+
+        assert attributes == {'m2': '60 m² cubiertos', 'category': 'property'}
+
+    def test_card_without_attributes(self):
+        from scrapers.mercadolibre.card_attributes import extract_card_attributes
+
+        assert extract_card_attributes(BeautifulSoup('<li><h2>Notebook</h2></li>', 'html.parser')) == {}
+
+
 class TestMercadoLibreEnums:
     """Tests for ML-specific enums."""
 
@@ -83,3 +83,242 @@ class TestDashPresenter:
         assert 'price_usd' in data[0]
         # shipping column should be removed (all None)
         assert 'shipping' not in data[0]
+
+    def test_concurrent_calls_do_not_share_state(self):
+        from concurrent.futures import ThreadPoolExecutor
+        presenter = self._make_presenter()
+        batches = [[{'title': f'Product {i}', 'price': f'$ {i + 1}.000'}] * (i + 1) for i in range(20)]
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(presenter.process_and_convert_products, batches))
+
+        for i, (data, _) in enumerate(results):
+            assert len(data) == i + 1
+            assert {row['title'] for row in data} == {f'Product {i}'}
+        assert not hasattr(presenter, 'df')
+
+    def test_convert_price_returns_new_frame(self):
+        import pandas as pd
+        presenter = self._make_presenter()
+        df = pd.DataFrame({'price': ['$ 1.000']})
+
+        converted = presenter.convert_price(df)
+
+        assert list(df.columns) == ['price']
+        assert converted['price_usd'].tolist() == [1]
+
+
+class TestPagedTable:
+    """Tests for server-side DataTable paging, sorting and filtering."""
+
+    ROWS = [
+        {'title': 'Gol', 'price_usd': 9000.0, 'year': '2015'},
+        {'title': 'Onix', 'price_usd': 15000.0, 'year': '2020'},
+        {'title': 'Gol Trend', 'price_usd': 11000.0, 'year': '2018'},
+        {'title': 'Corsa', 'price_usd': None, 'year': '2010'},
+        {'title': 'Cronos', 'price_usd': 17000.0, 'year': '2021'},
+    ]
+
+    def test_parse_filter_query(self):
+        from presentation.table_query import parse_filter_query
+
+        terms = parse_filter_query('{price_usd} >= 10000 && {title} icontains "gol" && {year} = 2020 && nonsense')
+
+        assert terms == [
+            ('price_usd', 'ge', 10000.0, False),
+            ('title', 'contains', 'gol', True),
+            ('year', 'eq', 2020.0, False),
+        ]
+
+    def test_pages(self):
+        from presentation.table_query import PagedTable
+
+        table = PagedTable(self.ROWS)
+
+        first, page_count = table.page(0, 2)
+        last, _ = table.page(2, 2)
+
+        assert page_count == 3
+        assert [row['title'] for row in first] == ['Gol', 'Onix']
+        assert [row['title'] for row in last] == ['Cronos']
+
+    def test_page_past_the_end_returns_last_page(self):
+        from presentation.table_query import PagedTable
+
+        rows, page_count = PagedTable(self.ROWS).page(10, 2, '{price_usd} > 10000')
+
+        assert page_count == 2
+        assert [row['title'] for row in rows] == ['Cronos']
+
+    def test_sort_puts_missing_values_last(self):
+        from presentation.table_query import PagedTable
+
+        rows, _ = PagedTable(self.ROWS).page(0, 5, sort_by=[{'column_id': 'price_usd', 'direction': 'desc'}])
+
+        assert [row['title'] for row in rows] == ['Cronos', 'Onix', 'Gol Trend', 'Gol', 'Corsa']
+        assert rows[-1]['price_usd'] is None
+
+    def test_filter_and_sort(self):
+        from presentation.table_query import PagedTable
+
+        rows, page_count = PagedTable(self.ROWS).page(
+            0, 10, '{title} contains Gol && {price_usd} < 12000', [{'column_id': 'year', 'direction': 'asc'}],
+        )
+
+        assert page_count == 1
+        assert [row['title'] for row in rows] == ['Gol', 'Gol Trend']
+
+    def test_source_page_returns_original_rows(self):
+        from presentation.table_query import PagedTable
+
+        rows, page_count = PagedTable(self.ROWS).source_page(0, 2, sort_by=[{'column_id': 'price_usd'}])
+
+        assert page_count == 3
+        assert rows == [self.ROWS[0], self.ROWS[2]]
+        assert rows[0] is self.ROWS[0]
+
+    def test_records_are_queried_and_rows_returned(self):
+        from presentation.table_query import PagedTable
+
+        listings = [{'title': 'A', 'price': '900'}, {'title': 'B', 'price': '15000'}, {'title': 'C', 'price': '2000'}]
+        records = [{'title': 'A', 'price': 900.0}, {'title': 'B', 'price': 15000.0}, {'title': 'C', 'price': 2000.0}]
+        table = PagedTable(listings, records=records)
+
+        rows, _ = table.source_page(0, 3, '{price} > 1000', [{'column_id': 'price', 'direction': 'desc'}])
+        ignored, _ = table.source_page(0, 3, '{author} contains x', [{'column_id': 'author'}])
+
+        assert [row['title'] for row in rows] == ['B', 'C']
+        assert rows[0] is listings[1]
+        assert ignored == listings
+
+    def test_views_are_cached(self):
+        from presentation.table_query import PagedTable
+
+        table = PagedTable(self.ROWS, max_views=1)
+        table.page(0, 2, '{year} > 2015')
+        table.page(1, 2, '{year} > 2015')
+
+        assert list(table._views) == [('{year} > 2015', ())]
+
+    def test_cache_rebuilds_when_rows_change(self):
+        from infrastructure.adapters.memory_result_store import InMemoryResultStore
+        from presentation.table_query import PagedTableCache
+
+        store = InMemoryResultStore()
+        cache = PagedTableCache(store)
+        store.put('job-1', self.ROWS)
+
+        table = cache.get('job-1')
+        assert cache.get('job-1') is table
+        store.put('job-1', self.ROWS[:1])
+        assert len(cache.get('job-1')) == 1
+        assert cache.get('missing') is None
+
+    def test_cache_uses_given_builder(self):
+        from infrastructure.adapters.memory_result_store import InMemoryResultStore
+        from presentation.table_query import PagedTable, PagedTableCache
+
+        store = InMemoryResultStore()
+        store.put('job-1', self.ROWS)
+        cache = PagedTableCache(store, build=lambda rows: PagedTable(rows, records=[{'rank': -i} for i in range(len(rows))]))
+
+        rows, _ = cache.get('job-1').source_page(0, 2, sort_by=[{'column_id': 'rank'}])
+
+        assert rows == [self.ROWS[4], self.ROWS[3]]
+
+
+class TestPointAggregation:
+    """Tests for scatter plot downsampling."""
+
+    def test_dense_points_share_a_cell(self):
+        import numpy as np
+        from presentation.point_aggregation import aggregate_points
+
+        rng = np.random.default_rng(0)
+        x = rng.uniform(0, 100, 10_000)
+        y = rng.uniform(0, 100, 10_000)
+
+        points = aggregate_points(x, y, np.full(10_000, 2020.0), resolution=(10, 10))
+
+        assert len(points) == 100
+        assert points.count.sum() == 10_000
+        assert np.allclose(points.color, 2020.0)
+
+    def test_outliers_are_kept(self):
+        import numpy as np
+        from presentation.point_aggregation import aggregate_points
+
+        x = np.concatenate([np.linspace(0, 10, 1000), [10_000]])
+        y = np.concatenate([np.linspace(0, 10, 1000), [5]])
+
+        points = aggregate_points(x, y, resolution=(5, 5))
+
+        assert 10_000 in points.x
+        assert points.count[points.x == 10_000].tolist() == [1]
+        assert points.count.sum() == 1001
+
+    def test_range_drops_points_outside_and_refines_cells(self):
+        import numpy as np
+        from presentation.point_aggregation import aggregate_points
+
+        x = np.linspace(0, 100, 1001)
+        y = np.linspace(0, 100, 1001)
+
+        full = aggregate_points(x, y, resolution=(10, 10))
+        zoomed = aggregate_points(x, y, x_range=(0, 10), y_range=(0, 10), resolution=(10, 10))
+
+        assert zoomed.count.sum() == 101
+        assert zoomed.x.max() <= 10
+        assert len(zoomed) == len(full)
+
+    def test_missing_values_are_ignored(self):
+        import numpy as np
+        from presentation.point_aggregation import aggregate_points
+
+        points = aggregate_points([1.0, np.nan, 3.0], [1.0, 2.0, None], [2020, 2021, 2022])
+
+        assert points.count.sum() == 1
+        assert points.color.tolist() == [2020.0]
+
+    def test_empty_input(self):
+        from presentation.point_aggregation import aggregate_points
+
+        assert len(aggregate_points([], [])) == 0
+
+
+class TestScatterFigure:
+    """Tests for ui.create_scatter_figure."""
+
+    def _data(self, n):
+        import pandas as pd
+
+        return pd.DataFrame({
+            'km': [f'{(i * 1000):,} km'.replace(',', '.') for i in range(n)],
+            'price_usd': [float(10_000 + i) for i in range(n)],
+            'year': ['2018'] * n,
+        })
+
+    def test_small_data_is_drawn_point_by_point_without_mutation(self):
+        from unittest.mock import patch
+        import ui
+
+        data = self._data(3)
+        with patch.object(ui, 'SCATTER_WEBGL_THRESHOLD', 10), patch.object(ui, 'px') as mock_px:
+            ui.create_scatter_figure(data, 'km', 'price_usd', 'year', {}, 'Autos')
+
+        plotted = mock_px.scatter.call_args.args[0]
+        assert plotted['km'].tolist() == [0.0, 1000.0, 2000.0]
+        assert data['km'].tolist() == ['0 km', '1.000 km', '2.000 km']
+
+    def test_large_data_is_aggregated(self):
+        from unittest.mock import patch
+        import ui
+
+        data = self._data(50)
+        with patch.object(ui, 'SCATTER_WEBGL_THRESHOLD', 10), patch.object(ui, 'SCATTER_RESOLUTION', (5, 5)), \
+                patch.object(ui, 'go') as mock_go:
+            ui.create_scatter_figure(data, 'km', 'price_usd', 'year', {}, 'Autos', x_range=(0, 9000))
+
+        trace = mock_go.Scattergl.call_args.kwargs
+        assert trace['customdata'].sum() == 10
+        assert data['km'].iloc[1] == '1.000 km'
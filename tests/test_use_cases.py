@@ -1,6 +1,8 @@
 """Tests for application use cases and services."""
+import os
+
 import pytest
-from unittest.mock import Mock, patch, call
+from unittest.mock import Mock, MagicMock, patch, call, ANY
 
 
 class TestSearchProductsUseCase:
@@ -45,6 +47,20 @@ class TestSearchProductsUseCase:
 
         mock_exporter.export.assert_not_called()
 
+    def test_execute_saves_to_store_when_provided(self):
+        from application.use_cases.search_products import SearchProductsUseCase
+
+        mock_scraper = Mock()
+        mock_scraper.scrape_product_list.return_value = [{'title': 'P1', 'item_id': 'MLA1'}]
+        mock_store = Mock()
+
+        use_case = SearchProductsUseCase(scraper=mock_scraper, store=mock_store)
+        use_case.execute('ar', 'notebook', 50)
+
+        mock_store.save_listings.assert_called_once_with(
+            [{'title': 'P1', 'item_id': 'MLA1'}], 'notebook', 'ar'
+        )
+
     def test_execute_works_without_exporter(self):
         from application.use_cases.search_products import SearchProductsUseCase
 
@@ -57,6 +73,19 @@ class TestSearchProductsUseCase:
         assert len(result) == 1
 
 
+    def test_execute_passes_filters_to_scraper(self):
+        from application.use_cases.search_products import SearchProductsUseCase
+        from domain import SearchFilters, ItemCondition
+
+        mock_scraper = Mock()
+        mock_scraper.scrape_product_list.return_value = []
+        filters = SearchFilters(max_price=500000, condition=ItemCondition.NEW)
+
+        SearchProductsUseCase(scraper=mock_scraper).execute('ar', 'notebook', 50, filters=filters)
+
+        mock_scraper.scrape_product_list.assert_called_once_with('ar', 'notebook', 50, filters=filters)
+
+
 class TestGetProductDetailsUseCase:
     """Tests for GetProductDetailsUseCase."""
 
@@ -85,6 +114,31 @@ class TestGetProductDetailsUseCase:
 
         assert len(results) == 2
 
+    def test_execute_threaded_keeps_url_order(self):
+        import time
+        from application.use_cases.get_product_details import GetProductDetailsUseCase
+
+        mock_scraper = Mock()
+        mock_scraper.get_page_content.side_effect = lambda url, timeout: time.sleep(0.05 if url == 'slow' else 0) or url
+        mock_scraper.scrape_product_details.side_effect = lambda soup: {'title': soup}
+
+        results = GetProductDetailsUseCase(scraper=mock_scraper).execute(['slow', 'fast'], threaded=True)
+
+        assert [r['title'] for r in results] == ['slow', 'fast']
+
+    def test_execute_saves_details_to_store(self):
+        from application.use_cases.get_product_details import GetProductDetailsUseCase
+
+        mock_scraper = Mock()
+        mock_scraper.get_page_content.return_value = Mock()
+        mock_scraper.scrape_product_details.return_value = {'title': 'Detail'}
+        mock_store = Mock()
+
+        use_case = GetProductDetailsUseCase(scraper=mock_scraper, store=mock_store)
+        use_case.execute(['url1'], threaded=False)
+
+        mock_store.save_details.assert_called_once_with([{'title': 'Detail'}])
+
     def test_execute_skips_none_soups(self):
         from application.use_cases.get_product_details import GetProductDetailsUseCase
 
@@ -98,9 +152,578 @@ class TestGetProductDetailsUseCase:
         assert len(results) == 1
 
 
+    def test_threaded_failure_keeps_checkpoint(self):
+        from application.use_cases.get_product_details import GetProductDetailsUseCase
+
+        def _details(soup):
+            if soup.url == 'bad':
+                raise RuntimeError('boom')
+            return {'title': 'ok'}
+
+        mock_scraper = Mock()
+        mock_scraper.get_page_content.side_effect = lambda url, **kw: Mock(url=url)
+        mock_scraper.scrape_product_details.side_effect = _details
+        mock_checkpoints = Mock()
+        mock_checkpoints.open.return_value.completed_details.return_value = {}
+
+        use_case = GetProductDetailsUseCase(scraper=mock_scraper, checkpoints=mock_checkpoints)
+        results = use_case.execute(['ok', 'bad'], threaded=True, job_id='job-1')
+
+        assert results == [{'title': 'ok'}]
+        assert results.complete is False
+        mock_checkpoints.discard.assert_not_called()
+
+class TestSearchStreaming:
+    """Tests for SearchProductsUseCase.stream and astream."""
+
+    def _scraper(self, pages):
+        mock_scraper = Mock()
+        mock_scraper.iter_product_pages.side_effect = lambda *args, **kwargs: iter(pages)
+        return mock_scraper
+
+    def test_stream_yields_pages_and_persists_each(self):
+        from application.use_cases.search_products import SearchProductsUseCase
+
+        pages = [[{'title': 'P1'}], [{'title': 'P2'}]]
+        mock_store = Mock()
+        mock_exporter = Mock(spec=['export'])
+        use_case = SearchProductsUseCase(scraper=self._scraper(pages), exporter=mock_exporter, store=mock_store)
+
+        assert list(use_case.stream('ar', 'notebook', 50)) == pages
+        assert mock_store.save_listings.call_count == 2
+        mock_exporter.export.assert_called_once_with([{'title': 'P1'}, {'title': 'P2'}], 'notebook')
+
+    def test_stream_uses_streaming_exporter(self):
+        from application.use_cases.search_products import SearchProductsUseCase
+
+        pages = [[{'title': 'P1'}], [{'title': 'P2'}]]
+        mock_exporter = Mock()
+        mock_exporter.export_stream.side_effect = lambda batches, name: batches
+        use_case = SearchProductsUseCase(scraper=self._scraper(pages), exporter=mock_exporter)
+
+        assert list(use_case.stream('ar', 'notebook', 50)) == pages
+        mock_exporter.export.assert_not_called()
+
+    def test_stream_fills_caller_stats(self):
+        from application.use_cases.search_products import SearchProductsUseCase
+        from domain.entities import ScrapeStats
+        from domain.value_objects import Deadline
+
+        mock_scraper = Mock()
+
+        def pages(*args, stats, **kwargs):
+            stats.timed_out = True
+            yield [{'title': 'P1'}]
+
+        mock_scraper.iter_product_pages.side_effect = pages
+        stats = ScrapeStats()
+        use_case = SearchProductsUseCase(scraper=mock_scraper)
+
+        list(use_case.stream('ar', 'notebook', 50, deadline=Deadline.after(5), stats=stats))
+
+        assert stats.timed_out is True
+
+    def test_stream_is_lazy(self):
+        from application.use_cases.search_products import SearchProductsUseCase
+
+        use_case = SearchProductsUseCase(scraper=self._scraper([[{'title': 'P1'}]]))
+        use_case.stream('ar', 'notebook', 50)
+
+        use_case.scraper.iter_product_pages.assert_not_called()
+
+    def test_astream_yields_all_pages(self):
+        import asyncio
+        from application.use_cases.search_products import SearchProductsUseCase
+
+        pages = [[{'title': f'P{i}'}] for i in range(5)]
+        use_case = SearchProductsUseCase(scraper=self._scraper(pages))
+
+        async def _collect():
+            return [batch async for batch in use_case.astream('ar', 'notebook', 50, max_buffered_pages=1)]
+
+        assert asyncio.run(_collect()) == pages
+
+    def test_astream_applies_backpressure_and_stops_on_close(self):
+        import asyncio
+        from application.use_cases.search_products import SearchProductsUseCase
+
+        produced = []
+
+        def _pages(*args, **kwargs):
+            for i in range(100):
+                produced.append(i)
+                yield [{'title': f'P{i}'}]
+
+        mock_scraper = Mock()
+        mock_scraper.iter_product_pages.side_effect = _pages
+        use_case = SearchProductsUseCase(scraper=mock_scraper)
+
+        async def _take_one():
+            stream = use_case.astream('ar', 'notebook', 50, max_buffered_pages=1)
+            first = await stream.__anext__()
+            await asyncio.sleep(0.05)
+            await stream.aclose()
+            return first
+
+        assert asyncio.run(_take_one()) == [{'title': 'P0'}]
+        assert len(produced) <= 4
+
+    def test_astream_propagates_errors(self):
+        import asyncio
+        from application.use_cases.search_products import SearchProductsUseCase
+
+        def _pages(*args, **kwargs):
+            yield [{'title': 'P1'}]
+            raise Exception('boom')
+
+        mock_scraper = Mock()
+        mock_scraper.iter_product_pages.side_effect = _pages
+        use_case = SearchProductsUseCase(scraper=mock_scraper)
+
+        async def _collect():
+            return [batch async for batch in use_case.astream('ar', 'notebook', 50)]
+
+        with pytest.raises(Exception, match='boom'):
+            asyncio.run(_collect())
+
+
+class TestTopK:
+    """Tests for SearchProductsUseCase.execute_top_k."""
+
+    def _use_case(self, pages):
+        from application.use_cases.search_products import SearchProductsUseCase
+
+        consumed = []
+
+        def _pages(*args, **kwargs):
+            for page in pages:
+                consumed.append(page)
+                yield page
+
+        mock_scraper = Mock()
+        mock_scraper.iter_product_pages.side_effect = _pages
+        return SearchProductsUseCase(scraper=mock_scraper), mock_scraper, consumed
+
+    def _page(self, *prices):
+        return [{'title': f'P{price}', 'price': str(price)} for price in prices]
+
+    def test_dollar_prices_are_ranked_in_pesos(self):
+        from application.use_cases.search_products import SearchProductsUseCase
+
+        page = [
+            {'title': 'ars', 'price': '9.000.000', 'currency': '$'},
+            {'title': 'usd', 'price': '15.000', 'currency': 'U$S'},
+        ]
+        exchange_rate = Mock()
+        exchange_rate.get_usd_to_ars_rate.return_value = 1000.0
+        mock_scraper = Mock()
+        mock_scraper.iter_product_pages.side_effect = lambda *args, **kwargs: (p for p in [page])
+        use_case = SearchProductsUseCase(scraper=mock_scraper, exchange_rate=exchange_rate)
+
+        results = use_case.execute_top_k('ar', 'auto', 2)
+
+        assert [r['title'] for r in results] == ['ars', 'usd']
+
+    def test_mixed_currencies_without_rate_rank_majority_currency(self):
+        page = [
+            {'title': 'a', 'price': '300', 'currency': '$'},
+            {'title': 'b', 'price': '5', 'currency': 'U$S'},
+            {'title': 'c', 'price': '100', 'currency': '$'},
+        ]
+        use_case, _, _ = self._use_case([page])
+
+        results = use_case.execute_top_k('uy', 'auto', 3)
+
+        assert [r['title'] for r in results] == ['c', 'a']
+
+    def test_failing_exchange_rate_ranks_majority_currency(self):
+        from application.use_cases.search_products import SearchProductsUseCase
+
+        pages = [[
+            {'title': 'usd', 'price': '15.000', 'currency': 'U$S'},
+            {'title': 'usd2', 'price': '12.000', 'currency': 'U$S'},
+            {'title': 'ars', 'price': '9.000.000', 'currency': '$'},
+        ]]
+        exchange_rate = Mock()
+        exchange_rate.get_usd_to_ars_rate.return_value = None
+        mock_scraper = Mock()
+        mock_scraper.iter_product_pages.side_effect = lambda *args, **kwargs: (p for p in pages)
+        use_case = SearchProductsUseCase(scraper=mock_scraper, exchange_rate=exchange_rate)
+
+        results = use_case.execute_top_k('ar', 'auto', 2)
+
+        assert [r['title'] for r in results] == ['usd2', 'usd']
+
+    def test_cheapest_stops_once_page_tail_cannot_improve(self):
+        from domain import SortOrder
+
+        pages = [self._page(10, 20, 30), self._page(40, 50, 60), self._page(70)]
+        use_case, mock_scraper, consumed = self._use_case(pages)
+
+        results = use_case.execute_top_k('ar', 'gol', 2)
+
+        assert [r['price'] for r in results] == ['10', '20']
+        assert len(consumed) == 1
+        assert mock_scraper.iter_product_pages.call_args.kwargs['sort'] == SortOrder.PRICE_ASC
+
+    def test_out_of_order_listing_is_ranked(self):
+        pages = [self._page(50, 10, 20), self._page(5, 60), self._page(70, 80)]
+        use_case, _, consumed = self._use_case(pages)
+
+        results = use_case.execute_top_k('ar', 'gol', 2)
+
+        assert [r['price'] for r in results] == ['5', '10']
+        assert len(consumed) == 2
+
+    def test_most_expensive_with_predicate(self):
+        from domain import SortOrder
+
+        pages = [self._page(90, 80, 70, 60)]
+        use_case, _, _ = self._use_case(pages)
+
+        results = use_case.execute_top_k(
+            'ar', 'gol', 2, order=SortOrder.PRICE_DESC, predicate=lambda item: item['price'] != '80',
+        )
+
+        assert [r['price'] for r in results] == ['90', '70']
+
+    def test_newest_stops_after_k_items(self):
+        from domain import SortOrder
+
+        pages = [self._page(3, 1, 2), self._page(4)]
+        use_case, _, consumed = self._use_case(pages)
+
+        results = use_case.execute_top_k('ar', 'gol', 2, order=SortOrder.NEWEST)
+
+        assert [r['price'] for r in results] == ['3', '1']
+        assert len(consumed) == 1
+
+
+class TestDeadlines:
+    """Tests for deadline propagation in the use cases."""
+
+    def test_search_returns_partial_result_and_keeps_checkpoint(self):
+        from application.use_cases.search_products import SearchProductsUseCase
+        from domain import Deadline
+
+        def _scrape(domain, name, limit, checkpoint=None, deadline=None, stats=None):
+            stats.timed_out = True
+            return [{'title': 'P1'}]
+
+        mock_scraper = Mock()
+        mock_scraper.scrape_product_list.side_effect = _scrape
+        mock_checkpoints = Mock()
+        use_case = SearchProductsUseCase(scraper=mock_scraper, checkpoints=mock_checkpoints)
+
+        result = use_case.execute('ar', 'gol', 50, job_id='job-1', deadline=Deadline.after(3))
+
+        assert result == [{'title': 'P1'}]
+        assert result.complete is False
+        mock_checkpoints.discard.assert_not_called()
+
+    def test_search_without_deadline_is_complete(self):
+        from application.use_cases.search_products import SearchProductsUseCase
+
+        mock_scraper = Mock()
+        mock_scraper.scrape_product_list.return_value = [{'title': 'P1'}]
+
+        assert SearchProductsUseCase(scraper=mock_scraper).execute('ar', 'gol', 50).complete is True
+
+    def test_sequential_details_stop_at_deadline(self):
+        from application.use_cases.get_product_details import GetProductDetailsUseCase
+
+        deadline = Mock()
+        deadline.expired.side_effect = [False, False, True]
+        deadline.remaining.return_value = 2.0
+        mock_scraper = Mock()
+        mock_scraper.scrape_product_details.return_value = {'title': 'Detail'}
+
+        result = GetProductDetailsUseCase(scraper=mock_scraper).execute(['u1', 'u2'], threaded=False, deadline=deadline)
+
+        assert result == [{'title': 'Detail'}]
+        assert result.complete is False
+        mock_scraper.get_page_content.assert_called_once_with('u1', timeout=2.0)
+
+    def test_threaded_details_abandon_slow_fetches(self):
+        import time
+        from application.use_cases.get_product_details import GetProductDetailsUseCase
+        from domain import Deadline
+
+        def _get(url, timeout=None):
+            if url == 'slow':
+                time.sleep(0.5)
+            return url
+
+        mock_scraper = Mock()
+        mock_scraper.get_page_content.side_effect = _get
+        mock_scraper.scrape_product_details.side_effect = lambda soup: {'url': soup}
+
+        start = time.monotonic()
+        result = GetProductDetailsUseCase(scraper=mock_scraper).execute(['fast', 'slow'], deadline=Deadline.after(0.1))
+
+        assert time.monotonic() - start < 0.4
+        assert result == [{'url': 'fast'}]
+        assert result.complete is False
+
+
+class TestEstimatePriceDistribution:
+    """Tests for EstimatePriceDistributionUseCase."""
+
+    def _use_case(self, pages, total=1000):
+        from application.use_cases.estimate_price_distribution import EstimatePriceDistributionUseCase
+
+        mock_scraper = Mock()
+        mock_scraper.sample_product_pages.return_value = (total, 20, pages)
+        return EstimatePriceDistributionUseCase(scraper=mock_scraper, bootstrap_rounds=200), mock_scraper
+
+    def test_estimates_with_confidence_intervals(self):
+        pages = [[{'price': str(p)} for p in range(start, start + 50)] for start in (100, 120, 140, 160)]
+        use_case, mock_scraper = self._use_case(pages)
+
+        result = use_case.execute('ar', 'gol', sample_pages=4, seed=1)
+
+        mock_scraper.sample_product_pages.assert_called_once_with('ar', 'gol', 4, filters=None, seed=1)
+        assert result.sample_size == 200
+        assert result.mean.value == pytest.approx(154.5)
+        assert result.mean.low <= result.mean.value <= result.mean.high
+        assert result.quantiles[0.5].low <= result.quantiles[0.5].value <= result.quantiles[0.5].high
+        assert sum(bin_['share'].value for bin_ in result.histogram) == pytest.approx(1.0)
+        assert result.to_dict()['total_results'] == 1000
+
+    def test_single_page_bootstraps_listings(self):
+        use_case, _ = self._use_case([[{'price': '10'}, {'price': '20'}, {'price': '30'}, {'price': None}]])
+
+        result = use_case.execute('ar', 'gol', seed=1)
+
+        assert result.sample_size == 3
+        assert result.mean.low < result.mean.high
+
+    def test_returns_none_without_prices(self):
+        use_case, _ = self._use_case([[{'price': None}]])
+
+        assert use_case.execute('ar', 'gol') is None
+
+    def test_converts_dollar_prices_with_rate(self):
+        pages = [[{'price': '1000', 'currency': '$'}, {'price': '2', 'currency': 'US$'}]]
+        use_case, _ = self._use_case(pages)
+        use_case.exchange_rate = Mock(get_usd_to_ars_rate=Mock(return_value=1000.0))
+
+        result = use_case.execute('ar', 'gol', seed=1)
+
+        assert result.currency == 'local'
+        assert result.sample_size == 2
+        assert result.mean.value == pytest.approx(1500.0)
+
+    def test_keeps_majority_currency_without_rate(self):
+        pages = [
+            [{'price': '20000', 'currency': 'US$'}, {'price': '30000', 'currency': 'US$'}],
+            [{'price': '9000000', 'currency': '$'}, {'price': '25000', 'currency': 'US$'}],
+        ]
+        use_case, _ = self._use_case(pages)
+
+        result = use_case.execute('mx', 'gol', seed=1)
+
+        assert result.currency == 'USD'
+        assert result.sample_size == 3
+        assert result.mean.value == pytest.approx(25000.0)
+        assert result.to_dict()['currency'] == 'USD'
+
+
+class TestCheckpointedExecution:
+    """Tests for job_id checkpointing in the use cases."""
+
+    def test_search_passes_checkpoint_and_discards_on_success(self):
+        from application.use_cases.search_products import SearchProductsUseCase
+
+        mock_scraper = Mock()
+        mock_scraper.scrape_product_list.return_value = [{'title': 'P1'}]
+        mock_checkpoints = Mock()
+
+        use_case = SearchProductsUseCase(scraper=mock_scraper, checkpoints=mock_checkpoints)
+        use_case.execute('ar', 'notebook', 50, job_id='job-1')
+
+        mock_checkpoints.open.assert_called_once_with('job-1')
+        mock_scraper.scrape_product_list.assert_called_once_with(
+            'ar', 'notebook', 50, checkpoint=mock_checkpoints.open.return_value
+        )
+        mock_checkpoints.discard.assert_called_once_with('job-1')
+
+    def test_search_keeps_checkpoint_on_failure(self):
+        from application.use_cases.search_products import SearchProductsUseCase
+
+        mock_scraper = Mock()
+        mock_scraper.scrape_product_list.side_effect = Exception('boom')
+        mock_checkpoints = Mock()
+
+        use_case = SearchProductsUseCase(scraper=mock_scraper, checkpoints=mock_checkpoints)
+        with pytest.raises(Exception):
+            use_case.execute('ar', 'notebook', 50, job_id='job-1')
+
+        mock_checkpoints.discard.assert_not_called()
+
+    def test_details_resume_skips_fetched_urls(self, tmp_path):
+        from application.use_cases.get_product_details import GetProductDetailsUseCase
+        from infrastructure.adapters.jsonl_checkpoint import JsonlCheckpointStore
+
+        checkpoints = JsonlCheckpointStore(str(tmp_path))
+        mock_scraper = Mock()
+        mock_scraper.get_page_content.side_effect = ['soup1', Exception('network down')]
+        mock_scraper.scrape_product_details.side_effect = lambda soup: {'title': soup}
+        use_case = GetProductDetailsUseCase(scraper=mock_scraper, checkpoints=checkpoints)
+
+        with pytest.raises(Exception):
+            use_case.execute(['url1', 'url2'], threaded=False, job_id='details-1')
+
+        mock_scraper.get_page_content.side_effect = ['soup2']
+        results = use_case.execute(['url1', 'url2'], threaded=False, job_id='details-1')
+
+        assert results == [{'title': 'soup1'}, {'title': 'soup2'}]
+        assert mock_scraper.get_page_content.call_args.args == ('url2',)
+        assert os.listdir(tmp_path) == []
+
+
+class TestIncrementalDetails:
+    """Tests for GetProductDetailsUseCase.execute_incremental."""
+
+    def _listing(self, item_id, price='100', title='Gol'):
+        return {'item_id': item_id, 'price': price, 'title': title, 'post_link': f'https://x/{item_id}'}
+
+    def _make_use_case(self, snapshots):
+        from application.use_cases.get_product_details import GetProductDetailsUseCase
+
+        mock_scraper = Mock()
+        mock_scraper.get_page_content.side_effect = lambda url, timeout: url
+        mock_scraper.scrape_product_details.side_effect = lambda url: {'title': 'Fresh', 'url': url}
+        return GetProductDetailsUseCase(scraper=mock_scraper, snapshots=snapshots), mock_scraper
+
+    def test_reuses_unchanged_and_fetches_changed(self):
+        from application.use_cases.get_product_details import listing_fingerprint
+
+        unchanged = self._listing('MLA1')
+        changed = self._listing('MLA2', price='200')
+        new = self._listing('MLA3')
+        snapshots = Mock()
+        snapshots.load_snapshots.return_value = {
+            'MLA1': {'fingerprint': listing_fingerprint(unchanged), 'detail': {'title': 'Stored'}},
+            'MLA2': {'fingerprint': listing_fingerprint(self._listing('MLA2')), 'detail': {'title': 'Old'}},
+        }
+        use_case, mock_scraper = self._make_use_case(snapshots)
+
+        results = use_case.execute_incremental([unchanged, changed, new], threaded=False)
+
+        assert [r['title'] for r in results] == ['Stored', 'Fresh', 'Fresh']
+        fetched = [c.args[0] for c in mock_scraper.get_page_content.call_args_list]
+        assert fetched == ['https://x/MLA2', 'https://x/MLA3']
+        saved = snapshots.save_snapshots.call_args.args[0]
+        assert set(saved) == {'MLA2', 'MLA3'}
+        assert saved['MLA2']['fingerprint'] == listing_fingerprint(changed)
+
+    def test_fetches_everything_without_snapshot_store(self):
+        use_case, mock_scraper = self._make_use_case(snapshots=None)
+
+        results = use_case.execute_incremental([self._listing('MLA1'), self._listing('MLA2')], threaded=False)
+
+        assert len(results) == 2
+        assert mock_scraper.get_page_content.call_count == 2
+
+    def test_on_detail_receives_each_detail(self):
+        from application.use_cases.get_product_details import listing_fingerprint
+
+        unchanged = self._listing('MLA1')
+        snapshots = Mock()
+        snapshots.load_snapshots.return_value = {
+            'MLA1': {'fingerprint': listing_fingerprint(unchanged), 'detail': {'title': 'Stored'}},
+        }
+        use_case, _ = self._make_use_case(snapshots)
+        received = []
+
+        for threaded in (False, True):
+            received.clear()
+            use_case.execute_incremental([unchanged, self._listing('MLA2')], threaded=threaded, on_detail=received.append)
+
+            assert received[0] == {'title': 'Stored'}
+            assert received[1:] == [{'title': 'Fresh', 'url': 'https://x/MLA2'}]
+
+    def test_listings_with_card_fields_skip_detail_fetch(self):
+        from application.use_cases.get_product_details import GetProductDetailsUseCase, CATEGORY_FIELDS
+
+        mock_scraper = Mock()
+        mock_scraper.get_page_content.return_value = 'soup'
+        mock_scraper.scrape_product_details.return_value = {'title': 'Fetched'}
+        listings = [
+            {'title': 'Gol', 'price': '15000', 'currency': 'U$S', 'post_link': 'https://x/1', 'item_id': 'MLA1',
+             'category': 'car', 'year': '2018', 'km': '85.000 km'},
+            {'title': 'Onix', 'price': '9000000', 'post_link': 'https://x/2', 'category': 'car', 'year': '2020'},
+            {'title': 'Notebook', 'price': '500000', 'post_link': 'https://x/3'},
+        ]
+
+        results = GetProductDetailsUseCase(scraper=mock_scraper).execute_incremental(
+            listings, threaded=False, required_fields=CATEGORY_FIELDS,
+        )
+
+        assert results[0] == {
+            'title': 'Gol', 'price': 'U$S 15.000', 'publication_date': None, 'author': None,
+            'link': '[Link](https://x/1)', 'shipping': None, 'category': 'car', 'item_id': 'MLA1',
+            'year': '2018', 'km': '85.000 km',
+        }
+        assert results[1:] == [{'title': 'Fetched'}, {'title': 'Fetched'}]
+        assert [c.args[0] for c in mock_scraper.get_page_content.call_args_list] == ['https://x/2', 'https://x/3']
+
+    def test_detail_from_card_uses_site_thousands_separator(self):
+        from application.use_cases.get_product_details import detail_from_listing
+
+        listing = {'title': 'Jetta', 'price': '185,000', 'currency': '$', 'item_id': 'MLM1',
+                   'category': 'car', 'year': '2019', 'km': '85,000 km'}
+
+        assert detail_from_listing(listing, ('year', 'km'))['price'] == '$ 185,000'
+        assert detail_from_listing({**listing, 'item_id': 'MLA1', 'price': '185000'}, ())['price'] == '$ 185.000'
+        assert detail_from_listing({**listing, 'item_id': None}, (), domain='pe')['price'] == '$ 185,000'
+
+    def test_details_built_from_cards_are_persisted(self):
+        from application.use_cases.get_product_details import GetProductDetailsUseCase, CATEGORY_FIELDS
+
+        listing = {'title': 'Depto', 'price': '90000', 'post_link': 'https://x/1', 'item_id': 'MLA1',
+                   'category': 'property', 'm2': '60 m²'}
+        mock_store = Mock()
+        snapshots = Mock()
+        snapshots.load_snapshots.return_value = {}
+        use_case = GetProductDetailsUseCase(scraper=Mock(), store=mock_store, snapshots=snapshots)
+
+        results = use_case.execute_incremental([listing], threaded=False, required_fields=CATEGORY_FIELDS)
+
+        mock_store.save_details.assert_called_once_with(list(results))
+        saved = snapshots.save_snapshots.call_args.args[0]
+        assert saved['MLA1']['detail'] == results[0]
+        assert results[0]['m2'] == '60 m²'
+        assert results[0]['author'] is None
+
+        snapshots.load_snapshots.return_value = saved
+        mock_store.save_details.reset_mock()
+        use_case.execute_incremental([listing], threaded=False, required_fields=CATEGORY_FIELDS)
+
+        mock_store.save_details.assert_not_called()
+
+    def test_fingerprint_ignores_price_formatting(self):
+        from application.use_cases.get_product_details import listing_fingerprint
+
+        raw = {'title': 'Gol', 'price': '150000'}
+        formatted = {'title': 'Gol', 'price': '$150.000,00'}
+        assert listing_fingerprint(raw) == listing_fingerprint(formatted)
+        assert listing_fingerprint(raw) != listing_fingerprint({'title': 'Gol GTI', 'price': '150000'})
+
+
 class TestPriceConversionService:
     """Tests for PriceConversionService."""
 
+    def test_currency_code_depends_on_site(self):
+        from application.services.price_conversion import currency_code
+
+        assert currency_code({'price': '$ 9.000.000'}, 'ar') == 'ARS'
+        assert currency_code({'price': '$ 15,000'}, 'mx') == 'MXN'
+        assert currency_code({'price': '15000', 'currency': 'U$S'}, 'uy') == 'USD'
+        assert currency_code({'price': '$ 15,000', 'item_id': 'MCO1'}) == 'COP'
+        assert currency_code({'price': None}, 'ar') is None
+
     def test_convert_ars_prices(self):
         from application.services.price_conversion import PriceConversionService
 
@@ -153,6 +776,457 @@ class TestPriceConversionService:
         assert service.get_exchange_rate() == 1200.0
 
 
+class TestBatchRunner:
+    """Tests for BatchRunner scheduling."""
+
+    def _runner(self, execute, **kwargs):
+        from application.services.batch_runner import BatchRunner
+
+        search = Mock()
+        search.execute.side_effect = execute
+        return BatchRunner(lambda country: search, **kwargs), search
+
+    def test_runs_every_job_with_its_job_id(self):
+        from application.services.batch_runner import BatchJob
+
+        runner, search = self._runner(lambda country, query, limit, job_id: [{}] * limit)
+        jobs = [BatchJob('notebook', 'ar', 3), BatchJob('celular', 'mx', 2)]
+
+        results = runner.run(jobs)
+
+        assert sorted((r.job.query, r.results) for r in results) == [('celular', 2), ('notebook', 3)]
+        search.execute.assert_any_call('ar', 'notebook', 3, job_id='batch-ar-notebook-3')
+
+    def test_failed_job_does_not_stop_batch(self):
+        from application.services.batch_runner import BatchJob
+
+        def execute(country, query, limit, job_id):
+            if query == 'roto':
+                raise RuntimeError('boom')
+            return [{}]
+
+        runner, _ = self._runner(execute)
+        results = runner.run([BatchJob('roto', 'ar'), BatchJob('notebook', 'ar')])
+
+        errors = {r.job.query: r.error for r in results}
+        assert errors == {'roto': 'boom', 'notebook': None}
+
+    def test_priority_order_with_single_worker(self):
+        from application.services.batch_runner import BatchJob
+
+        order = []
+        runner, _ = self._runner(lambda country, query, limit, job_id: order.append(query) or [], max_concurrency=1)
+        runner.run([BatchJob('low', 'ar', priority=0), BatchJob('high', 'ar', priority=5), BatchJob('mid', 'ar', priority=2)])
+
+        assert order == ['high', 'mid', 'low']
+
+    def test_round_robin_across_hosts_on_equal_priority(self):
+        from application.services.batch_runner import BatchJob
+
+        order = []
+        runner, _ = self._runner(lambda country, query, limit, job_id: order.append(country) or [], max_concurrency=1)
+        runner.run([BatchJob(f'q{i}', 'ar') for i in range(3)] + [BatchJob('q', 'mx'), BatchJob('q', 'br')])
+
+        assert order[:3] == ['ar', 'mx', 'br']
+
+    def test_respects_per_host_and_global_limits(self):
+        import threading
+        import time
+        from application.services.batch_runner import BatchJob
+
+        lock = threading.Lock()
+        active = {'total': 0, 'ar': 0}
+        peaks = {'total': 0, 'ar': 0}
+
+        def execute(country, query, limit, job_id):
+            with lock:
+                active['total'] += 1
+                active[country] = active.get(country, 0) + 1
+                peaks['total'] = max(peaks['total'], active['total'])
+                peaks['ar'] = max(peaks['ar'], active.get('ar', 0))
+            time.sleep(0.02)
+            with lock:
+                active['total'] -= 1
+                active[country] -= 1
+            return []
+
+        runner, _ = self._runner(execute, max_concurrency=3, max_per_host=2)
+        runner.run([BatchJob(f'q{i}', country) for i in range(4) for country in ('ar', 'mx', 'br')])
+
+        assert peaks['ar'] <= 2
+        assert peaks['total'] <= 3
+
+    def test_duplicate_jobs_run_once_at_highest_priority(self):
+        from application.services.batch_runner import BatchJob
+
+        order = []
+        runner, _ = self._runner(lambda country, query, limit, job_id: order.append(query) or [], max_concurrency=1)
+        results = runner.run([
+            BatchJob('notebook', 'ar'), BatchJob('celular', 'ar', priority=1), BatchJob('notebook', 'ar', priority=5),
+        ])
+
+        assert order == ['notebook', 'celular']
+        assert len(results) == 2
+
+    def test_try_acquire_respects_per_host_and_global_limits(self):
+        runner, _ = self._runner(lambda *args, **kwargs: [], max_concurrency=3, max_per_host=2)
+
+        assert runner.try_acquire('ar') and runner.try_acquire('ar')
+        assert not runner.try_acquire('ar')
+        assert runner.try_acquire('mx')
+        assert not runner.try_acquire('br')
+
+        runner.release('ar')
+        assert runner.try_acquire('br')
+
+    def test_load_batch_jobs(self, tmp_path):
+        from batch_scraper import load_batch_jobs
+        from application.services.batch_runner import BatchJob
+
+        path = tmp_path / 'jobs.csv'
+        path.write_text("query,country,limit,priority\nnotebook,AR,200,1\ncelular,mx,,\n,ar,10,\n", encoding='utf-8')
+
+        assert load_batch_jobs(str(path)) == [
+            BatchJob('notebook', 'ar', 200, 1),
+            BatchJob('celular', 'mx', 100, 0),
+        ]
+
+
+class TestJobManager:
+    """Tests for JobManager."""
+
+    def _wait(self, manager, job_id):
+        import time
+        for _ in range(200):
+            job = manager.get(job_id)
+            if job.finished:
+                return job
+            time.sleep(0.01)
+        raise AssertionError('job did not finish')
+
+    def test_submit_returns_before_job_finishes(self):
+        import threading
+        from application.services.job_manager import JobManager
+        from domain.enums import JobStatus
+
+        release = threading.Event()
+        published = threading.Event()
+        manager = JobManager(max_workers=1)
+
+        def work(job):
+            job.publish([{'title': 'A'}])
+            published.set()
+            release.wait(5)
+            job.publish([{'title': 'B'}])
+
+        job_id = manager.submit(work)
+        assert published.wait(5)
+        running = manager.get(job_id)
+        release.set()
+        done = self._wait(manager, job_id)
+        manager.shutdown()
+
+        assert running.status == JobStatus.RUNNING
+        assert running.results == [{'title': 'A'}]
+        assert done.status == JobStatus.DONE
+        assert done.results == [{'title': 'A'}, {'title': 'B'}]
+
+    def test_return_value_is_final_result(self):
+        from application.services.job_manager import JobManager
+        from domain.entities import PartialResult
+
+        manager = JobManager()
+        job_id = manager.submit(lambda job: PartialResult([{'title': 'A'}], complete=False))
+        job = self._wait(manager, job_id)
+        manager.shutdown()
+
+        assert job.results == [{'title': 'A'}]
+        assert job.complete is False
+
+    def test_failed_job_reports_error(self):
+        from application.services.job_manager import JobManager
+        from domain.enums import JobStatus
+
+        def work(job):
+            raise RuntimeError('sin conexión')
+
+        manager = JobManager()
+        job = self._wait(manager, manager.submit(work))
+        manager.shutdown()
+
+        assert job.status == JobStatus.FAILED
+        assert job.error == 'sin conexión'
+
+    def test_unknown_job(self):
+        from application.services.job_manager import JobManager
+
+        assert JobManager().get('nope') is None
+
+    def test_old_finished_jobs_are_evicted(self):
+        from application.services.job_manager import JobManager
+
+        manager = JobManager(max_workers=1, max_finished=2)
+        job_ids = [manager.submit(lambda job: [], job_id=f'job-{i}') for i in range(4)]
+        manager.shutdown()
+
+        assert [manager.get(job_id) is not None for job_id in job_ids] == [False, False, True, True]
+
+    def test_job_id_in_use_is_replaced(self):
+        import threading
+        from application.services.job_manager import JobManager
+
+        release = threading.Event()
+        manager = JobManager(max_workers=2)
+        first = manager.submit(lambda job: release.wait(5) and [], job_id='same')
+        second = manager.submit(lambda job: [], job_id='same')
+        release.set()
+        manager.shutdown()
+
+        assert first == 'same'
+        assert second != 'same'
+
+
+class TestSearchResultCache:
+    """Tests for SearchResultCache."""
+
+    def _cache(self, **kwargs):
+        from application.services.search_cache import SearchResultCache
+
+        now = [0.0]
+        search = Mock()
+        search.execute.side_effect = lambda domain, query, limit, **kw: [{'title': query}]
+        return SearchResultCache(search, clock=lambda: now[0], **kwargs), search, now
+
+    def test_normalize_query(self):
+        from application.services.search_cache import normalize_query
+
+        assert normalize_query('  Gol   TREND ') == 'gol trend'
+        assert normalize_query('Camión') == 'camion'
+
+    def test_repeated_search_is_served_from_cache(self):
+        cache, search, _ = self._cache()
+
+        first = cache.execute('ar', 'Gol Trend', 50)
+        second = cache.execute('AR', '  gol  trend', 50)
+
+        assert first == second == [{'title': 'Gol Trend'}]
+        assert search.execute.call_count == 1
+
+    def test_key_includes_limit_and_filters(self):
+        from domain.value_objects import SearchFilters
+
+        cache, search, _ = self._cache()
+        cache.execute('ar', 'gol', 50)
+        cache.execute('ar', 'gol', 100)
+        cache.execute('ar', 'gol', 50, filters=SearchFilters(max_price=100))
+        cache.execute('ar', 'gol', 50, filters=SearchFilters(max_price=100))
+
+        assert search.execute.call_count == 3
+
+    def test_entries_expire(self):
+        cache, search, now = self._cache(ttl=10)
+        cache.execute('ar', 'gol', 50)
+        now[0] = 11
+        cache.execute('ar', 'gol', 50)
+
+        assert search.execute.call_count == 2
+
+    def test_least_recently_used_is_evicted(self):
+        cache, search, _ = self._cache(max_entries=2)
+        for query in ('a', 'b', 'a', 'c', 'a', 'b'):
+            cache.execute('ar', query, 50)
+
+        assert [c.args[1] for c in search.execute.call_args_list] == ['a', 'b', 'c', 'b']
+
+    def test_concurrent_identical_searches_share_one_crawl(self):
+        import threading
+        from application.services.search_cache import SearchResultCache
+
+        started = threading.Event()
+        release = threading.Event()
+        search = Mock()
+
+        def slow_execute(domain, query, limit, **kwargs):
+            started.set()
+            release.wait(5)
+            return [{'title': query}]
+
+        search.execute.side_effect = slow_execute
+        cache = SearchResultCache(search)
+        results = []
+        leader = threading.Thread(target=lambda: results.append(cache.execute('ar', 'gol', 50)))
+        leader.start()
+        assert started.wait(5)
+        waiters = [threading.Thread(target=lambda: results.append(cache.execute('ar', 'Gol', 50))) for _ in range(3)]
+        for t in waiters:
+            t.start()
+        release.set()
+        for t in [leader] + waiters:
+            t.join(5)
+
+        assert search.execute.call_count == 1
+        assert results == [[{'title': 'gol'}]] * 4
+
+    def test_errors_are_not_cached(self):
+        cache, search, _ = self._cache()
+        search.execute.side_effect = [RuntimeError('caído'), [{'title': 'ok'}]]
+
+        with pytest.raises(RuntimeError):
+            cache.execute('ar', 'gol', 50)
+        assert cache.execute('ar', 'gol', 50) == [{'title': 'ok'}]
+
+    def test_partial_results_are_not_cached(self):
+        from domain.entities import PartialResult
+
+        cache, search, _ = self._cache()
+        search.execute.side_effect = [PartialResult([{'title': 'a'}], complete=False), [{'title': 'a'}, {'title': 'b'}]]
+
+        assert cache.execute('ar', 'gol', 50).complete is False
+        assert len(cache.execute('ar', 'gol', 50)) == 2
+        assert search.execute.call_count == 2
+
+    def test_stream_yields_pages_then_serves_cached_batch(self):
+        cache, search, _ = self._cache()
+        search.stream.return_value = iter([[{'title': 'a'}], [{'title': 'b'}]])
+
+        first = list(cache.stream('ar', 'gol', 50))
+        second = list(cache.stream('ar', 'gol', 50))
+
+        assert first == [[{'title': 'a'}], [{'title': 'b'}]]
+        assert second == [[{'title': 'a'}, {'title': 'b'}]]
+        assert search.stream.call_count == 1
+
+    def test_stream_completeness_comes_from_crawl_stats(self):
+        from domain.entities import ScrapeStats
+        from domain.value_objects import Deadline
+
+        cache, search, _ = self._cache()
+
+        def crawl(*args, stats, **kwargs):
+            stats.timed_out = kwargs['filters'] is not None
+            yield [{'title': 'a'}]
+
+        search.stream.side_effect = crawl
+        expired = Deadline.after(0)
+
+        finished = ScrapeStats()
+        list(cache.stream('ar', 'gol', 50, deadline=expired, stats=finished))
+        cut = ScrapeStats()
+        list(cache.stream('ar', 'gol', 50, filters=Mock(), deadline=expired, stats=cut))
+
+        assert finished.timed_out is False
+        assert cut.timed_out is True
+        assert list(cache.stream('ar', 'gol', 50)) == [[{'title': 'a'}]]
+        assert search.stream.call_count == 2
+
+
+class TestLazyDetailEnricher:
+    """Tests for LazyDetailEnricher."""
+
+    LISTINGS = [
+        {'item_id': 'MLA1', 'post_link': 'https://x/1', 'title': 'Gol'},
+        {'item_id': 'MLA2', 'post_link': 'https://x/2', 'title': 'Onix'},
+    ]
+
+    def _enricher(self, use_case):
+        from application.services.detail_enricher import LazyDetailEnricher
+        return LazyDetailEnricher(use_case, max_workers=2)
+
+    def test_enrich_fetches_each_listing_once(self):
+        use_case = Mock()
+        use_case.execute_incremental.side_effect = lambda listings, **kw: [{'title': listings[0]['title'] + ' detalle'}]
+        enricher = self._enricher(use_case)
+
+        first = enricher.enrich(self.LISTINGS)
+        second = enricher.enrich(self.LISTINGS)
+        enricher.shutdown()
+
+        assert first == second == [{'title': 'Gol detalle'}, {'title': 'Onix detalle'}]
+        assert use_case.execute_incremental.call_count == 2
+        assert enricher.cached(self.LISTINGS[1]) == {'title': 'Onix detalle'}
+
+    def test_enrich_returns_none_for_details_not_ready_by_deadline(self):
+        import threading
+        from domain.value_objects import Deadline
+
+        release = threading.Event()
+        use_case = Mock()
+        use_case.execute_incremental.side_effect = lambda listings, **kw: release.wait() and [{'title': 'late'}]
+        enricher = self._enricher(use_case)
+
+        details = enricher.enrich(self.LISTINGS[:1], deadline=Deadline.after(0.05))
+        release.set()
+        enricher.shutdown()
+
+        assert details == [None]
+        assert enricher.cached(self.LISTINGS[0]) == {'title': 'late'}
+
+    def test_prefetch_shares_in_flight_fetch_with_enrich(self):
+        import threading
+
+        release = threading.Event()
+        use_case = Mock()
+        use_case.execute_incremental.side_effect = lambda listings, **kw: release.wait() and [{'title': 'ok'}]
+        enricher = self._enricher(use_case)
+
+        enricher.prefetch(self.LISTINGS[:1])
+        release.set()
+        details = enricher.enrich(self.LISTINGS[:1])
+        enricher.shutdown()
+
+        assert details == [{'title': 'ok'}]
+        assert use_case.execute_incremental.call_count == 1
+
+    def test_failed_fetch_is_not_cached(self):
+        use_case = Mock()
+        use_case.execute_incremental.side_effect = [RuntimeError('boom'), [{'title': 'ok'}]]
+        enricher = self._enricher(use_case)
+
+        assert enricher.enrich(self.LISTINGS[:1]) == [None]
+        assert enricher.enrich(self.LISTINGS[:1]) == [{'title': 'ok'}]
+        enricher.shutdown()
+
+    def test_changed_listing_is_fetched_again(self):
+        use_case = Mock()
+        use_case.execute_incremental.side_effect = lambda listings, **kw: [{'price': listings[0].get('price')}]
+        enricher = self._enricher(use_case)
+        listing = {**self.LISTINGS[0], 'price': '100'}
+        repriced = {**listing, 'price': '90'}
+
+        enricher.enrich([listing])
+        assert enricher.cached(repriced) is None
+        assert enricher.enrich([repriced]) == [{'price': '90'}]
+        enricher.shutdown()
+
+        assert use_case.execute_incremental.call_count == 2
+        assert enricher.cached(listing) is None
+
+    def test_cached_details_expire(self):
+        from application.services.detail_enricher import LazyDetailEnricher
+
+        now = [0.0]
+        use_case = Mock()
+        use_case.execute_incremental.return_value = [{'title': 'ok'}]
+        enricher = LazyDetailEnricher(use_case, max_workers=1, ttl=60, clock=lambda: now[0])
+
+        enricher.enrich(self.LISTINGS[:1])
+        now[0] = 30.0
+        enricher.enrich(self.LISTINGS[:1])
+        now[0] = 61.0
+        enricher.enrich(self.LISTINGS[:1])
+        enricher.shutdown()
+
+        assert use_case.execute_incremental.call_count == 2
+
+    def test_listings_without_link_are_skipped(self):
+        use_case = Mock()
+        enricher = self._enricher(use_case)
+
+        assert enricher.enrich([{'title': 'sin link'}]) == [None]
+        use_case.execute_incremental.assert_not_called()
+        enricher.shutdown()
+
+
 class TestContainerCreation:
     """Tests for Container factory methods."""
 
@@ -175,6 +1249,42 @@ class TestContainerCreation:
         assert isinstance(services, ApplicationServices)
         assert services.search_products is not None
 
+    def _dashboard_config(self):
+        import config
+        return patch.multiple(
+            config, DATABASE_PATH=None, CHECKPOINT_DIRECTORY=None, MAX_BACKGROUND_JOBS=2,
+            RESULT_STORE_CONFIG={}, LAZY_DETAILS_CONFIG={}, PROGRESS_MIN_INTERVAL=0.5, SEARCH_CACHE_TTL=300, SEARCH_CACHE_MAX_ENTRIES=8,
+        )
+
+    def test_create_for_dashboard_uses_given_socketio(self):
+        from container import Container
+
+        socketio = MagicMock()
+        with self._dashboard_config():
+            services = Container.create_for_dashboard(socketio=socketio)
+        services.jobs.shutdown()
+        services.details.shutdown()
+
+        assert services.live.socketio is socketio
+        socketio.on.assert_called_once_with('subscribe')
+
+        notifier = services.progress('job-1')
+        notifier.notify_progress(1, 10)
+        notifier.close()
+        socketio.emit.assert_called_once_with('scrape_status', ANY, to='job-1')
+
+    def test_create_for_dashboard_without_socketio_has_no_live_updates(self):
+        from container import Container
+        from infrastructure.adapters.null_notifier import NullProgressNotifier
+
+        with self._dashboard_config():
+            services = Container.create_for_dashboard()
+        services.jobs.shutdown()
+        services.details.shutdown()
+
+        assert services.live is None and services.progress is None
+        assert isinstance(services.search_products.scraper.progress_notifier, NullProgressNotifier)
+
     def test_create_for_cli_with_retailer_param(self):
         from container import Container
 
@@ -186,3 +1296,88 @@ class TestContainerCreation:
 
         with pytest.raises(ValueError, match="Unknown retailer"):
             Container.create_for_cli(retailer='ebay')
+
+    def test_create_batch_runner(self, tmp_path):
+        from container import Container
+        from application.services.batch_runner import BatchRunner
+
+        runner = Container.create_batch_runner(data_directory=str(tmp_path), max_concurrency=4)
+
+        assert isinstance(runner, BatchRunner)
+        assert runner.max_concurrency == 4
+        assert runner.search_for_country('ar') is runner.search_for_country('ar')
+
+
+class TestQueueWorker:
+    """Tests for QueueWorker."""
+
+    def _worker(self, tmp_path, **kwargs):
+        from application.services.queue_worker import QueueWorker
+        from infrastructure.adapters.sqlite_job_queue import SqliteJobQueue
+
+        queue = SqliteJobQueue(str(tmp_path / 'queue.db'))
+        services = Mock()
+        return QueueWorker(queue, services, worker_id='w1', **kwargs), queue, services
+
+    def test_search_task_enqueues_detail_chunks(self, tmp_path):
+        worker, queue, services = self._worker(tmp_path, detail_chunk_size=2)
+        services.search_products.execute.return_value = [{'post_link': f'https://x/{i}'} for i in range(3)]
+        services.get_product_details.execute.return_value = [{}]
+        task_id = queue.enqueue('search', {'domain': 'ar', 'query': 'gol', 'limit': 3, 'details': True})
+
+        assert worker.run(exit_when_empty=True) == 3
+
+        services.search_products.execute.assert_called_once_with('ar', 'gol', 3, job_id=f'queue-{task_id}')
+        urls = [c.args[0] for c in services.get_product_details.execute.call_args_list]
+        assert urls == [['https://x/0', 'https://x/1'], ['https://x/2']]
+        assert queue.counts() == {'done': 3}
+
+    def test_rerun_search_task_does_not_duplicate_detail_tasks(self, tmp_path):
+        worker, queue, services = self._worker(tmp_path, detail_chunk_size=2)
+        services.search_products.execute.return_value = [{'post_link': f'https://x/{i}'} for i in range(3)]
+        queue.enqueue('search', {'domain': 'ar', 'query': 'gol', 'limit': 3, 'details': True})
+        task = queue.lease('w1')
+
+        # The worker dies after fanning out; the requeued task runs the search again.
+        worker._handle(task)
+        worker._handle(task)
+
+        assert queue.counts() == {'leased': 1, 'pending': 2}
+
+    def test_failed_task_goes_back_to_queue(self, tmp_path):
+        worker, queue, services = self._worker(tmp_path)
+        services.search_products.execute.side_effect = RuntimeError('blocked')
+        queue.enqueue('search', {'domain': 'ar', 'query': 'gol', 'limit': 3})
+
+        assert worker.run_once()
+        assert queue.counts() == {'pending': 1}
+
+    def test_incomplete_details_task_goes_back_to_queue(self, tmp_path):
+        from domain.entities import PartialResult
+
+        worker, queue, services = self._worker(tmp_path)
+        services.get_product_details.execute.return_value = PartialResult([{}], complete=False)
+        queue.enqueue('details', {'urls': ['u1', 'u2']})
+
+        assert worker.run_once()
+        assert queue.counts() == {'pending': 1}
+
+    def test_incomplete_search_task_is_retried_before_fanning_out(self, tmp_path):
+        from domain.entities import PartialResult
+
+        worker, queue, services = self._worker(tmp_path)
+        services.search_products.execute.return_value = PartialResult([{'post_link': 'https://x/0'}], complete=False)
+        queue.enqueue('search', {'domain': 'ar', 'query': 'gol', 'limit': 3, 'details': True})
+
+        assert worker.run_once()
+        assert queue.counts() == {'pending': 1}
+
+    def test_heartbeat_renews_lease_while_running(self, tmp_path):
+        import time
+
+        worker, queue, services = self._worker(tmp_path, lease_seconds=0.15)
+        services.get_product_details.execute.side_effect = lambda urls, job_id: time.sleep(0.3) or []
+        queue.enqueue('details', {'urls': ['u']})
+
+        assert worker.run_once()
+        assert queue.counts() == {'done': 1}
@@ -157,3 +157,66 @@ class TestGetLatestCsv:
         
         result = get_latest_csv(str(tmp_path))
         assert result == "notebook-gamer"
+
+
+class TestGetLatestCsvWithManifest:
+    """get_latest_csv should use the export manifest when present."""
+
+    def test_uses_manifest_instead_of_file_times(self, tmp_path):
+        from datetime import datetime
+        from utils import get_latest_csv
+        from infrastructure.adapters.export_manifest import ExportManifest
+
+        manifest = ExportManifest.for_directory(str(tmp_path))
+        manifest.record('b', str(tmp_path / 'b_scraped_data_detailed.csv'), 1, 'csv', timestamp=datetime(2026, 1, 2))
+        manifest.record('a', str(tmp_path / 'a_scraped_data_detailed.csv'), 1, 'csv', timestamp=datetime(2026, 1, 1))
+        (tmp_path / 'newer_on_disk.csv').touch()
+
+        assert get_latest_csv(str(tmp_path), manifest) == 'b'
+
+
+class TestParseScrapedNumber:
+    """Tests for parse_scraped_number function."""
+
+    def test_thousands_separators(self):
+        from utils import parse_scraped_number
+
+        assert parse_scraped_number("1.500.000") == 1500000.0
+
+    def test_currency_symbol(self):
+        from utils import parse_scraped_number
+
+        assert parse_scraped_number("U$S 15.000") == 15000.0
+
+    def test_decimal_comma(self):
+        from utils import parse_scraped_number
+
+        assert parse_scraped_number("10,5") == 10.5
+
+    def test_comma_grouping(self):
+        from utils import parse_scraped_number
+
+        # MercadoLibre México and Perú group thousands with commas.
+        assert parse_scraped_number("$ 15,000") == 15000.0
+        assert parse_scraped_number("$ 1,234,567") == 1234567.0
+        assert parse_scraped_number("$ 1,299.50") == 1299.5
+
+    def test_point_grouping_with_decimals(self):
+        from utils import parse_scraped_number
+
+        # MercadoLibre Colombia and Argentina group with points.
+        assert parse_scraped_number("$ 45.990.000") == 45990000.0
+        assert parse_scraped_number("$ 1.234,56") == 1234.56
+
+    def test_explicit_decimal_mark(self):
+        from utils import parse_scraped_number
+
+        assert parse_scraped_number("1,500", decimal_mark=',') == 1.5
+        assert parse_scraped_number("1.500", decimal_mark='.') == 1.5
+        assert parse_scraped_number("1.500", decimal_mark=',') == 1500.0
+
+    def test_none_and_empty(self):
+        from utils import parse_scraped_number
+
+        assert parse_scraped_number(None) is None
+        assert parse_scraped_number("sin precio") is None
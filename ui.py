@@ -1,12 +1,21 @@
 import dash_bootstrap_components as dbc
 from dash import html, dash_table
 from dash import dcc
+import numpy as np
+import pandas as pd
 import plotly.express as px
+import plotly.graph_objects as go
 
+from config import JOB_POLL_INTERVAL, DETAIL_PAGE_SIZE, SCATTER_WEBGL_THRESHOLD, SCATTER_RESOLUTION
+from presentation.point_aggregation import aggregate_points
 
-def _clean_km(km_str):
-    """Clean and parse kilometer values for chart display."""
-    return int(km_str.replace(' km', '').replace('.', ''))
+
+def _to_numeric(series):
+    """Parse scraped numbers such as '85.000 km' into floats, returning a new series."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.astype(float)
+    cleaned = series.astype(str).str.replace(r'[^\d,]', '', regex=True).str.replace(',', '.')
+    return pd.to_numeric(cleaned, errors='coerce')
 
 
 def load_index_html():
@@ -28,16 +37,32 @@ def create_layout():
                     html.Br(),
                     html.Div(id='trigger-for-detailed-scrape', style={'display': 'none'}),
                     html.Br(),
-                    html.Div(id='temp-data-storage', style={'display': 'none'}),
+                    # Key of the search results kept server-side (see InMemoryResultStore).
+                    dcc.Store(id='result-key'),
+                    # Background scrape jobs: the IDs being polled and the timers polling them.
+                    dcc.Store(id='search-request'),
+                    dcc.Store(id='search-job'),
+                    dcc.Store(id='details-job'),
+                    dcc.Interval(id='search-poll', interval=JOB_POLL_INTERVAL, disabled=True),
+                    dcc.Interval(id='details-poll', interval=JOB_POLL_INTERVAL, disabled=True),
                     html.Div(id='table-initial-container', children=[dash_table.DataTable(id='table-initial', columns=[], data=[])]),
                     dash_table.DataTable(
                         id='table-detailed',
                         columns=[],
                         data=[],
-                        filter_action='native',
-                        sort_action='native',
-                        sort_mode='multi'
+                        # Paged, sorted and filtered on the server (see presentation.table_query).
+                        page_action='custom',
+                        page_current=0,
+                        page_size=DETAIL_PAGE_SIZE,
+                        filter_action='custom',
+                        filter_query='',
+                        sort_action='custom',
+                        sort_mode='multi',
+                        sort_by=[]
                     ),
+                    dcc.Store(id='details-key'),
+                    # Grows through extendData as details arrive over SocketIO.
+                    dcc.Graph(id='live-scatter', figure=create_live_scatter_figure(), style={'display': 'none'}),
                     html.Div(id='scatter-plot-container')
                 ], width=12),
             ]),
@@ -53,16 +78,66 @@ def create_layout():
         ],
         fluid=True,
     )
-    return dcc.Loading(layout, type="circle")
+    # Scrapes run in the background and report through scrape-message; a
+    # Loading wrapper would flash on every poll.
+    return layout
 
 
-def create_scatter_plot(data, x_col, y_col, color_col, labels, title):
+def create_scatter_plot(data, x_col, y_col, color_col, labels, title, graph_id='scatter-plot'):
     if x_col not in data.columns or y_col not in data.columns or color_col not in data.columns:
         return html.Div("Una o más columnas especificadas no están presentes en los datos.", style={'color': 'red'})
 
-    if x_col == 'km':
-        data['km'] = data['km'].apply(_clean_km)
+    fig = create_scatter_figure(data, x_col, y_col, color_col, labels, title)
+    return dcc.Graph(id=graph_id, figure=fig)
+
+
+def create_scatter_figure(data, x_col, y_col, color_col, labels, title, x_range=None, y_range=None):
+    """Scatter figure that stays responsive for large results; ``data`` is not modified.
+
+    Up to ``SCATTER_WEBGL_THRESHOLD`` rows every point is drawn. Above it,
+    points are aggregated on the server into a ``SCATTER_RESOLUTION`` grid
+    over ``x_range``/``y_range`` (the zoomed area; everything by default)
+    and drawn with WebGL, one marker per occupied cell sized by its count,
+    with outliers kept as individual markers.
+    """
+    x = _to_numeric(data[x_col])
+    y = _to_numeric(data[y_col])
+    if len(data) <= SCATTER_WEBGL_THRESHOLD:
+        return px.scatter(data.assign(**{x_col: x, y_col: y}), x=x_col, y=y_col, color=color_col,
+                          labels=labels, title=title)
+
+    points = aggregate_points(x, y, _to_numeric(data[color_col]), x_range, y_range, SCATTER_RESOLUTION)
+    fig = go.Figure(go.Scattergl(
+        x=points.x, y=points.y, mode='markers', customdata=points.count,
+        marker={'color': points.color, 'colorscale': 'Viridis', 'showscale': True,
+                'size': 5 + 2 * np.log2(points.count),
+                'colorbar': {'title': {'text': labels.get(color_col, color_col)}}},
+        hovertemplate='%{x}, %{y}<br>%{customdata} publicaciones<extra></extra>',
+    ))
+    fig.update_layout(
+        title=f"{title} ({len(data)} publicaciones agrupadas)",
+        xaxis_title=labels.get(x_col, x_col), yaxis_title=labels.get(y_col, y_col),
+        # Keeps the zoom when the figure is re-aggregated for it.
+        uirevision='aggregated', meta={'aggregated': True},
+    )
+    if x_range is not None:
+        fig.update_xaxes(range=list(x_range))
+    if y_range is not None:
+        fig.update_yaxes(range=list(y_range))
+    return fig
+
+
+def create_live_scatter_figure(labels=None, title=None):
+    """Empty WebGL scatter trace that the browser extends point by point.
 
-    fig = px.scatter(data, x=x_col, y=y_col, color=color_col,
-                     labels=labels, title=title)
-    return dcc.Graph(figure=fig)
+    Points are appended with ``extendData`` as ``x`` (km), ``y`` (price)
+    and ``marker.color`` (year), so the chart grows without re-rendering.
+    """
+    labels = labels or {}
+    fig = go.Figure(go.Scattergl(
+        x=[], y=[], mode='markers',
+        marker={'color': [], 'colorscale': 'Viridis', 'showscale': True,
+                'colorbar': {'title': {'text': labels.get('year', 'year')}}},
+    ))
+    fig.update_layout(title=title, xaxis_title=labels.get('km', 'km'), yaxis_title=labels.get('price_usd', 'price_usd'))
+    return fig
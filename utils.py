@@ -34,6 +34,54 @@ def format_price(df):
     return df
 
 
+# MercadoLibre sites that write numbers as 1,234.56; the others write 1.234,56.
+DECIMAL_POINT_DOMAINS = frozenset({'do', 'gt', 'hn', 'mx', 'ni', 'pa', 'pe', 'sv'})
+
+
+def decimal_mark(domain):
+    """Decimal mark of the numbers on a MercadoLibre site (see ``parse_scraped_number``)."""
+    return '.' if domain.lower() in DECIMAL_POINT_DOMAINS else ','
+
+
+def parse_scraped_number(value, decimal_mark=None):
+    """Parse a scraped number with thousands separators into a float.
+
+    Currency symbols and units are ignored. Sites write numbers either as
+    ``1.234.567,89`` (AR, CO...) or ``1,234,567.89`` (MX, PE...); pass the
+    site's ``decimal_mark`` when it is known. Otherwise it is inferred:
+    with both marks present the last one is decimal, and a mark that
+    repeats or is followed by exactly three digits groups thousands.
+
+    Example:
+        >>> parse_scraped_number("$ 1.500.000")
+        1500000.0
+        >>> parse_scraped_number("$ 1,500,000")
+        1500000.0
+    """
+    if value is None:
+        return None
+    cleaned = re.sub(r'[^\d.,]', '', str(value)).strip('.,')
+    if not cleaned:
+        return None
+    if decimal_mark is None:
+        decimal_mark = _infer_decimal_mark(cleaned)
+    grouping = ',' if decimal_mark == '.' else '.'
+    try:
+        return float(cleaned.replace(grouping, '').replace(decimal_mark, '.'))
+    except ValueError:
+        return None
+
+
+def _infer_decimal_mark(number):
+    last_point, last_comma = number.rfind('.'), number.rfind(',')
+    if last_point >= 0 and last_comma >= 0:
+        return '.' if last_point > last_comma else ','
+    mark = '.' if last_point >= 0 else ','
+    if number.count(mark) > 1 or len(number) - number.rfind(mark) - 1 == 3:
+        return ',' if mark == '.' else '.'
+    return mark
+
+
 def format_price_for_display(price):
     """Format price for human-readable display.
 
@@ -50,8 +98,16 @@ def format_price_for_display(price):
         return price
 
 
-def get_latest_csv(directory):
-    """Find the most recently created CSV file in a directory."""
+def get_latest_csv(directory, manifest=None):
+    """Find the most recently exported CSV file in a directory.
+
+    With the directory's export ``manifest`` (see ``ExportManifest.for_directory``)
+    this is an index lookup; without it, every CSV is globbed and stat-ed.
+    """
+    entry = manifest.latest(file_format='csv') if manifest is not None else None
+    if entry:
+        return os.path.basename(entry['path']).replace("_scraped_data_detailed.csv", "")
+
     list_of_files = glob.glob(os.path.join(directory, "*.csv"))
     if not list_of_files:
         return None
@@ -0,0 +1,75 @@
+"""Worker fleet entry point: process crawl tasks from a shared SQLite job queue.
+
+Enqueue the searches of a batch file, then start as many workers as needed
+(in this process or other processes on the same machine; the SQLite queue
+is not safe on a network filesystem)::
+
+    python worker.py --enqueue jobs.csv --details
+    python worker.py --processes 4
+"""
+import argparse
+import multiprocessing
+
+from application.services.queue_worker import QueueWorker, SEARCH_TASK
+from container import Container
+from infrastructure.adapters.sqlite_job_queue import SqliteJobQueue
+
+QUEUE_PATH = "data/queue.db"
+DATABASE_PATH = "data/mercadolibre.db"
+CHECKPOINT_DIRECTORY = "data/checkpoints"
+
+
+def enqueue_batch(queue: SqliteJobQueue, jobs_path: str, details: bool = False) -> int:
+    """Enqueue one search task per job of a batch CSV (see batch_scraper.py)."""
+    from batch_scraper import load_batch_jobs
+
+    tasks = [
+        (SEARCH_TASK, {'domain': job.country, 'query': job.query, 'limit': job.limit, 'details': details},
+         job.priority)
+        for job in load_batch_jobs(jobs_path)
+    ]
+    return len(queue.enqueue_many(tasks))
+
+
+def run_worker(queue_path: str, exit_when_empty: bool = False) -> None:
+    # Each process opens its own services and queue connection.
+    services = Container.create_for_api(db_path=DATABASE_PATH, checkpoint_dir=CHECKPOINT_DIRECTORY)
+    queue = SqliteJobQueue(queue_path)
+    try:
+        QueueWorker(queue, services).run(exit_when_empty=exit_when_empty)
+    finally:
+        queue.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Procesa tareas de scraping desde una cola compartida.")
+    parser.add_argument('--queue', default=QUEUE_PATH, help="Archivo SQLite de la cola")
+    parser.add_argument('--enqueue', metavar='JOBS_CSV', help="Encola las búsquedas de un CSV y termina")
+    parser.add_argument('--details', action='store_true', help="Encolar también los detalles de cada búsqueda")
+    parser.add_argument('--processes', type=int, default=1, help="Cantidad de procesos worker")
+    parser.add_argument('--exit-when-empty', action='store_true', help="Terminar cuando la cola esté vacía")
+    args = parser.parse_args()
+
+    if args.enqueue:
+        queue = SqliteJobQueue(args.queue)
+        count = enqueue_batch(queue, args.enqueue, details=args.details)
+        print(f"Se encolaron {count} búsquedas. Estado de la cola: {queue.counts()}")
+        queue.close()
+        return
+
+    processes = [
+        multiprocessing.Process(target=run_worker, args=(args.queue, args.exit_when_empty))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+"""WSGI entry point for serving the dashboard on every core.
+
+SocketIO clients must always reach the process that holds their session,
+so each process runs in its own server instance, with one worker and many
+threads, behind a load balancer with sticky sessions (see README). Events
+emitted by any process reach every client through SOCKETIO_MESSAGE_QUEUE::
+
+    gunicorn --workers 1 --threads 100 --bind 127.0.0.1:8001 wsgi:app
+    gunicorn --workers 1 --threads 100 --bind 127.0.0.1:8002 wsgi:app
+"""
+from config import SOCKETIO_MESSAGE_QUEUE
+from dashboard import create_app
+
+dashboard = create_app(message_queue=SOCKETIO_MESSAGE_QUEUE)
+app = dashboard.server